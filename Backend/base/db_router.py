@@ -0,0 +1,85 @@
+# base/db_router.py
+"""
+Primary/replica routing.
+
+Writes always go to `default`. Reads go to `default` too, unless the current
+request (or block of code) opted into a replica through `set_read_database()`;
+BaseViewSet/BaseReadOnlyViewSet do that for safe-method requests (see
+ReplicaReadMixin in base/views/baseviews.py).
+
+Read-your-writes: a successful write pins the user to the primary for
+REPLICA_STICKY_SECONDS, so their next reads see it even if replicas lag.
+The pin is a signed cookie (REPLICA_PIN_COOKIE) holding the user's id, so
+it holds whichever worker or process serves the next request, with no
+shared state on the server. Clients that don't keep cookies get no pin.
+"""
+import random
+from contextvars import ContextVar
+
+from django.conf import settings
+
+# Alias reads are routed to for the current request/task; None means `default`
+_read_database = ContextVar('read_database', default=None)
+
+
+def replica_aliases():
+    return getattr(settings, 'DATABASE_REPLICAS', [])
+
+
+_PIN_SALT = 'base.db_router.replica-pin'
+
+
+def _pin_cookie():
+    return getattr(settings, 'REPLICA_PIN_COOKIE', 'replica_pin')
+
+
+def _sticky_seconds():
+    return getattr(settings, 'REPLICA_STICKY_SECONDS', 5)
+
+
+def pin_to_primary(response, user):
+    """Route `user`'s reads to the primary for the next REPLICA_STICKY_SECONDS (sets a cookie on `response`)."""
+    if replica_aliases() and user is not None and user.is_authenticated:
+        response.set_signed_cookie(
+            _pin_cookie(), str(user.pk), salt=_PIN_SALT, max_age=_sticky_seconds(),
+            httponly=True, samesite='Lax', secure=getattr(settings, 'SESSION_COOKIE_SECURE', False),
+        )
+
+
+def is_pinned(request, user):
+    if user is None or not user.is_authenticated:
+        return False
+    pinned = request.get_signed_cookie(_pin_cookie(), default=None, salt=_PIN_SALT, max_age=_sticky_seconds())
+    return pinned == str(user.pk)
+
+
+def select_read_database(request, user):
+    """A replica alias for this user's reads, or None when they must use the primary."""
+    replicas = replica_aliases()
+    if not replicas or is_pinned(request, user):
+        return None
+    return random.choice(replicas)
+
+
+def set_read_database(alias):
+    """Route reads to `alias` until reset_read_database(token)."""
+    return _read_database.set(alias)
+
+
+def reset_read_database(token):
+    _read_database.reset(token)
+
+
+class PrimaryReplicaRouter:
+    def db_for_read(self, model, **hints):
+        return _read_database.get()
+
+    def db_for_write(self, model, **hints):
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # replicas hold the same data as the primary
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db not in replica_aliases()
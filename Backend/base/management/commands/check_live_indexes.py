@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from base.urls import router
+from base.utils.live_indexes import missing_live_indexes
+
+
+class Command(BaseCommand):
+    help = "Report hot filters on BaseModel tables that lack a live-row (deleted_at IS NULL) index"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--fail', action='store_true', help="Exit with an error when an index is missing")
+
+    def handle(self, *args, **options):
+        report = missing_live_indexes(router.registry)
+        missing = [row for row in report if row['status'] == 'missing']
+
+        if not report:
+            self.stdout.write(self.style.SUCCESS("Every hot filter has a live-row index."))
+            return
+
+        self.stdout.write(f"{'model':<20}{'field':<24}{'used by':<24}status")
+        for row in report:
+            line = f"{row['model']:<20}{row['field']:<24}{','.join(row['sources']):<24}{row['status']}"
+            self.stdout.write(self.style.WARNING(line) if row['status'] == 'missing' else line)
+
+        self.stdout.write(
+            f"\n{len(missing)} filter(s) without a live-row index; "
+            "declare a LiveIndex in the model's Meta.indexes and run makemigrations."
+        )
+        if missing and options['fail']:
+            raise CommandError(f"{len(missing)} hot filter(s) lack a live-row index")
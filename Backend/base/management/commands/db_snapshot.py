@@ -0,0 +1,62 @@
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS
+
+from base.utils.db_snapshot import (
+    copy_database,
+    default_template_name,
+    drop_database,
+    restore_snapshot,
+    save_snapshot,
+)
+
+
+class Command(BaseCommand):
+    help = "Save the database as a PostgreSQL template, or restore/clone it from one (see base/utils/db_snapshot.py)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('action', choices=['save', 'restore', 'clone', 'drop'])
+        parser.add_argument('--template', help="Snapshot database name (default: <database>_template)")
+        parser.add_argument('--target', help="Database to create with `clone`")
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS)
+        parser.add_argument('--build', action='store_true',
+                            help="Before `save`: migrate, reset and seed the database")
+        parser.add_argument('--users', type=int, default=200)
+        parser.add_argument('--items', type=int, default=2000)
+        parser.add_argument('--orders', type=int, default=2000)
+        parser.add_argument('--seed', type=int, default=1234, help="Random seed passed to `seed`")
+
+    def handle(self, *args, **options):
+        using = options['database']
+        template = options['template'] or default_template_name(using)
+        action = options['action']
+
+        try:
+            if action == 'save':
+                if options['build']:
+                    self.build(using, options)
+                save_snapshot(template, using)
+                message = f"Saved snapshot {template}."
+            elif action == 'restore':
+                restore_snapshot(template, using)
+                message = f"Restored the database from {template}."
+            elif action == 'clone':
+                if not options['target']:
+                    raise CommandError("`clone` needs --target.")
+                copy_database(template, options['target'], using)
+                message = f"Cloned {template} to {options['target']}."
+            else:
+                dropped = drop_database(template, using)
+                message = f"Dropped snapshot {template}." if dropped else f"No snapshot named {template}."
+        except ValueError as e:
+            raise CommandError(str(e))
+        self.stdout.write(self.style.SUCCESS(message))
+
+    def build(self, using, options):
+        call_command('migrate', database=using, interactive=False, verbosity=0)
+        # keep the permissions and groups migrate's post_migrate just created
+        call_command('dbreset', database=using, keep_auth=True, stdout=self.stdout)
+        call_command(
+            'seed', users=options['users'], items=options['items'], orders=options['orders'],
+            seed=options['seed'], stdout=self.stdout,
+        )
@@ -1,80 +1,57 @@
 import logging
-from django.db import transaction, connection
+from django.db import connections, DEFAULT_DB_ALIAS
 from django.core.management.base import BaseCommand
 from django.contrib.auth.models import Group, Permission
-from base.models import (
-    CustomUser,
-    Address,
-    Category,
-    ItemCategory,
-    Item,
-    Product,
-    Service,
-    Payment,
-    Order,
-    OrderItem,
-    Cart,
-    CartItem,
-)
+from django.contrib.contenttypes.models import ContentType
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Schema bookkeeping, never reset: permissions and the admin point at these rows
+ALWAYS_KEPT = {ContentType._meta.db_table}
+# Kept with --keep-auth
+AUTH_TABLES = {
+    Group._meta.db_table,
+    Permission._meta.db_table,
+    Group.permissions.through._meta.db_table,
+}
+
 
 class Command(BaseCommand):
-    help = "Reset the database"
+    help = "Reset the database: empty every app table and restart its id sequence"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--keep-auth', action='store_true', help="Keep auth groups and permissions")
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS)
 
-    def handle(self, *args, **kwargs):
+    def handle(self, *args, **options):
         """Main entry point for the reset command."""
         try:
             logger.info("Starting database reset...")
-            with transaction.atomic():
-                self.reset_database()
-            logger.info("Database reset completed successfully.")
+            tables = self.reset_database(connections[options['database']], options['keep_auth'])
+            logger.info("Database reset completed successfully (%d tables).", len(tables))
             self.stdout.write(self.style.SUCCESS("Database reset completed successfully."))
         except Exception as e:
-            logger.error(f"Error resetting the database: {e}")
+            logger.error("Error resetting the database: %s", e)
             self.stdout.write(self.style.ERROR(f"Error resetting the database: {e}"))
 
-    def reset_database(self):
-        """Runs all database reset steps in order."""
-        self.delete_all_records()
-        self.reset_sequences()
-
-    def delete_all_records(self):
-        """Deletes all records from the database, in the correct order."""
-        models_to_clear = [
-            OrderItem, Order, CartItem, Cart, Payment,  
-            Product, Service,        # ✅ Delete child models first
-            Item,                    # ✅ Then delete parent (Item)
-            ItemCategory, Category, Address,
-            CustomUser, Group, Permission,
-        ]
-
-        logger.info("Deleting records from all tables...")
-        for model in models_to_clear:
-            count = model.objects.count()
-            model.objects.all().delete()
-            logger.info(f"Deleted {count} records from {model.__name__}.")
-
-    def reset_sequences(self):
-        """Resets the auto-increment sequences for tables that need it."""
+    def tables_to_reset(self, connection, keep_auth):
+        """Every existing table of an installed app's managed models (partitioned log parents included)."""
+        kept = ALWAYS_KEPT | (AUTH_TABLES if keep_auth else set())
+        tables = connection.introspection.django_table_names(only_existing=True, include_views=False)
+        return sorted(set(tables) - kept)
+
+    def reset_database(self, connection, keep_auth=False):
+        """
+        Empties all tables with one TRUNCATE ... RESTART IDENTITY CASCADE, so the
+        cost does not grow with the number of rows and every sequence starts at 1 again.
+        """
+        tables = self.tables_to_reset(connection, keep_auth)
+        if not tables:
+            return tables
+        quote = connection.ops.quote_name
         with connection.cursor() as cursor:
-            models = [
-                CustomUser, Address, Category, ItemCategory,  
-                Item,                     # ✅ Item owns the PK sequence
-                Payment, Order, OrderItem, Cart, CartItem, 
-                Group, Permission,
-                # ❌ Do NOT include Product or Service (they use Item's ID)
-            ]
-
-            for model in models:
-                table_name = model._meta.db_table  # Get the database table name
-                try:
-                    cursor.execute(f"SELECT setval(pg_get_serial_sequence('{table_name}', 'id'), 1, false);")
-                    logger.info(f"Reset sequence for table {table_name}.")
-                except Exception as e:
-                    logger.warning(f"Could not reset sequence for {table_name}: {e}")
-
-        logger.info("Auto-increment sequences reset for all applicable tables.")
+            cursor.execute(f"TRUNCATE TABLE {', '.join(quote(table) for table in tables)} RESTART IDENTITY CASCADE")
+        logger.info("Truncated %s.", ', '.join(tables))
+        return tables
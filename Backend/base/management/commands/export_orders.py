@@ -0,0 +1,43 @@
+import sys
+import logging
+from django.core.management.base import BaseCommand, CommandError
+from base.utils.order_export import EXPORT_DATASETS, EXPORT_FORMATS, iter_export, parse_export_bound
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = "Stream orders, order items or payments for a date range as CSV/NDJSON"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dataset', choices=sorted(EXPORT_DATASETS), default='orders')
+        parser.add_argument('--format', choices=EXPORT_FORMATS, default='csv')
+        parser.add_argument('--start', help="Inclusive lower bound (YYYY-MM-DD or ISO datetime)")
+        parser.add_argument('--end', help="Exclusive upper bound (YYYY-MM-DD or ISO datetime)")
+        parser.add_argument('--gzip', action='store_true', help="gzip-compress the output")
+        parser.add_argument('--output', default='-', help="Output file, '-' for stdout")
+
+    def handle(self, *args, **options):
+        try:
+            start = parse_export_bound(options['start'])
+            end = parse_export_bound(options['end'])
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        chunks = iter_export(
+            options['dataset'], fmt=options['format'], start=start, end=end, compress=options['gzip'],
+        )
+        if options['output'] == '-':
+            for chunk in chunks:
+                sys.stdout.buffer.write(chunk)
+            sys.stdout.buffer.flush()
+            return
+
+        written = 0
+        with open(options['output'], 'wb') as f:
+            for chunk in chunks:
+                f.write(chunk)
+                written += len(chunk)
+        self.stderr.write(self.style.SUCCESS(
+            f"Exported {options['dataset']} to {options['output']} ({written} bytes)."
+        ))
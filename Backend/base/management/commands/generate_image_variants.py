@@ -0,0 +1,30 @@
+import logging
+
+from django.core.management.base import BaseCommand
+from django.db.models import F, Q
+from django.db.models.fields.json import KeyTextTransform
+
+from base.models.item import Item
+from base.utils.images import generate_item_variants
+
+logger = logging.getLogger('freemarketbackend')
+
+
+class Command(BaseCommand):
+    help = "Build missing or stale Item.image derivatives (thumb/medium WebP and JPEG)"
+
+    def handle(self, *args, **options):
+        stale = (
+            Item.all_objects.exclude(Q(image='') | Q(image__isnull=True))
+            .annotate(variant_source=KeyTextTransform('source', 'image_variants'))
+            .filter(Q(variant_source__isnull=True) | ~Q(variant_source=F('image')))
+            .values_list('pk', flat=True)
+        )
+        built = failed = 0
+        for item_id in stale.iterator():
+            if generate_item_variants(item_id) is None:
+                failed += 1
+            else:
+                built += 1
+        logger.info("Image variants built for %d item(s), %d failed", built, failed)
+        self.stdout.write(self.style.SUCCESS(f"Built image variants for {built} item(s); {failed} failed."))
@@ -1,47 +1,102 @@
+import json
 import os
 from django.core.management.base import BaseCommand
-from django.db import connection
+
+from base.urls import router
+from base.utils.index_advisor import MIN_ROWS, advise, list_indexes
+
+DEFAULT_OUTPUT = {'markdown': os.path.join('docs', 'indexes.md'), 'json': os.path.join('docs', 'index-report.json')}
+
+
+def _fields(definition):
+    # Try to extract indexed fields
+    try:
+        return definition.split('(')[1].split(')')[0]
+    except IndexError:
+        return "?"
+
 
 class Command(BaseCommand):
-    help = 'Generates a Markdown documentation file listing all database indexes.'
-
-    def handle(self, *args, **kwargs):
-        output_path = os.path.join('docs', 'indexes.md')
-
-        if not os.path.exists('docs'):
-            os.makedirs('docs')
-
-        with connection.cursor() as cursor:
-            cursor.execute("""
-                SELECT 
-                    tablename, 
-                    indexname, 
-                    indexdef
-                FROM 
-                    pg_indexes
-                WHERE 
-                    schemaname = 'public'
-                ORDER BY 
-                    tablename, indexname;
-            """)
-            rows = cursor.fetchall()
+    help = 'Generates documentation of all database indexes; with --advise, an index usage and missing-index report.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--advise', action='store_true',
+                            help="Add unused/bloated indexes, seq-scan-heavy tables and EXPLAIN of viewset queries")
+        parser.add_argument('--format', choices=['markdown', 'json'], default='markdown')
+        parser.add_argument('--output', help="Output file (default: docs/indexes.md or docs/index-report.json)")
+        parser.add_argument('--min-rows', type=int, default=MIN_ROWS,
+                            help="Smallest table to report as sequential-scan heavy")
+        parser.add_argument('--stable', action='store_true',
+                            help="With --advise: leave out usage statistics, so reports can be diffed")
+
+    def handle(self, *args, **options):
+        output_path = options['output'] or DEFAULT_OUTPUT[options['format']]
+        if os.path.dirname(output_path):
+            os.makedirs(os.path.dirname(output_path), exist_ok=True)
+
+        if options['advise']:
+            report = advise(router.registry, min_rows=options['min_rows'], stable=options['stable'])
+        else:
+            report = {'indexes': list_indexes()}
 
         with open(output_path, 'w') as f:
-            f.write("# FreeMarket Indexes\n\n")
-            f.write("| Table | Index Name | Fields | Index Type |\n")
-            f.write("|:------|:-----------|:-------|:-----------|\n")
-            for table, index_name, indexdef in rows:
-                if ' USING ' in indexdef:
-                    idx_type = indexdef.split(' USING ')[1].split(' ')[0]
-                else:
-                    idx_type = 'Unknown'
-
-                # Try to extract indexed fields
-                try:
-                    fields = indexdef.split('(')[1].split(')')[0]
-                except IndexError:
-                    fields = "?"
-
-                f.write(f"| {table} | {index_name} | {fields} | {idx_type.upper()} |\n")
+            if options['format'] == 'json':
+                # stable key and row order; with --stable, stable content too
+                f.write(json.dumps(report, indent=2, sort_keys=True, default=str) + "\n")
+            else:
+                self.write_markdown(f, report)
 
         self.stdout.write(self.style.SUCCESS(f"Index documentation generated at {output_path}"))
+        if options['advise']:
+            flagged = [q for q in report['queries'] if q['status'] != 'ok']
+            summary = f"{len(flagged)} viewset query(ies) without a usable index."
+            if 'unused_indexes' in report:
+                summary = (
+                    f"{len(report['unused_indexes'])} unused index(es), {len(report['seq_scan_tables'])} "
+                    f"seq-scan-heavy table(s), {summary}"
+                )
+            self.stdout.write(summary)
+
+    def write_markdown(self, f, report):
+        f.write("# FreeMarket Indexes\n\n")
+        f.write("| Table | Index Name | Fields | Index Type |\n")
+        f.write("|:------|:-----------|:-------|:-----------|\n")
+        for row in report['indexes']:
+            f.write(f"| {row['table']} | {row['index']} | {_fields(row['definition'])} | {row['type'].upper()} |\n")
+
+        if 'unused_indexes' in report:
+            self.write_statistics(f, report)
+        if 'queries' in report:
+            self.write_queries(f, report)
+
+    def write_statistics(self, f, report):
+        f.write("\n## Unused indexes\n\n| Table | Index Name | Size (bytes) |\n|:------|:-----------|-------------:|\n")
+        for row in report['unused_indexes']:
+            f.write(f"| {row['table']} | {row['index']} | {row['size_bytes']} |\n")
+
+        f.write("\n## Sequential-scan heavy tables\n\n")
+        f.write("| Table | Seq scans | Index scans | Rows read by seq scans | Live rows |\n")
+        f.write("|:------|----------:|------------:|-----------------------:|----------:|\n")
+        for row in report['seq_scan_tables']:
+            f.write(f"| {row['table']} | {row['seq_scan']} | {row['idx_scan']} | {row['seq_tup_read']} | {row['live_rows']} |\n")
+
+        f.write("\n## Estimated bloat\n\n| Relation | Kind | Estimate |\n|:---------|:-----|:---------|\n")
+        for row in report['bloat']['tables']:
+            f.write(f"| {row['table']} | table | {row['dead_ratio']:.0%} dead rows |\n")
+        for row in report['bloat']['indexes']:
+            f.write(f"| {row['index']} | index | ~{row['estimated_bloat_ratio']:.0%} larger than needed |\n")
+
+    def write_queries(self, f, report):
+        f.write("\n## Viewset queries without a usable index\n\n")
+        f.write("| Viewset | Kind | Field | Plan |\n|:--------|:-----|:------|:-----|\n")
+        for row in report['queries']:
+            if row['status'] == 'ok':
+                continue
+            if row['status'] == 'error':
+                plan = f"error: {row['error']}"
+            else:
+                plan = ', '.join(
+                    f"{scan['node']} on {scan['table']}" if 'table' in scan else f"{scan['node']} ({', '.join(scan['keys'])})"
+                    for scan in row['scans']
+                )
+            f.write(f"| {row['viewset']} | {row['kind']} | {row['field']} | {plan} |\n")
@@ -0,0 +1,43 @@
+import json
+import logging
+from django.core.management.base import BaseCommand, CommandError
+from base.models import CustomUser
+from base.utils.item_import import ItemImporter, detect_import_format, iter_import_rows
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = "Bulk import products and services from a CSV or NDJSON file"
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="CSV or NDJSON file to import")
+        parser.add_argument('--seller', required=True, help="Username of the seller owning the items")
+        parser.add_argument('--format', choices=['csv', 'ndjson'], help="Override format detection")
+        parser.add_argument('--batch-size', type=int, default=1000, help="Rows validated and inserted per batch")
+        parser.add_argument('--errors', help="Write the per-row error report to this JSON file")
+
+    def handle(self, *args, **options):
+        try:
+            seller = CustomUser.objects.get(username=options['seller'])
+        except CustomUser.DoesNotExist:
+            raise CommandError(f"Seller '{options['seller']}' does not exist.")
+        try:
+            fmt = detect_import_format(options['path'], options['format'])
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        importer = ItemImporter(seller=seller, batch_size=options['batch_size'], max_errors=100000)
+        with open(options['path'], 'rb') as stream:
+            report = importer.run(iter_import_rows(stream, fmt))
+
+        if options['errors']:
+            with open(options['errors'], 'w') as f:
+                json.dump(report['errors'], f, indent=2, default=str)
+        else:
+            for error in report['errors'][:20]:
+                self.stdout.write(self.style.WARNING(f"Row {error['row']}: {json.dumps(error['errors'], default=str)}"))
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {report['created']} items for {seller.username}; {report['failed']} rows failed."
+        ))
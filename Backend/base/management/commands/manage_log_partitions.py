@@ -0,0 +1,76 @@
+import logging
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils.timezone import now
+from base.utils.partitioning import PARTITIONED_LOGS, LogPartitioner
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = "Create upcoming monthly activity-log partitions and detach/drop expired ones"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--model', action='append', dest='models', choices=sorted(PARTITIONED_LOGS),
+                            help="Only manage this log model; repeatable")
+        parser.add_argument('--convert', action='store_true',
+                            help="Convert tables that are not partitioned yet (one-off)")
+        parser.add_argument('--ahead', type=int, default=settings.ACTIVITY_LOG_PARTITIONS_AHEAD,
+                            help="Months of partitions to create ahead of the current one")
+        parser.add_argument('--retention-months', type=int, default=settings.ACTIVITY_LOG_RETENTION_MONTHS,
+                            help="Drop partitions older than this many months; 0 keeps everything")
+        parser.add_argument('--detach-only', action='store_true',
+                            help="Detach expired partitions but keep them as standalone tables")
+        parser.add_argument('--dry-run', action='store_true', help="Print the SQL instead of running it")
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'postgresql':
+            raise CommandError("Log partitioning requires PostgreSQL")
+
+        self.dry_run = options['dry_run']
+        today = now().date()
+        for label in options['models'] or sorted(PARTITIONED_LOGS):
+            with connection.cursor() as cursor:
+                try:
+                    partitioner = LogPartitioner(label, cursor)
+                except LookupError as e:
+                    raise CommandError(str(e))
+
+                if not partitioner.is_partitioned():
+                    if not options['convert']:
+                        self.stdout.write(self.style.WARNING(
+                            f"{partitioner.table} is not partitioned; run with --convert first"
+                        ))
+                        continue
+                    online, swap = partitioner.conversion_statements(today)
+                    self._run(cursor, online)
+                    with transaction.atomic():
+                        self._run(cursor, swap)
+                    if self.dry_run:
+                        self.stdout.write(f"-- {partitioner.table}: monthly partitions are planned after conversion")
+                        continue
+                    logger.info("Converted %s to a partitioned table", partitioner.table)
+
+                self._run(cursor, partitioner.index_statements())
+                created = self._run(cursor, partitioner.ensure_statements(today, options['ahead']))
+                expired = []
+                if options['retention_months'] > 0:
+                    expired = self._run(cursor, partitioner.expire_statements(
+                        today, options['retention_months'], drop=not options['detach_only'],
+                    ))
+
+            if not self.dry_run:
+                self.stdout.write(self.style.SUCCESS(
+                    f"{partitioner.table}: {len(created)} partition(s) created, "
+                    f"{sum(s.startswith('ALTER') for s in expired)} expired"
+                ))
+
+    def _run(self, cursor, statements):
+        for sql in statements:
+            if self.dry_run:
+                self.stdout.write(f"{sql};")
+            else:
+                logger.info("Partition maintenance: %s", sql)
+                cursor.execute(sql)
+        return statements
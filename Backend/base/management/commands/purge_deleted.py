@@ -0,0 +1,46 @@
+import logging
+from django.apps import apps
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management.base import BaseCommand, CommandError
+from base.utils.retention import apply_policy, expired_queryset, retention_policies, vacuum_tables
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = "Archive or hard-delete rows soft-deleted longer than their SOFT_DELETE_RETENTION policy allows"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--model', action='append', dest='models', metavar='LABEL',
+                            help="Only apply the policy for this model (e.g. base.Item); repeatable")
+        parser.add_argument('--dry-run', action='store_true', help="Only report how many rows are due")
+        parser.add_argument('--batch-size', type=int, default=500)
+        parser.add_argument('--sleep', type=float, default=0.0, help="Seconds to pause between batches")
+        parser.add_argument('--vacuum', action='store_true', help="VACUUM ANALYZE the affected tables afterwards")
+
+    def handle(self, *args, **options):
+        try:
+            policies = retention_policies(options['models'])
+        except (ImproperlyConfigured, LookupError) as e:
+            raise CommandError(str(e))
+
+        touched = set()
+        for policy in policies:
+            label = policy.model._meta.label
+            if options['dry_run']:
+                due = expired_queryset(policy).count()
+                self.stdout.write(f"{label}: {due} row(s) older than {policy.days} days would be {policy.mode}d")
+                continue
+
+            deleted = apply_policy(policy, batch_size=options['batch_size'], sleep=options['sleep'])
+            if not deleted:
+                self.stdout.write(f"{label}: nothing to {policy.mode}")
+                continue
+            touched.update(deleted)
+            summary = ', '.join(f"{model}={count}" for model, count in sorted(deleted.items()))
+            logger.info("Retention %s for %s: %s", policy.mode, label, summary)
+            self.stdout.write(self.style.SUCCESS(f"{label}: {policy.mode}d {summary}"))
+
+        if options['vacuum'] and touched:
+            vacuum_tables([apps.get_model(label) for label in sorted(touched)])
+            self.stdout.write(self.style.SUCCESS(f"Vacuumed {len(touched)} table(s)"))
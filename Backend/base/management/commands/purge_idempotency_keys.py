@@ -0,0 +1,19 @@
+import logging
+
+from django.core.management.base import BaseCommand
+
+from base.utils.idempotency import purge_expired_keys
+
+logger = logging.getLogger('freemarketbackend')
+
+
+class Command(BaseCommand):
+    help = "Delete Idempotency-Key records older than IDEMPOTENCY_KEY_TTL_HOURS"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        removed = purge_expired_keys(batch_size=options['batch_size'])
+        logger.info("Purged %d expired idempotency key(s)", removed)
+        self.stdout.write(self.style.SUCCESS(f"Purged {removed} expired idempotency key(s)."))
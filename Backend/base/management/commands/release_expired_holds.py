@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from base.utils.inventory import release_expired_holds
+
+
+class Command(BaseCommand):
+    help = "Return stock held by carts for longer than STOCK_HOLD_TTL_MINUTES"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        released = release_expired_holds(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f"Released {released} expired stock hold(s)."))
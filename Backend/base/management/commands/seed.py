@@ -1,19 +1,19 @@
 import random
 import uuid
 import logging
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone as dt_timezone
 from django.core.management.base import BaseCommand
 from django.db import transaction
+from django.contrib.auth.hashers import make_password
 from django.contrib.auth.models import Group, Permission
+from base.utils.bulk_items import bulk_create_items, bulk_link_categories
 from base.utils.seed_helpers import with_timestamps
-from base.utils.decorators import ensure_list
 from django.utils.timezone import now
 from base.models import (
     CustomUser,
     Address,
     Category,
     Item,
-    ItemCategory,
     Product,
     Service,
     Payment,
@@ -24,7 +24,6 @@ from base.models import (
 )
 from django.contrib.auth.management import create_permissions
 from django.contrib.contenttypes.models import ContentType
-from django.contrib.auth.models import Group, Permission
 from django.apps import apps
 
 # Configure logging
@@ -35,14 +34,40 @@ logger = logging.getLogger(__name__)
 CURRENCIES = ["USD", "EUR", "GBP"]
 SERVICE_TYPES = ["Consulting", "Maintenance", "Other"]
 ORDER_STATUSES = ["PENDING", "PAID", "SHIPPED", "DELIVERED", "CANCELLED"]
+# settled orders come with an authorized payment; pending ones wait for settlement
+PAYMENT_STATUS_FOR_ORDER = {
+    "PENDING": "PENDING", "PAID": "AUTHORIZED", "SHIPPED": "AUTHORIZED",
+    "DELIVERED": "AUTHORIZED", "CANCELLED": "DECLINED",
+}
 PAYMENT_METHODS = ["Credit Card", "PayPal", "Bank Transfer"]
 
+# Fixed "now" for seeded timestamps so a given --seed always produces the same rows
+SEED_EPOCH = datetime(2025, 1, 1, tzinfo=dt_timezone.utc)
+
 
 class Command(BaseCommand):
     help = "Setup initial data: Groups, Permissions, Users, and Sample Data"
 
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=10, help="Number of users to create")
+        parser.add_argument('--sellers', type=int, default=None,
+                            help="How many of the users sell items (default: 10%% of users, at least 1)")
+        parser.add_argument('--categories', type=int, default=3, help="Top-level categories (2 subcategories each)")
+        parser.add_argument('--items', type=int, default=20, help="Number of items (split between products and services)")
+        parser.add_argument('--orders', type=int, default=10, help="Number of orders (1-5 order items each)")
+        parser.add_argument('--carts', type=int, default=None, help="Number of carts (default: one per user)")
+        parser.add_argument('--cart-items', type=int, default=30, help="Number of cart items across all carts")
+        parser.add_argument('--password', default='password123', help="Password shared by all seeded users")
+        parser.add_argument('--seed', type=int, default=None, help="Random seed for reproducible datasets")
+        parser.add_argument('--batch-size', type=int, default=5000, help="Rows per bulk insert")
+
     def handle(self, *args, **kwargs):
         """ Main entry point for the command. Wraps all database setup in a single transaction. """
+        self.options = kwargs
+        self.batch_size = kwargs.get('batch_size') or 5000
+        seed = kwargs.get('seed')
+        self.rng = random.Random(seed)
+        self.epoch = SEED_EPOCH if seed is not None else now()
         try:
             logger.info("Starting database setup...")
             with transaction.atomic():
@@ -50,33 +75,39 @@ class Command(BaseCommand):
             logger.info("Database setup successfully completed!")
             self.stdout.write(self.style.SUCCESS("Database setup successfully completed!"))
         except Exception as e:
-            logger.error(f"Error during setup: {e}")
+            logger.error("Error during setup: %s", e)
             self.stdout.write(self.style.ERROR(f"Error during setup: {e}"))
 
     def seed_database(self):
         """ Runs all database seeding tasks in order. """
         self.create_groups()  # Step 1: Create Groups & Permissions
-        
-        users = self.seed_users()  # Step 2: Create Users
-        if not users:
+
+        user_ids, seller_ids = self.seed_users()  # Step 2: Create Users
+        if not user_ids:
             logger.error("Seeding failed: No users were created.")
             return
-        
-        categories = self.seed_categories()  # Step 3: Create Categories
-        if not categories:
+
+        category_ids = self.seed_categories()  # Step 3: Create Categories
+        if not category_ids:
             logger.error("Seeding failed: No categories were created.")
             return
-        
-        items = self.seed_items(users, categories)  # Step 4: Create Items
+
+        items = self.seed_items(seller_ids, category_ids)  # Step 4: Create Products/Services
         if not items:
             logger.error("Seeding failed: No items were created.")
             return
-        
-        self.seed_products_services(items)  # Step 5: Create Products/Services
-        orders = self.seed_orders(users, items)  # Step 6: Create Orders
-        self.seed_payments(orders)  # Step 7: Create Payments
-        self.seed_carts(users, items)  # Step 8: Create Carts
-        self.create_superuser()  # Step 9: Create Superuser
+
+        self.seed_orders(user_ids, items)  # Step 5: Create Orders, Order Items & Payments
+        self.seed_carts(user_ids, items)  # Step 6: Create Carts
+        self.create_superuser()  # Step 7: Create Superuser
+
+    def _timestamp(self, max_days=365):
+        """A created_at spread over the year before the seed epoch."""
+        return self.epoch - timedelta(seconds=self.rng.randint(0, max_days * 86400))
+
+    def _batches(self, total):
+        for start in range(0, total, self.batch_size):
+            yield range(start, min(start + self.batch_size, total))
 
 # FIXME THE GRUOPS ARE CREATED WITH THE WRONG PREMISSIONS 
     ### ✅ Step 1: Create Groups and Assign Permissions
@@ -111,45 +142,70 @@ class Command(BaseCommand):
             group, created = Group.objects.get_or_create(name=group_name)
 
             if created:
-                logger.info(f"Created group: {group_name}")
+                logger.info("Created group: %s", group_name)
             else:
-                logger.warning(f"Group '{group_name}' already exists.")
+                logger.warning("Group '%s' already exists.", group_name)
 
             for codename in permission_codenames:
                 try:
                     permission = Permission.objects.get(codename=codename)
                     group.permissions.add(permission)
                 except Permission.DoesNotExist:
-                    logger.error(f"Permission '{codename}' not found. Ensure migrations are applied first.")
+                    logger.error("Permission '%s' not found. Ensure migrations are applied first.", codename)
+
+            logger.info("Assigned permissions to %s", group_name)
 
-            logger.info(f"Assigned permissions to {group_name}")
 
 
     ### ✅ Step 2: Create Users and Assign to Groups
     def seed_users(self):
-        """ Creates users and assigns them to the correct groups. """
+        """
+        Creates users in batches and assigns them to groups through the M2M table.
+        Returns (user ids, seller ids).
+        """
         if CustomUser.objects.exists():
             logger.info("Users already exist, skipping seeding users.")
-            return list(CustomUser.objects.all())
-
-        users = [
-            CustomUser(
-                username=f"user{i}",
-                phone_number=f"12345678{i}",
-                gender=random.choice(["Male", "Female", "Other"]),
-                date_of_birth=datetime.now() - timedelta(days=random.randint(7000, 15000))
-            )
-            for i in range(10)
-        ]
-        CustomUser.objects.bulk_create(with_timestamps(users))
+            user_ids = list(CustomUser.objects.values_list('id', flat=True))
+            seller_ids = list(CustomUser.objects.filter(items__isnull=False).distinct().values_list('id', flat=True))
+            return user_ids, seller_ids or user_ids
 
-        # Assign users to default "User" group
-        user_group = Group.objects.get(name="User")
-        for user in CustomUser.objects.all():
-            user.groups.add(user_group)
+        total = self.options.get('users', 10)
+        seller_count = self.options.get('sellers')
+        if seller_count is None:
+            seller_count = max(1, total // 10)
+        password = make_password(self.options.get('password', 'password123'))  # hash once, not per user
 
-        logger.info(f"Created {len(users)} users and assigned them to 'User' group.")
-        return CustomUser.objects.all()
+        user_group = Group.objects.get(name="User")
+        buyer_group, _ = Group.objects.get_or_create(name="Buyer")
+        seller_group, _ = Group.objects.get_or_create(name="Seller")
+        Membership = CustomUser.groups.through
+
+        user_ids, seller_ids = [], []
+        for batch in self._batches(total):
+            users = [
+                CustomUser(
+                    username=f"user{i}",
+                    password=password,
+                    phone_number=f"12345678{i}",
+                    gender=self.rng.choice(["Male", "Female", "Other"]),
+                    date_of_birth=(self.epoch - timedelta(days=self.rng.randint(7000, 15000))).date(),
+                    date_joined=self._timestamp(),
+                )
+                for i in batch
+            ]
+            CustomUser.objects.bulk_create(users)
+            memberships = []
+            for i, user in zip(batch, users):
+                memberships.append(Membership(customuser_id=user.id, group_id=user_group.id))
+                memberships.append(Membership(customuser_id=user.id, group_id=buyer_group.id))
+                if i < seller_count:
+                    memberships.append(Membership(customuser_id=user.id, group_id=seller_group.id))
+                    seller_ids.append(user.id)
+            Membership.objects.bulk_create(memberships)
+            user_ids.extend(user.id for user in users)
+            logger.info("Created %s/%s users.", len(user_ids), total)
+
+        return user_ids, seller_ids
 
     ### ✅ Step 3: Seed Other Data
     def seed_addresses(self, users):
@@ -164,17 +220,17 @@ class Command(BaseCommand):
             ) for i in range(10)
         ]
         Address.objects.bulk_create(with_timestamps(addresses))
-        logger.info(f"Created {len(addresses)} addresses.")
+        logger.info("Created %s addresses.", len(addresses))
 
-    @ensure_list
     def seed_categories(self):
+        """Creates top-level categories with two subcategories each. Returns category ids."""
         if Category.objects.exists():
             logger.info("Categories already exist, skipping seeding.")
-            return list(Category.objects.all())
+            return list(Category.objects.values_list('id', flat=True))
 
         # Create categories with parent-child relationships
-        parent_categories = [Category(name=f"Category{i}") for i in range(3)]  # Create top-level categories
-        Category.objects.bulk_create(with_timestamps(parent_categories))
+        parent_categories = [Category(name=f"Category{i}") for i in range(self.options.get('categories', 3))]
+        Category.objects.bulk_create(with_timestamps(parent_categories), batch_size=self.batch_size)
 
         # Now create child categories for each parent category
         child_categories = [
@@ -182,172 +238,124 @@ class Command(BaseCommand):
             for i, parent in enumerate(parent_categories)
             for j in range(2)  # 2 subcategories for each parent
         ]
-        Category.objects.bulk_create(with_timestamps(child_categories))
-
-        logger.info(f"Created {len(parent_categories)} parent categories and {len(child_categories)} child categories.")
-        return list(Category.objects.all())
+        Category.objects.bulk_create(with_timestamps(child_categories), batch_size=self.batch_size)
 
+        logger.info("Created %s parent categories and %s child categories.", len(parent_categories), len(child_categories))
+        return [c.id for c in parent_categories + child_categories]
 
-    @ensure_list
-    def seed_items(self, users, categories):
-        """Seeds items if they do not exist."""
+    def seed_items(self, seller_ids, category_ids):
+        """
+        Seeds products and services directly as subtypes, so every Item row has
+        exactly one Product or Service row. Returns (ids, prices) of the items.
+        """
         if Item.objects.exists():
             logger.info("Items already exist, skipping seeding.")
-            return list(Item.objects.all())
-
-        if not categories:
-            logger.error("No categories found! Ensure seed_categories() runs successfully.")
-            return []
-
-        items = [
-            Item(
-                name=f"Item{i}",
-                price_cents=random.randint(100, 10000),
-                currency=random.choice(CURRENCIES),
-                seller=random.choice(users),
-            )
-            for i in range(20)
-        ]
-        Item.objects.bulk_create(with_timestamps(items))
-
-        # Link items to random categories (both parent and child)
-        item_categories = [
-            ItemCategory(item=item, category=random.choice(categories)) for item in Item.objects.all()
-        ]
-        ItemCategory.objects.bulk_create(with_timestamps(item_categories))
-
-        logger.info(f"Created {len(items)} items and linked them to categories.")
-        return list(Item.objects.all())
-    
-
-    def seed_products_services(self, items):
-        if Product.objects.exists() or Service.objects.exists():
-            logger.info("Products and Services already exist, skipping seeding.")
-            return
-
-        # Randomly split the list in two (50/50)
-        random.shuffle(items)
-        split_index = len(items) // 2
-        product_items = items[:split_index]
-        service_items = items[split_index:]
-
-        for item in product_items:
-            product = Product(
-                id=item.id,  # ✅ Link to existing Item using the same ID
-                name=item.name,
-                description=item.description,
-                price_cents=item.price_cents,
-                currency=item.currency,
-                seller=item.seller,
-                quantity=random.randint(1, 100),
-            )
-            product.save()
-            product.categories.set(item.categories.all())
-
-        for item in service_items:
-            service = Service(
-                id=item.id,  # ✅ Link to existing Item using the same ID
-                name=item.name,
-                description=item.description,
-                price_cents=item.price_cents,
-                currency=item.currency,
-                seller=item.seller,
-                service_duration=random.randint(30, 300),
-                service_type=random.choice(SERVICE_TYPES),
+            rows = list(Item.objects.values_list('id', 'price_cents'))
+            return [r[0] for r in rows], [r[1] for r in rows]
+
+        total = self.options.get('items', 20)
+        item_ids, prices = [], []
+        for batch in self._batches(total):
+            instances = []
+            for i in batch:
+                common = dict(
+                    name=f"Item{i}",
+                    description=f"Description for item {i}",
+                    price_cents=self.rng.randint(100, 10000),
+                    currency=self.rng.choice(CURRENCIES),
+                    seller_id=self.rng.choice(seller_ids),
+                    created_at=self._timestamp(),
+                )
+                if self.rng.random() < 0.5:
+                    instances.append(Product(quantity=self.rng.randint(1, 100), **common))
+                else:
+                    instances.append(Service(
+                        service_duration=self.rng.randint(30, 300),
+                        service_type=self.rng.choice(SERVICE_TYPES),
+                        **common,
+                    ))
+            bulk_create_items(instances, batch_size=self.batch_size)
+            # Link items to random categories (both parent and child)
+            bulk_link_categories(
+                [(item.id, self.rng.choice(category_ids)) for item in instances],
+                batch_size=self.batch_size,
             )
-            service.save()
-            service.categories.set(item.categories.all())
-
-        logger.info(f"Created {len(product_items)} products and {len(service_items)} services.")
-    
-        Item.objects.count()
-        Product.objects.count()
-        Service.objects.count()
-
-        # Sanity check for orphan items
-        orphan_count = Item.objects.exclude(id__in=Product.objects.values_list('id', flat=True))\
-                                .exclude(id__in=Service.objects.values_list('id', flat=True)).count()
-        if orphan_count > 0:
-            logger.warning(f"⚠️ Found {orphan_count} orphan Items! Some items have no subtype.")
-        else:
-            logger.info("✅ All items properly linked to subtypes.")
-
+            item_ids.extend(item.id for item in instances)
+            prices.extend(item.price_cents for item in instances)
+            logger.info("Created %s/%s items.", len(item_ids), total)
 
+        return item_ids, prices
 
-    def seed_orders(self, users, items):
+    def seed_orders(self, user_ids, items):
+        """
+        Seeds orders with 1-5 order items and one payment each. Totals are
+        computed in memory before the insert instead of re-saving every order.
+        """
         if Order.objects.exists():
             logger.info("Orders already exist, skipping seeding orders.")
-            return list(Order.objects.all())
-
-        orders = [
-            Order(
-                user=random.choice(users),
-                status=random.choice(ORDER_STATUSES),
-                total_price_cents=0  # Will be calculated later
-            )
-            for _ in range(10)
-        ]
-        Order.objects.bulk_create(with_timestamps(orders))
+            return
 
-        orders = list(Order.objects.all())  # Fetch the created orders
-        
-        order_items = []
-        for _ in range(30):  # Create 30 random order items
-            order = random.choice(orders)
-            item = random.choice(items)
-
-            # Ensure price_cents is set
-            order_items.append(
-                OrderItem(
-                    order=order,
-                    item=item,
-                    quantity=random.randint(1, 5),
-                    price_cents=item.price_cents  # ✅ Fix: Assign a valid price
+        item_ids, prices = items
+        total = self.options.get('orders', 10)
+        created_items = 0
+        for batch in self._batches(total):
+            orders, lines = [], []
+            for _ in batch:
+                picks = self.rng.sample(range(len(item_ids)), min(len(item_ids), self.rng.randint(1, 5)))
+                order_lines = [(item_ids[p], self.rng.randint(1, 5), prices[p]) for p in picks]
+                orders.append(Order(
+                    user_id=self.rng.choice(user_ids),
+                    status=self.rng.choice(ORDER_STATUSES),
+                    total_price_cents=sum(qty * price for _, qty, price in order_lines),
+                    created_at=self._timestamp(),
+                ))
+                lines.append(order_lines)
+            Order.objects.bulk_create(orders)
+
+            order_items = [
+                OrderItem(order_id=order.id, item_id=item_id, quantity=qty, price_cents=price, created_at=order.created_at)
+                for order, order_lines in zip(orders, lines)
+                for item_id, qty, price in order_lines
+            ]
+            OrderItem.objects.bulk_create(order_items, batch_size=self.batch_size)
+            created_items += len(order_items)
+
+            Payment.objects.bulk_create([
+                Payment(
+                    order_id=order.id,
+                    amount_cents=order.total_price_cents,
+                    payment_method=self.rng.choice(PAYMENT_METHODS),
+                    transaction_id=f"Transaction-{uuid.UUID(int=self.rng.getrandbits(128))}",
+                    status=PAYMENT_STATUS_FOR_ORDER[order.status],
+                    created_at=order.created_at,
                 )
-            )
-
-        OrderItem.objects.bulk_create(with_timestamps(order_items))
-
-        # Update the total price of each order
-        for order in orders:
-            total_price = sum(
-                oi.price_cents * oi.quantity for oi in order.order_items.all()
-            )
-            order.total_price_cents = total_price
-            order.save()
-
-        logger.info(f"Created {len(orders)} orders and {len(order_items)} order items.")
-        return orders
-
-    def seed_payments(self, orders):
-        if Payment.objects.exists():
-            return
-        payments = [Payment(order=order, amount_cents=order.total_price_cents, payment_method=random.choice(PAYMENT_METHODS), transaction_id=f"Transaction-{uuid.uuid4()}") for order in orders]
-        Payment.objects.bulk_create(with_timestamps(payments))
-        logger.info(f"Created {len(payments)} payments.")
+                for order in orders
+            ])
+            logger.info("Created %s/%s orders (%s order items).", batch.stop, total, created_items)
 
-    def seed_carts(self, users, items):
+    def seed_carts(self, user_ids, items):
+        """Seeds carts and unique (cart, item) pairs without querying per candidate."""
         if Cart.objects.exists() and CartItem.objects.exists():
             return
-        carts = [Cart(user=user) for user in users]
-        Cart.objects.bulk_create(with_timestamps(carts))
-        cart_items = set()
-        while len(cart_items) < 30:
-            cart = random.choice(carts)
-            item = random.choice(items)
-            if not CartItem.objects.filter(cart=cart, item=item).exists():  # Avoid duplicates
-                cart_items.add((cart, item))
-
-        CartItem.objects.bulk_create(with_timestamps([
-            CartItem(
-                cart=c,
-                item=i,
-                quantity=random.randint(1, 5),
-                price_snapshot_cents=random.randint(100, 5000)
-            )
-            for c, i in cart_items
-        ]))
-        logger.info(f"Created {len(carts)} carts and {len(cart_items)} cart items.")
+
+        item_ids, prices = items
+        cart_count = min(len(user_ids), self.options.get('carts') or len(user_ids))
+        carts = [Cart(user_id=user_id) for user_id in self.rng.sample(user_ids, cart_count)]
+        wanted = min(self.options.get('cart_items', 30), cart_count * len(item_ids))
+
+        pairs = set()
+        while len(pairs) < wanted:
+            pairs.add((self.rng.randrange(cart_count), self.rng.randrange(len(item_ids))))
+        lines = [(c, i, self.rng.randint(1, 5)) for c, i in sorted(pairs)]
+        for c, i, qty in lines:
+            carts[c].total_price_cents += qty * prices[i]
+
+        Cart.objects.bulk_create(with_timestamps(carts), batch_size=self.batch_size)
+        CartItem.objects.bulk_create([
+            CartItem(cart_id=carts[c].id, item_id=item_ids[i], quantity=qty, price_snapshot_cents=prices[i])
+            for c, i, qty in lines
+        ], batch_size=self.batch_size)
+        logger.info("Created %s carts and %s cart items.", len(carts), len(lines))
 
     def create_superuser(self):
         """Creates a default superuser after seeding groups."""
@@ -368,6 +376,6 @@ class Command(BaseCommand):
                 date_of_birth=datetime(1990, 1, 1),
             )
             superuser.groups.add(admin_group)  # Now safe to assign the group
-            logger.info(f"Superuser '{superuser_username}' created successfully.")
+            logger.info("Superuser '%s' created successfully.", superuser_username)
         else:
-            logger.info(f"Superuser '{superuser_username}' already exists.")
+            logger.info("Superuser '%s' already exists.", superuser_username)
@@ -0,0 +1,31 @@
+import logging
+
+from django.core.management.base import BaseCommand
+
+from base.payments.settlement import pending_payment_ids, reclaim_stuck, settle_payment
+
+logger = logging.getLogger('freemarketbackend')
+
+
+class Command(BaseCommand):
+    help = "Authorize pending payments through PAYMENT_BACKEND and update their orders"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--limit', type=int, default=None, help="Settle at most this many payments")
+        parser.add_argument('--stale-seconds', type=int, default=300,
+                            help="First put payments PROCESSING for longer than this back in the queue")
+
+    def handle(self, *args, **options):
+        reclaimed = reclaim_stuck(options['stale_seconds'])
+        if reclaimed:
+            self.stdout.write(self.style.WARNING(f"Requeued {reclaimed} payment(s) stuck in processing."))
+
+        outcomes = {}
+        for payment_id in pending_payment_ids(options['limit']):
+            status = settle_payment(payment_id)
+            if status:
+                outcomes[status] = outcomes.get(status, 0) + 1
+
+        summary = ', '.join(f"{status.lower()}={count}" for status, count in sorted(outcomes.items())) or 'nothing pending'
+        logger.info("Payment settlement run: %s", summary)
+        self.stdout.write(self.style.SUCCESS(f"Settled payments: {summary}"))
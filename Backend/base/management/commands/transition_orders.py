@@ -0,0 +1,44 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from base.models.user import CustomUser
+from base.utils.order_transitions import TARGETS, UPDATED, transition_orders
+
+
+class Command(BaseCommand):
+    help = "Move many orders to a new status, e.g. mark a day's shipments SHIPPED"
+
+    def add_arguments(self, parser):
+        parser.add_argument('status', choices=[target.value for target in TARGETS])
+        parser.add_argument('order_ids', nargs='*', type=int, help="Order ids; read from --file when omitted")
+        parser.add_argument('--file', help="File with one order id per line, '-' for stdin")
+        parser.add_argument('--actor', help="Username recorded in the activity log")
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        order_ids = list(options['order_ids'])
+        if options['file']:
+            source = sys.stdin if options['file'] == '-' else open(options['file'])
+            with source:
+                order_ids += [int(line) for line in source if line.strip()]
+        if not order_ids:
+            raise CommandError("Give order ids as arguments or with --file.")
+
+        actor = None
+        if options['actor']:
+            actor = CustomUser.objects.filter(username=options['actor']).first()
+            if actor is None:
+                raise CommandError(f"No user named {options['actor']}.")
+
+        try:
+            results = transition_orders(order_ids, options['status'], actor=actor, batch_size=options['batch_size'])
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        skipped = [result for result in results if result['result'] != UPDATED]
+        for result in skipped:
+            self.stderr.write(f"Order {result['id']}: {result['result']} (status {result['from']})")
+        self.stdout.write(self.style.SUCCESS(
+            f"Moved {len(results) - len(skipped)} order(s) to {options['status']}; {len(skipped)} skipped."
+        ))
@@ -0,0 +1 @@
+from .instrumentation import *
\ No newline at end of file
@@ -0,0 +1,252 @@
+# base/middleware/instrumentation.py
+
+import heapq
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+logger = logging.getLogger('freemarketbackend')
+
+# Metrics of the request being handled by the current thread/task
+_current_metrics = ContextVar('request_metrics', default=None)
+
+# How many of the slowest statements are kept for the slow-request log
+SLOW_SQL_KEPT = 10
+
+
+class RequestMetrics:
+    """Per-request counters filled in by the middleware, the DB wrapper and `timed()`."""
+
+    def __init__(self, capture_sql=False):
+        self.start = time.perf_counter()
+        self.db_queries = 0
+        self.db_time = 0.0
+        self.timings = {}
+        self.view_start = None
+        self.view_end = None
+        self.capture_sql = capture_sql
+        self._slowest = []
+
+    def record_query(self, sql, duration):
+        self.db_queries += 1
+        self.db_time += duration
+        if self.capture_sql:
+            entry = (duration, self.db_queries, sql)
+            if len(self._slowest) < SLOW_SQL_KEPT:
+                heapq.heappush(self._slowest, entry)
+            else:
+                heapq.heappushpop(self._slowest, entry)
+
+    def add_timing(self, name, duration):
+        self.timings[name] = self.timings.get(name, 0.0) + duration
+
+    def slowest_queries(self):
+        return [
+            {'ms': round(duration * 1000, 3), 'sql': sql}
+            for duration, _, sql in sorted(self._slowest, reverse=True)
+        ]
+
+
+@contextmanager
+def timed(name):
+    """
+    Add the time spent in the block to the current request's `name` timing.
+    A no-op outside an instrumented request.
+    """
+    metrics = _current_metrics.get()
+    if metrics is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics.add_timing(name, time.perf_counter() - start)
+
+
+class MetricsRegistry:
+    """In-process aggregate of request metrics, keyed by URL name."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._routes = {}
+
+    def record(self, route, status_code, total_ms, db_queries, db_ms, slow):
+        with self._lock:
+            stats = self._routes.get(route)
+            if stats is None:
+                stats = self._routes[route] = {
+                    'count': 0, 'errors': 0, 'slow': 0,
+                    'total_ms': 0.0, 'max_ms': 0.0, 'db_queries': 0, 'db_ms': 0.0,
+                }
+            stats['count'] += 1
+            stats['errors'] += status_code >= 500
+            stats['slow'] += slow
+            stats['total_ms'] += total_ms
+            stats['max_ms'] = max(stats['max_ms'], total_ms)
+            stats['db_queries'] += db_queries
+            stats['db_ms'] += db_ms
+
+    def snapshot(self):
+        with self._lock:
+            routes = {route: dict(stats) for route, stats in self._routes.items()}
+        for stats in routes.values():
+            count = stats['count']
+            stats['avg_ms'] = round(stats['total_ms'] / count, 3)
+            stats['avg_db_queries'] = round(stats['db_queries'] / count, 2)
+            stats['avg_db_ms'] = round(stats['db_ms'] / count, 3)
+            stats['total_ms'] = round(stats['total_ms'], 3)
+            stats['max_ms'] = round(stats['max_ms'], 3)
+            stats['db_ms'] = round(stats['db_ms'], 3)
+        return dict(sorted(routes.items()))
+
+    def reset(self):
+        with self._lock:
+            self._routes.clear()
+
+
+metrics_registry = MetricsRegistry()
+
+
+def _record_query(execute, sql, params, many, context):
+    """Execute wrapper installed once per connection; records into the current request's metrics, if any."""
+    metrics = _current_metrics.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        metrics.record_query(sql, time.perf_counter() - start)
+
+
+def _install_wrapper(sender=None, connection=None, **kwargs):
+    if _record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_record_query)
+
+
+# Async views run their queries on connections of asgiref's sync threads, which
+# the middleware never sees: wrap every connection as it is opened. The metrics
+# follow the request through its ContextVar, which sync_to_async carries over.
+connection_created.connect(_install_wrapper, dispatch_uid='request_instrumentation')
+
+
+class RequestInstrumentationMiddleware:
+    """
+    Measures DB query count/time, view time and serializer time per request.
+
+    The numbers are returned in a `Server-Timing` header, logged as structured
+    fields on the `freemarketbackend` logger and aggregated in `metrics_registry`.
+    Requests slower than SLOW_REQUEST_THRESHOLD_MS are logged with their slowest SQL.
+
+    Sync and async capable: under ASGI the request stays on the event loop
+    (no thread per request for the async views), and the view hooks are
+    coroutines so Django doesn't adapt them through sync_to_async either.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+            self.process_view = self._aprocess_view
+            self.process_template_response = self._aprocess_template_response
+
+    def _start(self):
+        slow_ms = getattr(settings, 'SLOW_REQUEST_THRESHOLD_MS', None)
+        metrics = RequestMetrics(capture_sql=slow_ms is not None)
+        # this thread's connections, including any opened before the receiver was connected
+        for alias in connections:
+            _install_wrapper(connection=connections[alias])
+        return metrics, slow_ms, _current_metrics.set(metrics)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not getattr(settings, 'REQUEST_INSTRUMENTATION', True):
+            return self.get_response(request)
+
+        metrics, slow_ms, token = self._start()
+        try:
+            response = self.get_response(request)
+        finally:
+            _current_metrics.reset(token)
+
+        self._report(request, response, metrics, slow_ms)
+        return response
+
+    async def __acall__(self, request):
+        if not getattr(settings, 'REQUEST_INSTRUMENTATION', True):
+            return await self.get_response(request)
+
+        metrics, slow_ms, token = self._start()
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current_metrics.reset(token)
+
+        self._report(request, response, metrics, slow_ms)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        metrics = _current_metrics.get()
+        if metrics is not None:
+            metrics.view_start = time.perf_counter()
+
+    def process_template_response(self, request, response):
+        # DRF responses are rendered after the view returns; this marks the boundary
+        metrics = _current_metrics.get()
+        if metrics is not None:
+            metrics.view_end = time.perf_counter()
+        return response
+
+    async def _aprocess_view(self, request, view_func, view_args, view_kwargs):
+        return RequestInstrumentationMiddleware.process_view(self, request, view_func, view_args, view_kwargs)
+
+    async def _aprocess_template_response(self, request, response):
+        return RequestInstrumentationMiddleware.process_template_response(self, request, response)
+
+    def _report(self, request, response, metrics, slow_ms):
+        end = time.perf_counter()
+        total_ms = (end - metrics.start) * 1000
+        db_ms = metrics.db_time * 1000
+        view_ms = None
+        if metrics.view_start is not None:
+            view_ms = ((metrics.view_end or end) - metrics.view_start) * 1000
+        serialize_ms = metrics.timings.get('serialize', 0.0) * 1000
+
+        entries = [f'total;dur={total_ms:.1f}', f'db;dur={db_ms:.1f};desc="{metrics.db_queries} queries"']
+        if view_ms is not None:
+            entries.append(f'view;dur={view_ms:.1f}')
+        for name, duration in sorted(metrics.timings.items()):
+            entries.append(f'{name};dur={duration * 1000:.1f}')
+        response['Server-Timing'] = ', '.join(entries)
+
+        match = getattr(request, 'resolver_match', None)
+        route = match.view_name if match else 'unresolved'
+        slow = slow_ms is not None and total_ms >= slow_ms
+        metrics_registry.record(route, response.status_code, total_ms, metrics.db_queries, db_ms, slow)
+
+        fields = {
+            'route': route,
+            'method': request.method,
+            'status_code': response.status_code,
+            'duration_ms': round(total_ms, 3),
+            'view_ms': round(view_ms, 3) if view_ms is not None else None,
+            'serialize_ms': round(serialize_ms, 3),
+            'db_queries': metrics.db_queries,
+            'db_ms': round(db_ms, 3),
+        }
+        if slow:
+            fields['slow_sql'] = metrics.slowest_queries()
+            logger.warning("Slow request %s %s took %.1fms", request.method, request.path, total_ms, extra=fields)
+        else:
+            logger.info("%s %s %s", request.method, request.path, response.status_code, extra=fields)
@@ -8,3 +8,6 @@ from .order import *
 from .payment import *
 from .logs import *
 from .seller_application import *
+from .archive import *
+from .idempotency import *
+from .inventory import *
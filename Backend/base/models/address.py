@@ -1,6 +1,6 @@
 from django.conf import settings
 from django.db import models
-from .base_modle import BaseModel
+from .base_modle import BaseModel, LiveIndex
 
 # Address Model Refactor
 class Address(BaseModel):
@@ -18,6 +18,9 @@ class Address(BaseModel):
     class Meta:
         verbose_name = "Address"
         verbose_name_plural = "Addresses"
+        indexes = [
+            LiveIndex(fields=['user'], name='live_address_user'),
+        ]
 
     def __str__(self):
         return f"{self.address_line_1}, {self.city}, {self.country}"
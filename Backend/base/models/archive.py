@@ -0,0 +1,23 @@
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+from django.utils.timezone import now
+
+
+class ArchivedRecord(models.Model):
+    """
+    A soft-deleted row moved out of its hot table by the retention job
+    (see base/utils/retention.py). `payload` holds the serialized field values.
+    """
+    model = models.CharField(max_length=100)
+    object_id = models.BigIntegerField()
+    payload = models.JSONField(encoder=DjangoJSONEncoder)
+    deleted_at = models.DateTimeField(null=True, blank=True)
+    archived_at = models.DateTimeField(default=now)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['model', 'object_id'], name='idx_archive_model_object'),
+        ]
+
+    def __str__(self):
+        return f"{self.model}#{self.object_id} (archived {self.archived_at:%Y-%m-%d})"
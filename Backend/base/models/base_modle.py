@@ -1,6 +1,28 @@
 from django.db import models
+from django.db.models import Q
 from django.utils.timezone import now
 
+# Every default query on a BaseModel table filters on this
+LIVE_ROWS = Q(deleted_at__isnull=True)
+
+
+class LiveIndex(models.Index):
+    """
+    Partial index covering only live rows (`WHERE deleted_at IS NULL`).
+
+    Declare it in a BaseModel subclass's Meta.indexes for the fields that
+    subclass is filtered or ordered on, so lookups skip soft-deleted tombstones:
+
+        indexes = [LiveIndex(fields=['user'], name='live_address_user')]
+    """
+    def __init__(self, *expressions, condition=None, **kwargs):
+        super().__init__(*expressions, condition=condition or LIVE_ROWS, **kwargs)
+
+    @staticmethod
+    def is_live(index):
+        return index.condition == LIVE_ROWS
+
+
 class SoftDeleteManager(models.Manager):
     def get_queryset(self):
         return super().get_queryset().filter(deleted_at__isnull=True)
@@ -6,7 +6,7 @@ from django.conf import settings
 from django.core.exceptions import ValidationError
 
 from base.utils.decorators import log_cart_action
-from .base_modle import BaseModel
+from .base_modle import BaseModel, LiveIndex
 from .item import Item
 
 
@@ -29,6 +29,8 @@ class Cart(BaseModel):
 
     @log_cart_action('ADD')
     def add_item(self, item, quantity=1):
+        from base.utils.inventory import hold
+
         with transaction.atomic():
             cart_item = CartItem.all_objects.filter(cart=self, item=item).first()
 
@@ -41,7 +43,7 @@ class Cart(BaseModel):
                     cart_item.quantity += quantity
                 cart_item.save()
             else:
-                CartItem.objects.create(
+                cart_item = CartItem.objects.create(
                     cart=self,
                     item=item,
                     quantity=quantity,
@@ -49,32 +51,46 @@ class Cart(BaseModel):
                 )
 
             self.calculate_total()
+            # Hold the stock last, it locks the product row until commit;
+            # raises InsufficientStock and rolls the add back
+            hold(self, item, int(cart_item.quantity))
 
     @log_cart_action('REMOVE')
     def remove_item(self, item):
+        from base.utils.inventory import release
+
         with transaction.atomic():
             cart_item = CartItem.objects.filter(cart=self, item=item).first()
             if cart_item and not cart_item.is_deleted:
                 cart_item.is_deleted = True
                 cart_item.save()
                 self.calculate_total()
+                release(self, [item])
 
     @log_cart_action('UPDATE')
     def update_quantity(self, item, quantity):
+        from base.utils.inventory import hold
+
+        quantity = int(quantity)
         if quantity < 1:
             self.remove_item(item)
         else:
-            CartItem.objects.filter(cart=self, item=item).update(quantity=quantity)
-        self.calculate_total()
+            with transaction.atomic():
+                CartItem.objects.filter(cart=self, item=item).update(quantity=quantity)
+                self.calculate_total()
+                hold(self, item, quantity)
 
     @log_cart_action('CLEAR')
     def clear_cart(self):
         """
-        Clears all items from the cart.
+        Clears all items from the cart and releases their stock holds.
         """
+        from base.utils.inventory import release
+
         self.cart_items.all().delete()
         # Recalculate total price
         self.calculate_total()
+        release(self)
 
     def __str__(self):
         return f"Cart for {self.user.username} - Total: ${self.total_price_cents / 100:.2f}"
@@ -108,4 +124,7 @@ class CartItem(BaseModel):
         constraints = [
             models.CheckConstraint(condition=models.Q(quantity__gt=0), name="cart_item_quantity_positive"),
             models.UniqueConstraint(fields=['cart', 'item'], name="unique_cart_item")
+        ]
+        indexes = [
+            LiveIndex(fields=['cart'], name='live_cartitem_cart'),
         ]
\ No newline at end of file
@@ -1,5 +1,5 @@
 from django.db import models
-from .base_modle import BaseModel
+from .base_modle import BaseModel, LiveIndex
 
 # Category Model Refactor
 class Category(BaseModel):
@@ -11,5 +11,10 @@ class Category(BaseModel):
         'self', on_delete=models.SET_NULL, null=True, blank=True, related_name="subcategories"
     )
 
+    class Meta:
+        indexes = [
+            LiveIndex(fields=['parent'], name='live_category_parent'),
+        ]
+
     def __str__(self):
         return self.name
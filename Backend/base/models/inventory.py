@@ -0,0 +1,30 @@
+from django.db import models
+from django.utils.timezone import now
+
+from .cart import Cart
+from .item import Product
+
+
+class StockReservation(models.Model):
+    """
+    Units of a product held for a cart (see base/utils/inventory.py). The
+    held units are also counted in Product.reserved_quantity. Holds expire
+    after STOCK_HOLD_TTL_MINUTES and are released by
+    `manage.py release_expired_holds`; checkout turns them into stock decrements.
+    """
+    cart = models.ForeignKey(Cart, on_delete=models.CASCADE, related_name='stock_reservations')
+    product = models.ForeignKey(Product, on_delete=models.CASCADE, related_name='reservations')
+    quantity = models.PositiveIntegerField()
+    created_at = models.DateTimeField(default=now)
+    expires_at = models.DateTimeField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['cart', 'product'], name='unique_stock_reservation'),
+        ]
+        indexes = [
+            models.Index(fields=['expires_at'], name='idx_reservation_expires'),
+        ]
+
+    def __str__(self):
+        return f"{self.quantity} x {self.product_id} held for cart {self.cart_id}"
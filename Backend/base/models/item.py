@@ -1,7 +1,7 @@
 from django.conf import settings
 from django.db import models
 from django.db.models import Q, CheckConstraint
-from .base_modle import BaseModel
+from .base_modle import BaseModel, LiveIndex
 from .category import Category
 from django.contrib.postgres.search import SearchVectorField
 from django.contrib.postgres.indexes import GinIndex, BTreeIndex
@@ -28,12 +28,16 @@ class Item(BaseModel):
     search_vector = SearchVectorField(null=True, editable=False)
     metadata = models.JSONField(null=True, blank=True)
     image = models.ImageField(upload_to='items/', null=True, blank=True)
+    # Resized derivatives of `image`, see base/utils/images.py
+    image_variants = models.JSONField(default=dict, blank=True, editable=False)
 
     class Meta:
         indexes = [
             GinIndex(fields=['search_vector'], name='gin_item_search_vector'),
             GinIndex(fields=['metadata'], name='gin_item_metadata'),
             BTreeIndex(fields=['name'], name='idx_item_name'),
+            LiveIndex(fields=['seller', '-created_at'], name='live_item_seller_created'),
+            LiveIndex(fields=['created_at'], name='live_item_created'),
         ]
 
     def __str__(self):
@@ -44,6 +48,8 @@ class Product(Item):
     Represents a physical product derived from an Item.
     """
     quantity = models.PositiveIntegerField(default=1)
+    # Units held by carts (StockReservation); available = quantity - reserved_quantity
+    reserved_quantity = models.PositiveIntegerField(default=0, editable=False)
 
     class Meta:
         constraints = [
@@ -83,6 +89,9 @@ class ItemCategory(BaseModel):
         constraints = [
             models.UniqueConstraint(fields=["item", "category"], name="unique_item_category"),
         ]
+        indexes = [
+            LiveIndex(fields=['category'], name='live_itemcategory_category'),
+        ]
 
     def __str__(self):
         return f"{self.item.name} in {self.category.name}"
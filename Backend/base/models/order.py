@@ -2,7 +2,7 @@ from django.conf import settings
 from django.db import models
 from django.db.models import CheckConstraint, Q, Sum, F
 from django.contrib.postgres.indexes import GinIndex
-from .base_modle import BaseModel
+from .base_modle import BaseModel, LiveIndex
 from .item import Item
 from .cart import Cart, CartItem
 
@@ -13,6 +13,24 @@ class OrderStatus(models.TextChoices):
     DELIVERED = "DELIVERED","Delivered"
     CANCELLED = "CANCELLED","Cancelled"
 
+# The order state machine: status -> statuses it may move to. Any other
+# change is rejected (see base/utils/order_transitions.py).
+ORDER_TRANSITIONS = {
+    OrderStatus.PENDING:   {OrderStatus.PAID, OrderStatus.CANCELLED},
+    OrderStatus.PAID:      {OrderStatus.SHIPPED},
+    OrderStatus.SHIPPED:   {OrderStatus.DELIVERED},
+    OrderStatus.DELIVERED: set(),
+    OrderStatus.CANCELLED: set(),
+}
+
+# Orders whose items and details can still be edited
+EDITABLE_ORDER_STATUSES = {OrderStatus.PENDING}
+
+
+def sources_for(status):
+    """The statuses an order can move to `status` from."""
+    return sorted(source for source, targets in ORDER_TRANSITIONS.items() if status in targets)
+
 class Order(BaseModel):
     user = models.ForeignKey(
             settings.AUTH_USER_MODEL,
@@ -27,6 +45,13 @@ class Order(BaseModel):
     total_price_cents  = models.BigIntegerField(default=0)
     metadata           = models.JSONField(null=True, blank=True)
 
+    @property
+    def is_editable(self):
+        return self.status in EDITABLE_ORDER_STATUSES
+
+    def can_transition_to(self, status):
+        return status in ORDER_TRANSITIONS.get(self.status, ())
+
     def calculate_total(self):
         total = self.order_items.aggregate(
             total=Sum(F('quantity') * F('price_cents'))
@@ -54,8 +79,10 @@ class Order(BaseModel):
 
     class Meta:
         indexes = [
-            # only extra index; the FK on `user` is auto-indexed
             GinIndex(fields=['metadata'], name='gin_order_metadata'),
+            # order history: a user's live orders, newest first
+            LiveIndex(fields=['user', '-created_at'], name='live_order_user_created'),
+            LiveIndex(fields=['created_at'], name='live_order_created'),
         ]
 
 
@@ -76,6 +103,9 @@ class OrderItem(BaseModel):
                 name="quantity_positive"
             ),
         ]
+        indexes = [
+            LiveIndex(fields=['order'], name='live_orderitem_order'),
+        ]
 
     def __str__(self):
         return f"{self.quantity}×{self.item.name} in Order #{self.order.id}"
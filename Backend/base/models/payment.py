@@ -1,11 +1,31 @@
 from django.db import models
-from .base_modle import BaseModel
+from .base_modle import BaseModel, LiveIndex
 from .order import Order
 
 
+class PaymentStatus(models.TextChoices):
+    PENDING    = "PENDING",    "Pending"
+    PROCESSING = "PROCESSING", "Processing"
+    AUTHORIZED = "AUTHORIZED", "Authorized"
+    DECLINED   = "DECLINED",   "Declined"
+    VOIDED     = "VOIDED",     "Voided"
+
 
 class Payment(BaseModel):
     order = models.ForeignKey(Order, on_delete=models.CASCADE, related_name="payments")
     amount_cents = models.BigIntegerField()
     payment_method = models.CharField(max_length=50)
     transaction_id = models.CharField(max_length=255, unique=True, blank=True, null=True)
+    # Set by the settlement worker (base/payments/settlement.py)
+    status = models.CharField(max_length=20, choices=PaymentStatus.choices, default=PaymentStatus.PENDING)
+    decline_reason = models.CharField(max_length=255, blank=True, default='')
+
+    class Meta:
+        indexes = [
+            LiveIndex(fields=['order'], name='live_payment_order'),
+            # the settlement queue: pending/processing payments, oldest first
+            models.Index(
+                fields=['status', 'updated_at'], name='idx_payment_unsettled',
+                condition=models.Q(status__in=['PENDING', 'PROCESSING']),
+            ),
+        ]
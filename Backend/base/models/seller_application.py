@@ -1,7 +1,7 @@
 from django.conf import settings
 from django.db import models
 from django.utils import timezone
-from .base_modle import BaseModel  # or wherever your BaseModel lives
+from .base_modle import BaseModel, LiveIndex  # or wherever your BaseModel lives
 
 class SellerApplication(BaseModel):
     STATUS_PENDING  = "PENDING"
@@ -39,6 +39,9 @@ class SellerApplication(BaseModel):
 
     class Meta:
         ordering = ["-submitted_at"]
+        indexes = [
+            LiveIndex(fields=['user'], name='live_sellerapp_user'),
+        ]
         # if you want to prevent multiple pending, enforce in view
 
     def __str__(self):
@@ -0,0 +1,52 @@
+# base/payments/__init__.py
+"""
+Payment gateway backends.
+
+PAYMENT_BACKEND names the class (default: the local simulator) and
+PAYMENT_BACKEND_OPTIONS its keyword arguments. Backends implement
+`authorize(payment) -> AuthorizationResult` and `void(payment, transaction_id)`;
+settlement (when and where
+authorize() runs, and what it does to Payment/Order rows) lives in
+base/payments/settlement.py.
+"""
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+__all__ = ['AuthorizationResult', 'BasePaymentBackend', 'get_backend', 'reset_backend']
+
+
+@dataclass(frozen=True)
+class AuthorizationResult:
+    approved: bool
+    transaction_id: str = None
+    decline_reason: str = ''
+
+
+class BasePaymentBackend:
+    def authorize(self, payment):
+        """Authorize `payment.amount_cents`; may block on the gateway."""
+        raise NotImplementedError
+
+    def void(self, payment, transaction_id):
+        """Release an authorization that will not be captured (the order was cancelled)."""
+        raise NotImplementedError
+
+
+_backend = None
+
+
+def get_backend():
+    """The configured backend instance (created once per process)."""
+    global _backend
+    if _backend is None:
+        backend_class = import_string(getattr(settings, 'PAYMENT_BACKEND', 'base.payments.simulator.SimulatorBackend'))
+        _backend = backend_class(**getattr(settings, 'PAYMENT_BACKEND_OPTIONS', {}))
+    return _backend
+
+
+def reset_backend():
+    """Forget the cached backend, e.g. after changing the settings in tests."""
+    global _backend
+    _backend = None
@@ -0,0 +1,156 @@
+# base/payments/settlement.py
+"""
+Settlement: run a payment's authorization and apply the outcome.
+
+A payment moves PENDING -> PROCESSING (claimed with a conditional UPDATE, so
+a payment is only ever authorized by one worker) -> AUTHORIZED, DECLINED or
+VOIDED. The gateway call happens outside any transaction; only the short
+status updates take row locks.
+
+* An order that is no longer PENDING when its payment is claimed (the buyer
+  cancelled it while the payment waited), or whose total differs from the
+  payment's amount, is never sent to the gateway: the payment is DECLINED.
+* An authorized payment marks its order PAID, guarded on the order still
+  being PENDING with the same total. If the order was cancelled while the
+  gateway was authorizing, the authorization is voided instead and the
+  payment is VOIDED.
+* A declined payment cancels its order, which puts the stock back
+  (transition_orders), unless another payment of the order is still
+  pending or went through. The cart was emptied at checkout, so the buyer
+  retries by checking out again.
+
+PAYMENT_SETTLEMENT picks where checkout runs it:
+    'sync'  - inline on the request thread (the response has the final status)
+    'async' - in the background worker pool once the order commits; the
+              response returns the PENDING order straight away
+`manage.py settle_payments` settles anything left pending (e.g. tasks lost
+on a restart) and reclaims payments stuck in PROCESSING.
+"""
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils.timezone import now
+
+from base.models.order import Order, OrderStatus
+from base.models.payment import Payment, PaymentStatus
+from base.utils.background import submit_on_commit
+from base.utils.order_transitions import transition_orders
+
+from . import get_backend
+
+logger = logging.getLogger('freemarketbackend')
+
+# A payment in one of these blocks another payment for the same order
+LIVE_PAYMENT_STATUSES = (PaymentStatus.PENDING, PaymentStatus.PROCESSING, PaymentStatus.AUTHORIZED)
+
+
+def _decline(payment_id, reason):
+    Payment.objects.filter(pk=payment_id).update(
+        status=PaymentStatus.DECLINED, decline_reason=reason[:255], updated_at=now(),
+    )
+
+
+def _void(backend, payment, transaction_id):
+    """The order was cancelled during authorization: release the hold on the buyer's funds."""
+    try:
+        backend.void(payment, transaction_id)
+    except Exception:
+        # keep the authorization on record so it can be voided by hand
+        Payment.objects.filter(pk=payment.pk).update(
+            status=PaymentStatus.AUTHORIZED, transaction_id=transaction_id,
+            decline_reason="Order cancelled during authorization; void failed.", updated_at=now(),
+        )
+        logger.exception("Voiding payment %s of cancelled order %s failed", payment.pk, payment.order_id)
+        return PaymentStatus.AUTHORIZED
+    Payment.objects.filter(pk=payment.pk).update(
+        status=PaymentStatus.VOIDED, transaction_id=transaction_id,
+        decline_reason="Order cancelled during authorization.", updated_at=now(),
+    )
+    return PaymentStatus.VOIDED
+
+
+def _other_live_payments(payment):
+    """The order's other payments that are still being settled or went through."""
+    return Payment.objects.filter(order_id=payment.order_id, status__in=LIVE_PAYMENT_STATUSES).exclude(pk=payment.pk)
+
+
+def settle_payment(payment_id):
+    """Authorize payment `payment_id` if it is still pending; returns its final status or None."""
+    claimed = Payment.objects.filter(pk=payment_id, status=PaymentStatus.PENDING).update(
+        status=PaymentStatus.PROCESSING, updated_at=now(),
+    )
+    if not claimed:
+        return None
+    payment = Payment.objects.select_related('order').get(pk=payment_id)
+
+    if payment.order.status != OrderStatus.PENDING:
+        _decline(payment_id, f"Order is {payment.order.status.lower()}.")
+        logger.info("Payment %s for order %s declined: order is %s", payment_id, payment.order_id, payment.order.status)
+        return PaymentStatus.DECLINED
+    if payment.amount_cents != payment.order.total_price_cents:
+        _decline(payment_id, "Amount does not match the order total.")
+        logger.warning("Payment %s for order %s declined: %s cents for a %s cent order",
+                       payment_id, payment.order_id, payment.amount_cents, payment.order.total_price_cents)
+        return PaymentStatus.DECLINED
+
+    backend = get_backend()
+    try:
+        result = backend.authorize(payment)
+    except Exception:
+        # back in the queue for the next settle_payments run
+        Payment.objects.filter(pk=payment_id, status=PaymentStatus.PROCESSING).update(
+            status=PaymentStatus.PENDING, updated_at=now(),
+        )
+        logger.exception("Authorization of payment %s failed", payment_id)
+        return None
+
+    if result.approved:
+        with transaction.atomic():
+            paid = Order.objects.filter(
+                pk=payment.order_id, status=OrderStatus.PENDING, total_price_cents=payment.amount_cents,
+            ).update(
+                status=OrderStatus.PAID, updated_at=now(),
+            )
+            if paid:
+                Payment.objects.filter(pk=payment_id).update(
+                    status=PaymentStatus.AUTHORIZED,
+                    transaction_id=payment.transaction_id or result.transaction_id,
+                    updated_at=now(),
+                )
+        final = PaymentStatus.AUTHORIZED if paid else _void(
+            backend, payment, payment.transaction_id or result.transaction_id,
+        )
+    else:
+        with transaction.atomic():
+            _decline(payment_id, result.decline_reason)
+            if not _other_live_payments(payment).exists():
+                transition_orders([payment.order_id], OrderStatus.CANCELLED)
+        final = PaymentStatus.DECLINED
+    logger.info("Payment %s for order %s %s", payment_id, payment.order_id, final.lower())
+    return final
+
+
+def request_settlement(payment):
+    """Settle `payment` the way PAYMENT_SETTLEMENT says (see module docstring)."""
+    if getattr(settings, 'PAYMENT_SETTLEMENT', 'sync') == 'async':
+        submit_on_commit(settle_payment, payment.pk)
+    else:
+        settle_payment(payment.pk)
+
+
+def reclaim_stuck(older_than_seconds):
+    """Put payments PROCESSING for longer than `older_than_seconds` back to PENDING."""
+    cutoff = now() - timedelta(seconds=older_than_seconds)
+    return Payment.objects.filter(status=PaymentStatus.PROCESSING, updated_at__lt=cutoff).update(
+        status=PaymentStatus.PENDING, updated_at=now(),
+    )
+
+
+def pending_payment_ids(limit=None):
+    queryset = (
+        Payment.objects.filter(status=PaymentStatus.PENDING)
+        .order_by('updated_at').values_list('pk', flat=True)
+    )
+    return list(queryset[:limit] if limit else queryset)
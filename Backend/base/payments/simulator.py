@@ -0,0 +1,34 @@
+# base/payments/simulator.py
+import random
+import threading
+import time
+import uuid
+
+from . import AuthorizationResult, BasePaymentBackend
+
+
+class SimulatorBackend(BasePaymentBackend):
+    """
+    Local stand-in for a payment gateway. Each authorization sleeps for
+    `latency_ms` (± `jitter_ms`) and is declined with probability
+    `failure_rate`; `seed` makes the sequence of outcomes reproducible.
+    """
+    def __init__(self, latency_ms=0, jitter_ms=0, failure_rate=0.0, seed=None):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.failure_rate = failure_rate
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def authorize(self, payment):
+        with self._lock:
+            delay = self.latency_ms + self._rng.uniform(-self.jitter_ms, self.jitter_ms)
+            declined = self._rng.random() < self.failure_rate
+        if delay > 0:
+            time.sleep(delay / 1000)
+        if declined:
+            return AuthorizationResult(approved=False, decline_reason='Declined by simulator')
+        return AuthorizationResult(approved=True, transaction_id=f"sim-{uuid.uuid4()}")
+
+    def void(self, payment, transaction_id):
+        pass
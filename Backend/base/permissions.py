@@ -58,3 +58,26 @@ class ReadOnlyOrOwner(BasePermission):
             return True
         return getattr(obj, "seller", None) == user \
             or getattr(obj, "user", None) == user
+
+
+class IsAdminRole(BasePermission):
+    """
+    Staff, superusers or members of `roles`, for every method (SAFE_METHODS included).
+    """
+    roles = ('Admin',)
+
+    def has_permission(self, request, view):
+        user = request.user
+        if not (user and user.is_authenticated):
+            return False
+        if user.is_staff or user.is_superuser:
+            return True
+        return user.groups.filter(name__in=self.roles).exists()
+
+
+class IsFulfillmentStaff(IsAdminRole):
+    """
+    Staff, superusers, Admins and the Fulfillment group: the people who move
+    orders through shipping in bulk.
+    """
+    roles = ('Fulfillment', 'Admin')
@@ -0,0 +1,74 @@
+# base/renderers.py
+"""
+orjson-backed JSON renderer and parser for DRF.
+
+The output matches rest_framework.renderers.JSONRenderer with the default
+settings (compact, UTF-8, U+2028/2029 escaped): datetimes, Decimal, lazy
+strings and the other non-JSON types are handed to DRF's own
+JSONEncoder.default, so they are formatted exactly as before. Floats are
+the exception: orjson writes exponents without a plus sign (1e16, not
+1e+16), which parses to the same value, and writes NaN and Infinity as
+null where DRF's strict renderer raises ValueError.
+
+Requests for indented output, and payloads orjson can't encode (e.g. ints
+beyond 64 bits), go through the stock renderer. Without orjson installed
+both classes behave like their DRF parents.
+"""
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.settings import api_settings
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is in requirements.txt
+    orjson = None
+
+__all__ = ['FastJSONRenderer', 'FastJSONParser']
+
+if orjson is not None:
+    # datetimes are passed through so DRF's encoder formats them (ms precision, 'Z' for UTC)
+    _OPTIONS = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+    _default = JSONEncoder().default
+
+
+class FastJSONRenderer(JSONRenderer):
+    def _use_orjson(self, accepted_media_type, renderer_context):
+        return (
+            orjson is not None
+            and self.encoder_class is JSONEncoder
+            and not self.get_indent(accepted_media_type or '', renderer_context or {})
+            and api_settings.COMPACT_JSON
+            and api_settings.UNICODE_JSON
+        )
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        if not self._use_orjson(accepted_media_type, renderer_context):
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            ret = orjson.dumps(data, default=_default, option=_OPTIONS)
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        # Same escaping as JSONRenderer: these are valid JSON but not valid JavaScript
+        if b'\xe2\x80\xa8' in ret or b'\xe2\x80\xa9' in ret:
+            ret = ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+        return ret
+
+
+class FastJSONParser(JSONParser):
+    def parse(self, stream, media_type=None, parser_context=None):
+        if orjson is None:
+            return super().parse(stream, media_type, parser_context)
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        try:
+            raw = stream.read()
+            if encoding.lower().replace('-', '') != 'utf8':
+                raw = raw.decode(encoding)
+            return orjson.loads(raw)
+        except (ValueError, UnicodeDecodeError) as exc:
+            raise ParseError('JSON parse error - %s' % str(exc))
@@ -1,3 +1,4 @@
 from .models import *
 from .views import *
-from .item_search import *
\ No newline at end of file
+from .item_search import *
+from .item_import import *
\ No newline at end of file
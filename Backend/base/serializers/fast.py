@@ -0,0 +1,337 @@
+# base/serializers/fast.py
+"""
+Fast read path for list endpoints.
+
+`compile_read_plan(SerializerClass)` turns a ModelSerializer into a ReadPlan:
+the columns to fetch with `.values()` plus one precompiled getter per output
+field. Nested serializers, many-to-many and reverse relations are loaded with
+one batched query per relation for the whole page instead of per row, and no
+model instances or serializer fields are built per row. The output is the
+same JSON the serializer produces.
+
+Serializers the compiler can't reproduce exactly (HyperlinkedRelatedField,
+StringRelatedField, `source='*'`, method fields that touch more than the
+row's own columns, ...) get no plan; callers fall back to the serializer.
+SerializerMethodFields are only compiled when they are listed in the
+serializer's `Meta.fast_read_methods`, meaning the method reads nothing but
+the model's concrete columns (it is called with a row object, not an instance).
+"""
+from django.core.exceptions import FieldDoesNotExist
+from django.db import models
+from rest_framework import serializers
+from rest_framework.fields import ModelField
+from rest_framework.relations import ManyRelatedField, PrimaryKeyRelatedField, SlugRelatedField
+
+from .fields import ItemImageField
+
+__all__ = ['ReadPlan', 'compile_read_plan', 'fast_serialize']
+
+
+class Unsupported(Exception):
+    """The serializer has a field the fast path can't reproduce."""
+
+
+class _Row:
+    """Attribute access over a `.values()` row, for fast_read_methods."""
+    __slots__ = ('_row',)
+
+    def __init__(self, row):
+        self._row = row
+
+    def __getattr__(self, name):
+        try:
+            return self._row[name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+
+class _Column:
+    """A plain value read from the row and passed through the DRF field's to_representation."""
+
+    def __init__(self, key, column, convert=None):
+        self.key, self.column, self.convert = key, column, convert
+
+    def load(self, rows, context):
+        return None
+
+    def get(self, row, loaded, context):
+        value = row[self.column]
+        if value is None or self.convert is None:
+            return value
+        return self.convert(value)
+
+
+class _File:
+    """FileField/ImageField: the stored name turned into a (absolute) URL like DRF does."""
+
+    def __init__(self, key, column, storage, use_url):
+        self.key, self.column, self.storage, self.use_url = key, column, storage, use_url
+
+    def load(self, rows, context):
+        return None
+
+    def get(self, row, loaded, context):
+        name = row[self.column]
+        if not name:
+            return None
+        if not self.use_url:
+            return name
+        url = self.storage.url(name)
+        request = context.get('request')
+        return request.build_absolute_uri(url) if request is not None else url
+
+
+class _ItemImage:
+    """ItemImageField: picks a derivative from the row's image_variants."""
+
+    def __init__(self, key, column, field):
+        self.key, self.column, self.field = key, column, field
+        self.extra_column = 'image_variants'
+
+    def load(self, rows, context):
+        return None
+
+    def get(self, row, loaded, context):
+        return self.field.url_for(row[self.column], row[self.extra_column], context)
+
+
+class _Method:
+    """A SerializerMethodField declared row-safe in Meta.fast_read_methods."""
+
+    def __init__(self, key, method_name):
+        self.key, self.method_name = key, method_name
+
+    def load(self, rows, context):
+        return None
+
+    def get(self, row, loaded, context):
+        return getattr(context['_serializer'], self.method_name)(_Row(row))
+
+
+class _Nested:
+    """Forward FK rendered with a nested serializer, fetched in one query for the page."""
+
+    def __init__(self, key, column, model, plan):
+        self.key, self.column, self.model, self.plan = key, column, model, plan
+
+    def load(self, rows, context):
+        ids = {row[self.column] for row in rows} - {None}
+        if not ids:
+            return {}
+        # instance.<fk> goes through the base manager, soft-deleted rows included
+        related = list(self.plan.values(self.model._base_manager.filter(pk__in=ids)))
+        return dict(zip((r['pk'] for r in related), self.plan.render(related, context)))
+
+    def get(self, row, loaded, context):
+        return loaded.get(row[self.column])
+
+
+class _NestedMany:
+    """Reverse FK rendered with a nested `many=True` serializer."""
+
+    def __init__(self, key, model, fk_attname, plan):
+        self.key, self.model, self.fk_attname, self.plan = key, model, fk_attname, plan
+
+    def load(self, rows, context):
+        ids = [row['pk'] for row in rows]
+        if not ids:
+            return {}
+        # related managers use the default manager: soft-deleted children are hidden
+        queryset = self.model._default_manager.filter(**{f"{self.fk_attname}__in": ids})
+        related = list(self.plan.values(queryset.order_by(*(self.model._meta.ordering or ['pk'])), self.fk_attname))
+        grouped = {}
+        for child, data in zip(related, self.plan.render(related, context)):
+            grouped.setdefault(child[self.fk_attname], []).append(data)
+        return grouped
+
+    def get(self, row, loaded, context):
+        return loaded.get(row['pk'], [])
+
+
+class _ValueList:
+    """Many-to-many rendered as a list of related PKs or slugs."""
+
+    def __init__(self, key, model, query_name, value_column):
+        self.key, self.model, self.query_name, self.value_column = key, model, query_name, value_column
+
+    def load(self, rows, context):
+        ids = [row['pk'] for row in rows]
+        if not ids:
+            return {}
+        pairs = (
+            self.model._default_manager
+            .filter(**{f"{self.query_name}__in": ids})
+            .order_by(*(self.model._meta.ordering or ['pk']))
+            .values_list(self.query_name, self.value_column)
+        )
+        grouped = {}
+        for owner_id, value in pairs:
+            grouped.setdefault(owner_id, []).append(value)
+        return grouped
+
+    def get(self, row, loaded, context):
+        return loaded.get(row['pk'], [])
+
+
+class ReadPlan:
+    def __init__(self, serializer_class, model, columns, getters):
+        self.serializer_class = serializer_class
+        self.model = model
+        self.columns = columns
+        self.getters = getters
+
+    def values(self, queryset, *extra):
+        """`queryset` reduced to the dict rows this plan renders."""
+        # prefetches are for instances; they can't run on values() rows
+        extra = [column for column in extra if column not in self.columns]
+        return queryset.prefetch_related(None).values(*self.columns, *extra)
+
+    def render(self, rows, context=None):
+        rows = list(rows)
+        context = dict(context or {})
+        context['_serializer'] = self.serializer_class(context=context)
+        loaded = [getter.load(rows, context) for getter in self.getters]
+        getters = list(zip(self.getters, loaded))
+        return [
+            {getter.key: getter.get(row, batch, context) for getter, batch in getters}
+            for row in rows
+        ]
+
+
+def _model_field(model, name):
+    try:
+        return model._meta.get_field(name)
+    except FieldDoesNotExist:
+        return None
+
+
+def _compile_field(name, field, model, method_fields):
+    if field.source == '*':
+        if isinstance(field, serializers.SerializerMethodField) and name in method_fields:
+            return _Method(name, field.method_name)
+        raise Unsupported(f"{name}: source='*'")
+
+    attrs = field.source_attrs
+    model_field = _model_field(model, attrs[0])
+    if model_field is None:
+        raise Unsupported(f"{name}: '{field.source}' is not a model field")
+
+    if isinstance(field, ManyRelatedField):
+        child = field.child_relation
+        if not model_field.many_to_many or model_field.auto_created or len(attrs) > 1:
+            raise Unsupported(f"{name}: only forward many-to-many lists are supported")
+        if type(child) is PrimaryKeyRelatedField and child.pk_field is None:
+            value_column = 'pk'
+        elif type(child) is SlugRelatedField:
+            value_column = child.slug_field
+        else:
+            raise Unsupported(f"{name}: {type(child).__name__}")
+        return _ValueList(name, model_field.related_model, model_field.related_query_name(), value_column)
+
+    if isinstance(field, serializers.ListSerializer):
+        if not (model_field.one_to_many and model_field.auto_created) or len(attrs) > 1:
+            raise Unsupported(f"{name}: only reverse foreign keys can be nested with many=True")
+        child_model = model_field.related_model
+        return _NestedMany(name, child_model, model_field.field.attname, compile_read_plan(type(field.child), strict=True))
+
+    if isinstance(field, serializers.ModelSerializer):
+        if not (model_field.many_to_one or model_field.one_to_one) or model_field.auto_created or len(attrs) > 1:
+            raise Unsupported(f"{name}: only forward foreign keys can be nested")
+        return _Nested(name, model_field.attname, model_field.related_model, compile_read_plan(type(field), strict=True))
+
+    if isinstance(field, serializers.BaseSerializer):
+        raise Unsupported(f"{name}: {type(field).__name__}")
+
+    if isinstance(field, PrimaryKeyRelatedField):
+        if len(attrs) > 1 or not model_field.concrete or not model_field.is_relation or field.pk_field is not None:
+            raise Unsupported(f"{name}: primary key fields must point at a local foreign key")
+        return _Column(name, model_field.attname)
+
+    if isinstance(field, SlugRelatedField):
+        if len(attrs) > 1 or not model_field.concrete or not model_field.is_relation:
+            raise Unsupported(f"{name}: slug fields must point at a local foreign key")
+        return _Column(name, f"{model_field.name}__{field.slug_field}")
+
+    if isinstance(field, (serializers.RelatedField, serializers.SerializerMethodField)):
+        raise Unsupported(f"{name}: {type(field).__name__}")
+
+    # plain value, possibly across forward foreign keys ('item.name')
+    target, current = model_field, model
+    for attr in attrs[1:]:
+        if not (target.many_to_one or target.one_to_one) or target.null:
+            # DRF skips the key when a nullable hop is empty; not worth mirroring
+            raise Unsupported(f"{name}: '{field.source}' crosses a nullable or to-many relation")
+        current = target.related_model
+        target = _model_field(current, attr)
+        if target is None:
+            raise Unsupported(f"{name}: '{field.source}' is not a model field")
+    if not target.concrete or target.many_to_many or target.one_to_many:
+        raise Unsupported(f"{name}: '{field.source}' is not a column")
+    column = '__'.join(attrs[:-1] + [target.attname if len(attrs) == 1 else target.name])
+
+    if isinstance(field, ItemImageField):
+        if len(attrs) > 1:
+            raise Unsupported(f"{name}: item images must be read from the item itself")
+        return _ItemImage(name, column, field)
+    if isinstance(field, serializers.FileField):
+        if not isinstance(target, models.FileField):
+            raise Unsupported(f"{name}: file field on a non-file column")
+        return _File(name, column, target.storage, getattr(field, 'use_url', True))
+    if isinstance(field, ModelField):
+        attname = target.attname
+        return _Column(name, column, lambda value: field.to_representation(_Row({attname: value})))
+    return _Column(name, column, field.to_representation)
+
+
+_plans = {}
+
+
+def compile_read_plan(serializer_class, strict=False):
+    """
+    The ReadPlan for `serializer_class`, or None when it can't be compiled
+    (raises Unsupported instead with `strict`). Plans are cached per class.
+    """
+    if serializer_class not in _plans:
+        try:
+            _plans[serializer_class] = _compile(serializer_class)
+        except Unsupported as e:
+            _plans[serializer_class] = e
+    plan = _plans[serializer_class]
+    if isinstance(plan, Unsupported):
+        if strict:
+            raise plan
+        return None
+    return plan
+
+
+def _compile(serializer_class):
+    if not issubclass(serializer_class, serializers.ModelSerializer):
+        raise Unsupported(f"{serializer_class.__name__} is not a ModelSerializer")
+    meta = serializer_class.Meta
+    model = meta.model
+    method_fields = set(getattr(meta, 'fast_read_methods', ()))
+    serializer = serializer_class()
+
+    getters = []
+    for name, field in serializer.fields.items():
+        if field.write_only:
+            continue
+        getters.append(_compile_field(name, field, model, method_fields))
+
+    columns = ['pk']
+    if any(isinstance(g, _Method) for g in getters):
+        # row-safe methods get every concrete column of the model
+        columns += [f.attname for f in model._meta.concrete_fields]
+    for getter in getters:
+        for column in (getattr(getter, 'column', None), getattr(getter, 'extra_column', None)):
+            if column is not None and column not in columns:
+                columns.append(column)
+    return ReadPlan(serializer_class, model, columns, getters)
+
+
+def fast_serialize(serializer_class, queryset, context=None):
+    """Render `queryset` like `serializer_class(queryset, many=True).data`, or None without a plan."""
+    plan = compile_read_plan(serializer_class)
+    if plan is None:
+        return None
+    return plan.render(plan.values(queryset), context)
@@ -0,0 +1,57 @@
+from django.core.files.storage import default_storage
+from rest_framework import serializers
+
+from base.utils.uploads import check_image_upload, stored_image_name
+
+IMAGE_SIZES = ('thumb', 'medium', 'original')
+IMAGE_FORMATS = ('webp', 'jpeg')
+
+
+class ItemImageField(serializers.ImageField):
+    """
+    Item.image rendered as one of its derivatives (see base/utils/images.py):
+    `thumb` on list actions, `medium` everywhere else, in WebP. Clients can
+    ask for another size or format with ?image_size=thumb|medium|original and
+    ?image_format=webp|jpeg. Until the derivatives exist the original is used.
+
+    Uploads are checked for size and pixel count before Pillow decodes them
+    and stored under a content hash; an image that is already stored is
+    reused instead of written again (see base/utils/uploads.py).
+    """
+    def to_internal_value(self, data):
+        if not hasattr(data, 'seek'):
+            return super().to_internal_value(data)  # let ImageField report the error
+        fmt = check_image_upload(data)
+        upload = super().to_internal_value(data)
+        name, exists = stored_image_name(upload, fmt)
+        # a str is stored on the model as-is, without writing the file again
+        return name if exists else upload
+
+    def to_representation(self, value):
+        if not value:
+            return None
+        return self.url_for(value.name, getattr(value.instance, 'image_variants', None), self.context)
+
+    def variant_for(self, context):
+        request = context.get('request')
+        params = getattr(request, 'query_params', None) or getattr(request, 'GET', {})
+        size = params.get('image_size') or context.get('image_size')
+        if size not in IMAGE_SIZES:
+            view = context.get('view')
+            size = 'thumb' if getattr(view, 'action', None) == 'list' else 'medium'
+        fmt = params.get('image_format')
+        return size, fmt if fmt in IMAGE_FORMATS else 'webp'
+
+    def url_for(self, name, variants, context):
+        """URL of the right derivative of the stored image `name` (also used by the fast read path)."""
+        if not name:
+            return None
+        variants = variants or {}
+        size, fmt = self.variant_for(context)
+        if size != 'original' and variants.get('source') == name:
+            name = variants.get('sizes', {}).get(size, {}).get(fmt, name)
+        if not getattr(self, 'use_url', True):
+            return name
+        url = default_storage.url(name)
+        request = context.get('request')
+        return request.build_absolute_uri(url) if request is not None else url
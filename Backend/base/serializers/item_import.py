@@ -0,0 +1,29 @@
+from rest_framework import serializers
+from base.models.item import Currency
+
+
+class CategoryNamesField(serializers.ListField):
+    """
+    Category names as a list, or as a single "A|B" string (CSV cells).
+    """
+    child = serializers.CharField(max_length=100)
+
+    def to_internal_value(self, data):
+        if isinstance(data, str):
+            data = [name.strip() for name in data.split('|') if name.strip()]
+        return super().to_internal_value(data)
+
+
+class ItemImportRowSerializer(serializers.Serializer):
+    """
+    One row of a bulk Product/Service import.
+    """
+    item_type = serializers.ChoiceField(choices=['product', 'service'])
+    name = serializers.CharField(max_length=255)
+    description = serializers.CharField(required=False, allow_blank=True, allow_null=True)
+    price_cents = serializers.IntegerField(min_value=0)
+    currency = serializers.ChoiceField(choices=Currency.choices)
+    quantity = serializers.IntegerField(required=False, min_value=1)
+    service_duration = serializers.IntegerField(required=False, min_value=1)
+    service_type = serializers.CharField(required=False, max_length=50)
+    categories = CategoryNamesField(required=False, default=list)
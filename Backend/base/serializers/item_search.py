@@ -1,15 +1,17 @@
 from rest_framework import serializers
 from base.models import Item
+from .fields import ItemImageField
 
 class ItemSearchSerializer(serializers.ModelSerializer):
     item_type = serializers.SerializerMethodField()
     quantity = serializers.SerializerMethodField()
     service_duration = serializers.SerializerMethodField()
     service_type = serializers.SerializerMethodField()
+    image = ItemImageField(read_only=True)
 
     class Meta:
         model = Item
-        fields = '__all__'
+        exclude = ['image_variants']
         read_only_fields = ['search_vector']
 
     def get_item_type(self, obj):
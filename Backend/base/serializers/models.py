@@ -1,9 +1,13 @@
+from django.conf import settings
 from rest_framework import serializers
 from ..models import (
     CustomUser, Address, Category, Item, Product, Service, ItemCategory,
     Order, OrderItem, Payment, Cart, CartItem
 )
 from base.models.logs.cart_activity_log import CartActivityLog
+from base.models.order import OrderStatus
+from base.utils.order_transitions import TARGETS as TRANSITION_TARGETS
+from .fields import ItemImageField
 # User Serializer
 class UserSerializer(serializers.ModelSerializer):
     password = serializers.CharField(write_only=True)
@@ -95,19 +99,19 @@ class CategorySerializer(serializers.ModelSerializer):
 # Item Serializer
 class ItemSerializer(serializers.ModelSerializer):
     seller = UserSerializer(read_only=True)
-    image = serializers.ImageField(required=False, allow_null=True)
+    image = ItemImageField(required=False, allow_null=True)
 
     class Meta:
         model = Item
-        fields = '__all__'
+        exclude = ['image_variants']
 
 # Product Serializer
 class ProductSerializer(serializers.ModelSerializer):
-    image = serializers.ImageField(required=False, allow_null=True)
+    image = ItemImageField(required=False, allow_null=True)
 
     class Meta:
         model = Product
-        fields = '__all__'
+        exclude = ['image_variants']
 
     def validate_quantity(self, value):
         if value <= 0:
@@ -116,11 +120,11 @@ class ProductSerializer(serializers.ModelSerializer):
 
 # Service Serializer
 class ServiceSerializer(serializers.ModelSerializer):
-    image = serializers.ImageField(required=False, allow_null=True)
+    image = ItemImageField(required=False, allow_null=True)
 
     class Meta:
         model = Service
-        fields ='__all__'
+        exclude = ['image_variants']
     
     def validate_service_duration(self, value):
         if value <= 0:
@@ -147,6 +151,8 @@ class OrderItemSerializer(serializers.ModelSerializer):
     class Meta:
         model = OrderItem
         fields = ['id', 'item', 'item_name', 'quantity', 'price_cents', 'total_price']
+        # get_total_price only reads columns, so list endpoints can use the fast path
+        fast_read_methods = ['total_price']
 
     def get_total_price(self, obj):
         """
@@ -165,7 +171,8 @@ class OrderSerializer(serializers.ModelSerializer):
     class Meta:
         model = Order
         fields = ['id', 'user', 'status', 'order_items', 'total_price_cents', 'created_at', 'updated_at']
-        read_only_fields = ['id', 'total_price_cents', 'created_at', 'updated_at']
+        # status moves through checkout/settlement, cancellation and transition_orders only
+        read_only_fields = ['id', 'status', 'total_price_cents', 'created_at', 'updated_at']
 
     def create(self, validated_data):
         """
@@ -191,13 +198,34 @@ class OrderSerializer(serializers.ModelSerializer):
         return order
 
 
+class OrderBulkTransitionSerializer(serializers.Serializer):
+    """Input of POST /api/orders/bulk-transition/."""
+    order_ids = serializers.ListField(child=serializers.IntegerField(min_value=1), allow_empty=False)
+    status = serializers.ChoiceField(choices=OrderStatus.choices)
+
+    def validate_order_ids(self, value):
+        limit = getattr(settings, 'ORDER_BULK_TRANSITION_MAX', 5000)
+        if len(value) > limit:
+            raise serializers.ValidationError(f"At most {limit} orders can be changed per request.")
+        return value
+
+    def validate_status(self, value):
+        if value not in TRANSITION_TARGETS:
+            # PAID is set by payment settlement only
+            raise serializers.ValidationError(f"Orders cannot be moved to {value}.")
+        return value
+
+
 # Payment Serializer
 class PaymentSerializer(serializers.ModelSerializer):
     order = OrderSerializer(read_only=True)
+    order_id = serializers.PrimaryKeyRelatedField(source='order', queryset=Order.objects.all(), write_only=True)
 
     class Meta:
         model = Payment
         fields = '__all__'
+        # the amount is the order's total, set by the view
+        read_only_fields = ['amount_cents', 'status', 'decline_reason']
 
 # Cart Item Serializer
 class CartItemSerializer(serializers.ModelSerializer):
@@ -28,11 +28,6 @@ class CartOverviewSerializer(serializers.ModelSerializer):
     class Meta:
         model = CartOverview
         fields = '__all__'
-    
-    def to_representation(self, instance):
-        data = super().to_representation(instance)
-        print("Serialized Cart Overview Data:", data)  # Debugging line
-        return data
 
 
 class TopSellingProductsSerializer(serializers.ModelSerializer):
@@ -1,9 +1,29 @@
-from django.db.models.signals import post_migrate
+from django.db.models.signals import post_migrate, post_save
 from django.contrib.auth.models import Group, Permission
 from django.dispatch import receiver
 
+from base.models.item import Item, Product, Service
+from base.utils.background import submit_on_commit
+from base.utils.images import generate_item_variants
+
 @receiver(post_migrate)
 def assign_all_permissions_to_admin(sender, **kwargs):
     admin, _ = Group.objects.get_or_create(name='Admin')
     perms = Permission.objects.all()
-    admin.permissions.set(perms)
\ No newline at end of file
+    admin.permissions.set(perms)
+
+
+@receiver(post_save, sender=Item)
+@receiver(post_save, sender=Product)
+@receiver(post_save, sender=Service)
+def schedule_item_variants(sender, instance, raw=False, **kwargs):
+    """Rebuild the image derivatives in the background when an item's image changes."""
+    if raw:
+        return
+    if not instance.image:
+        if instance.image_variants:
+            Item.all_objects.filter(pk=instance.pk).update(image_variants={})
+            instance.image_variants = {}
+        return
+    if (instance.image_variants or {}).get('source') != instance.image.name:
+        submit_on_commit(generate_item_variants, instance.pk)
@@ -8,7 +8,11 @@ from .views.models import (
     index, test, myproducts
 )
 from .views.views import (CartOverviewViewSet, ItemDetailsViewSet, ItemSearchViewSet, MostActiveUsersViewSet, OrderDetailsViewSet, OrderItemDetailsViewSet, TopSellingProductsViewSet, UserOrderHistoryViewSet, )
-from .views.health import HealthCheckView
+from .views.health import HealthCheckView, LivenessView, MetricsView, ReadinessView
+from .views.exports import OrderExportView
+from .views.async_catalog import (
+    async_category_list, async_item_autocomplete, async_item_list, async_item_search, async_product_list, async_service_list,
+)
 
 # Initialize router
 router = DefaultRouter()
@@ -42,6 +46,16 @@ custom_urlpatterns = [
     path('myproducts', myproducts, name='myproducts'),
 ]
 
+# Async (ASGI) read endpoints
+async_urlpatterns = [
+    path('item-search/', async_item_search, name='async-item-search'),
+    path('item-search/autocomplete/', async_item_autocomplete, name='async-item-autocomplete'),
+    path('items/', async_item_list, name='async-item-list'),
+    path('products/', async_product_list, name='async-product-list'),
+    path('services/', async_service_list, name='async-service-list'),
+    path('category/', async_category_list, name='async-category-list'),
+]
+
 # Authentication paths
 auth_urlpatterns = [
     path('api/token/', TokenObtainPairView.as_view(), name='token_obtain_pair'),
@@ -52,9 +66,14 @@ auth_urlpatterns = [
 urlpatterns = [
     # path('admin/', admin.site.urls),
     path('api/', include(router.urls)),  # All router-generated paths
+    path('api/async/', include(async_urlpatterns)),
     path('', include(custom_urlpatterns)),  # Custom views
     path('', include(auth_urlpatterns)),  # Authentication routes
     path('api/auth/me/', UserViewSet.as_view({'get': 'me'}), name='auth_me'),
     path('api/health/', HealthCheckView.as_view(), name='health_check'),
+    path('api/health/live/', LivenessView.as_view(), name='health_live'),
+    path('api/health/ready/', ReadinessView.as_view(), name='health_ready'),
+    path('api/metrics/', MetricsView.as_view(), name='metrics'),
+    path('api/exports/orders/', OrderExportView.as_view(), name='order_export'),
 
 ]
@@ -0,0 +1,56 @@
+# base/utils/background.py
+"""
+A small in-process worker pool for work that shouldn't hold up the request
+(image derivatives, ...). Tasks run in threads of the serving process, so
+they must be idempotent and cheap enough to lose on a restart; anything that
+needs delivery guarantees belongs in a real queue.
+
+submit_on_commit() only schedules the task once the surrounding transaction
+commits, so the worker sees the rows the request wrote. With
+BACKGROUND_TASKS_EAGER (tests, management commands) tasks run inline.
+"""
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import connections, transaction
+
+logger = logging.getLogger('freemarketbackend')
+
+_executor = None
+_lock = threading.Lock()
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        with _lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=getattr(settings, 'BACKGROUND_WORKERS', 2),
+                    thread_name_prefix='freemarket-background',
+                )
+    return _executor
+
+
+def _run(func, args, kwargs):
+    try:
+        return func(*args, **kwargs)
+    except Exception:
+        logger.exception("Background task %s failed", getattr(func, '__name__', func))
+    finally:
+        # worker threads get their own connections; don't leave them open between tasks
+        connections.close_all()
+
+
+def submit(func, *args, **kwargs):
+    """Run `func(*args, **kwargs)` in the worker pool (inline when BACKGROUND_TASKS_EAGER)."""
+    if getattr(settings, 'BACKGROUND_TASKS_EAGER', False):
+        return func(*args, **kwargs)
+    return _get_executor().submit(_run, func, args, kwargs)
+
+
+def submit_on_commit(func, *args, **kwargs):
+    """submit() once the current transaction commits (immediately outside one)."""
+    transaction.on_commit(lambda: submit(func, *args, **kwargs))
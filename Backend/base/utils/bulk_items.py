@@ -0,0 +1,58 @@
+# base/utils/bulk_items.py
+
+from django.db import connection
+
+from base.models.item import Item, ItemCategory
+
+
+def bulk_create_items(instances, batch_size=1000):
+    """
+    Bulk-insert Product/Service instances together with their parent Item rows.
+
+    Django's bulk_create() refuses multi-table inherited models, so the Item
+    rows are bulk-created first (PostgreSQL returns their ids) and the subtype
+    rows are written with one executemany() per model. Primary keys are set on
+    the passed instances.
+    """
+    instances = list(instances)
+    if not instances:
+        return instances
+
+    parent_fields = [f for f in Item._meta.concrete_fields if not f.primary_key]
+    parents = [
+        Item(**{f.attname: getattr(obj, f.attname) for f in parent_fields})
+        for obj in instances
+    ]
+    Item.objects.bulk_create(parents, batch_size=batch_size)
+
+    by_model = {}
+    for obj, parent in zip(instances, parents):
+        obj.id = parent.id
+        obj.item_ptr_id = parent.id
+        obj._state.adding = False
+        obj._state.db = parent._state.db
+        by_model.setdefault(type(obj), []).append(obj)
+
+    with connection.cursor() as cursor:
+        for model, objs in by_model.items():
+            fields = model._meta.local_concrete_fields
+            sql = "INSERT INTO {} ({}) VALUES ({})".format(
+                connection.ops.quote_name(model._meta.db_table),
+                ", ".join(connection.ops.quote_name(f.column) for f in fields),
+                ", ".join(["%s"] * len(fields)),
+            )
+            for start in range(0, len(objs), batch_size):
+                cursor.executemany(sql, [
+                    [f.get_db_prep_save(getattr(obj, f.attname), connection) for f in fields]
+                    for obj in objs[start:start + batch_size]
+                ])
+    return instances
+
+
+def bulk_link_categories(pairs, batch_size=1000):
+    """
+    Create ItemCategory rows for (item_id, category_id) pairs, skipping existing links.
+    """
+    links = [ItemCategory(item_id=item_id, category_id=category_id) for item_id, category_id in pairs]
+    ItemCategory.objects.bulk_create(links, batch_size=batch_size, ignore_conflicts=True)
+    return links
@@ -0,0 +1,114 @@
+# base/utils/db_snapshot.py
+"""
+Database snapshots as PostgreSQL template databases.
+
+A snapshot is a copy of a migrated (and usually seeded) database made with
+`CREATE DATABASE <snapshot> TEMPLATE <source>`, which copies the files
+directly instead of replaying migrations and inserts, and then marked
+IS_TEMPLATE. Cloning it back is the same statement the other way round, so
+a large benchmark dataset comes back in seconds:
+
+    manage.py db_snapshot save --build --users 200 --items 2000 --orders 2000
+    manage.py db_snapshot restore           # put the snapshot back in place
+    FREEMARKET_TEMPLATE_DB=<snapshot> FREEMARKET_BENCHMARK=1 pytest tests/benchmarks
+
+PostgreSQL refuses to copy a database while anyone else is connected to it,
+so copying terminates the other sessions on the source first: only use this
+against development, test and benchmark databases.
+"""
+import logging
+
+from django.db import DEFAULT_DB_ALIAS, connections
+
+logger = logging.getLogger('freemarketbackend')
+
+
+def default_template_name(using=DEFAULT_DB_ALIAS):
+    return f"{connections[using].settings_dict['NAME']}_template"
+
+
+def _close_connections_to(name):
+    for alias in connections:
+        if connections[alias].settings_dict.get('NAME') == name:
+            connections[alias].close()
+
+
+def _exists(cursor, name):
+    cursor.execute("SELECT 1 FROM pg_database WHERE datname = %s", [name])
+    return cursor.fetchone() is not None
+
+
+def _disconnect_others(cursor, name):
+    cursor.execute(
+        "SELECT pg_terminate_backend(pid) FROM pg_stat_activity WHERE datname = %s AND pid <> pg_backend_pid()",
+        [name],
+    )
+
+
+def database_exists(name, using=DEFAULT_DB_ALIAS):
+    with connections[using]._nodb_cursor() as cursor:
+        return _exists(cursor, name)
+
+
+def drop_database(name, using=DEFAULT_DB_ALIAS):
+    """Drop database `name` if it exists (templates included)."""
+    connection = connections[using]
+    _close_connections_to(name)
+    with connection._nodb_cursor() as cursor:
+        if not _exists(cursor, name):
+            return False
+        quoted = connection.ops.quote_name(name)
+        cursor.execute(f"ALTER DATABASE {quoted} IS_TEMPLATE false")
+        _disconnect_others(cursor, name)
+        cursor.execute(f"DROP DATABASE {quoted}")
+    logger.info("Dropped database %s", name)
+    return True
+
+
+def copy_database(source, target, using=DEFAULT_DB_ALIAS, as_template=False):
+    """Replace database `target` with a copy of `source`."""
+    connection = connections[using]
+    quote = connection.ops.quote_name
+    drop_database(target, using)
+    _close_connections_to(source)
+    with connection._nodb_cursor() as cursor:
+        _disconnect_others(cursor, source)
+        cursor.execute(f"CREATE DATABASE {quote(target)} TEMPLATE {quote(source)}")
+        if as_template:
+            cursor.execute(f"ALTER DATABASE {quote(target)} IS_TEMPLATE true")
+    logger.info("Copied database %s to %s", source, target)
+
+
+def save_snapshot(template, using=DEFAULT_DB_ALIAS):
+    """Save the `using` database as template `template`."""
+    copy_database(connections[using].settings_dict['NAME'], template, using, as_template=True)
+
+
+def restore_snapshot(template, using=DEFAULT_DB_ALIAS):
+    """Replace the `using` database with a clone of template `template`."""
+    if not database_exists(template, using):
+        raise ValueError(f"No snapshot named {template}; create it with `manage.py db_snapshot save`.")
+    copy_database(template, connections[using].settings_dict['NAME'], using)
+
+
+def use_snapshot_for_tests(template, using=DEFAULT_DB_ALIAS):
+    """
+    Create the test database as a clone of `template` and point `using` and
+    the aliases mirroring it there, in place of Django's migrate-from-scratch
+    setup. Returns the test database name.
+    """
+    from django.conf import settings
+
+    connection = connections[using]
+    if not database_exists(template, using):
+        raise ValueError(f"No snapshot named {template}; create it with `manage.py db_snapshot save`.")
+    name = connection.creation._get_test_db_name()
+    copy_database(template, name, using)
+
+    connection.close()
+    settings.DATABASES[using]['NAME'] = name
+    connection.settings_dict['NAME'] = name
+    for alias in connections:
+        if connections[alias].settings_dict.get('TEST', {}).get('MIRROR') == using:
+            connections[alias].creation.set_as_test_mirror(connection.settings_dict)
+    return name
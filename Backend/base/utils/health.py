@@ -0,0 +1,143 @@
+# base/utils/health.py
+"""
+Dependency probes behind the readiness endpoint.
+
+Each probe returns {'status': 'ok' | 'degraded' | 'fail', ...details}:
+
+    database   SELECT 1 on the primary (fail) and each replica (degraded)
+    db_pool    psycopg pool saturation; fail when it is exhausted and
+               requests are queueing for a connection
+    cache      set/get/delete round trip on the default cache (degraded)
+    log_queue  depth of the async log queues; degraded when nearly full
+               or records were dropped
+
+Probe errors are logged with their details but reported by exception class
+only: the endpoint is unauthenticated, and driver messages name internal
+hosts and ports.
+
+The pool is checked before the database: with an exhausted pool the
+SELECT 1 would itself wait for a connection, so the probe fails fast
+instead. Results are kept for HEALTH_CACHE_SECONDS in the process (not in
+the cache backend, which is one of the things being probed), and only one
+thread at a time refreshes them, so load balancer polling doesn't add load.
+"""
+import logging
+import threading
+import time
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from base.utils.log_handlers import queue_depth
+
+logger = logging.getLogger('freemarketbackend')
+
+OK, DEGRADED, FAIL = 'ok', 'degraded', 'fail'
+_SEVERITY = {OK: 0, DEGRADED: 1, FAIL: 2}
+
+_lock = threading.Lock()
+_cached = None  # (monotonic timestamp, report)
+
+
+def _timed(func):
+    start = time.perf_counter()
+    func()
+    return round((time.perf_counter() - start) * 1000, 3)
+
+
+def probe_database(alias=DEFAULT_DB_ALIAS, failure=FAIL):
+    def select_one():
+        with connections[alias].cursor() as cursor:
+            cursor.execute("SELECT 1")
+            cursor.fetchone()
+    try:
+        return {'status': OK, 'latency_ms': _timed(select_one)}
+    except Exception as e:
+        logger.warning("Health probe of database %s failed", alias, exc_info=True)
+        return {'status': failure, 'error': type(e).__name__}
+
+
+def probe_db_pool(alias=DEFAULT_DB_ALIAS):
+    pool = getattr(connections[alias], 'pool', None)
+    if pool is None:
+        return {'status': OK, 'pooled': False}
+    stats = pool.get_stats()
+    in_use = stats.get('pool_size', 0) - stats.get('pool_available', 0)
+    saturation = in_use / pool.max_size if pool.max_size else 0
+    waiting = stats.get('requests_waiting', 0)
+    if waiting and not stats.get('pool_available', 0):
+        status = FAIL
+    elif saturation >= getattr(settings, 'HEALTH_POOL_SATURATION', 0.9):
+        status = DEGRADED
+    else:
+        status = OK
+    return {
+        'status': status, 'pooled': True, 'in_use': in_use, 'max_size': pool.max_size,
+        'saturation': round(saturation, 2), 'requests_waiting': waiting,
+    }
+
+
+def probe_cache():
+    key = f'health:{uuid.uuid4().hex}'
+
+    def round_trip():
+        cache.set(key, 1, timeout=10)
+        if cache.get(key) != 1:
+            raise RuntimeError("value written to the cache could not be read back")
+        cache.delete(key)
+    try:
+        return {'status': OK, 'latency_ms': _timed(round_trip)}
+    except Exception as e:
+        logger.warning("Health probe of the cache failed", exc_info=True)
+        return {'status': DEGRADED, 'error': type(e).__name__}
+
+
+def probe_log_queue():
+    depth = queue_depth()
+    filled = depth['queued'] / depth['capacity'] if depth['capacity'] else 0
+    status = DEGRADED if depth['dropped'] or filled >= 0.8 else OK
+    return {'status': status, **depth}
+
+
+def run_probes():
+    checks = {'db_pool': probe_db_pool()}
+    if checks['db_pool']['status'] == FAIL:
+        checks['database'] = {'status': FAIL, 'error': "connection pool exhausted"}
+    else:
+        checks['database'] = probe_database()
+    for alias in getattr(settings, 'DATABASE_REPLICAS', []):
+        checks[f'database:{alias}'] = probe_database(alias, failure=DEGRADED)
+    checks['cache'] = probe_cache()
+    checks['log_queue'] = probe_log_queue()
+    status = max((check['status'] for check in checks.values()), key=_SEVERITY.get)
+    return {'status': status, 'checks': checks}
+
+
+def readiness(max_age=None):
+    """
+    The latest probe report, re-run when older than `max_age` seconds
+    (HEALTH_CACHE_SECONDS). While one thread refreshes it, others get the
+    previous report. Adds `age_s`, how old the report is.
+    """
+    global _cached
+    max_age = getattr(settings, 'HEALTH_CACHE_SECONDS', 5) if max_age is None else max_age
+    current = _cached
+    if current is None or time.monotonic() - current[0] >= max_age:
+        if _lock.acquire(blocking=current is None):
+            try:
+                current = _cached
+                if current is None or time.monotonic() - current[0] >= max_age:
+                    current = _cached = (time.monotonic(), run_probes())
+            finally:
+                _lock.release()
+        current = _cached
+    timestamp, report = current
+    return {**report, 'age_s': round(time.monotonic() - timestamp, 3)}
+
+
+def reset():
+    """Forget the cached report (tests)."""
+    global _cached
+    _cached = None
@@ -0,0 +1,140 @@
+# base/utils/idempotency.py
+"""
+Idempotency keys for create endpoints.
+
+A client sends `Idempotency-Key: <unique string>` with a POST. The first
+request claims the key (one INSERT against a unique constraint) and runs;
+its response is stored once it finishes. Repeats of the same request get
+the stored response back without running the view again, marked with an
+`Idempotent-Replayed: true` header. While the first request is still running,
+repeats get 409 with Retry-After. Reusing a key for a different payload is
+rejected with 422.
+
+Server errors (5xx or an exception) release the key, so the client can retry.
+A claim whose request never finished (the worker died) can be taken over
+after IDEMPOTENCY_LOCK_SECONDS. Keys expire after IDEMPOTENCY_KEY_TTL_HOURS.
+"""
+import hashlib
+import json
+import logging
+from datetime import timedelta
+from functools import wraps
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils.timezone import now
+from rest_framework import status
+from rest_framework.response import Response
+
+from base.models.idempotency import IdempotencyKey
+
+logger = logging.getLogger('freemarketbackend')
+
+HEADER = 'Idempotency-Key'
+
+
+def request_fingerprint(request):
+    """SHA-256 of the method, path and parsed payload."""
+    data = request.data
+    if hasattr(data, 'lists'):
+        data = dict(data.lists())
+    payload = json.dumps(data, sort_keys=True, default=str)
+    return hashlib.sha256(f"{request.method} {request.path}\n{payload}".encode()).hexdigest()
+
+
+def _claim(scope, user, key, fingerprint):
+    """(record, owned): our fresh claim on the key, or the existing record."""
+    timestamp = now()
+    ttl = timedelta(hours=getattr(settings, 'IDEMPOTENCY_KEY_TTL_HOURS', 24))
+    try:
+        with transaction.atomic():
+            record = IdempotencyKey.objects.create(
+                scope=scope, user=user, key=key, request_hash=fingerprint,
+                created_at=timestamp, expires_at=timestamp + ttl,
+            )
+        return record, True
+    except IntegrityError:
+        pass
+
+    record = IdempotencyKey.objects.filter(scope=scope, user=user, key=key).first()
+    if record is None:
+        # released or purged in between; claim it again
+        return _claim(scope, user, key, fingerprint)
+
+    stale_lock = timestamp - timedelta(seconds=getattr(settings, 'IDEMPOTENCY_LOCK_SECONDS', 60))
+    expired = record.expires_at <= timestamp
+    abandoned = record.status_code is None and record.created_at <= stale_lock
+    if expired or abandoned:
+        # conditional takeover: only one of several concurrent retries wins
+        taken = IdempotencyKey.objects.filter(pk=record.pk, created_at=record.created_at).update(
+            request_hash=fingerprint, status_code=None, response_body=None,
+            created_at=timestamp, expires_at=timestamp + ttl,
+        )
+        if taken:
+            record.refresh_from_db()
+            return record, True
+        record.refresh_from_db()
+    return record, False
+
+
+def _replay(record, fingerprint):
+    if record.request_hash != fingerprint:
+        return Response(
+            {"error": f"{HEADER} was already used for a different request."},
+            status=status.HTTP_422_UNPROCESSABLE_ENTITY,
+        )
+    if record.status_code is None:
+        return Response(
+            {"error": f"A request with this {HEADER} is still being processed."},
+            status=status.HTTP_409_CONFLICT, headers={'Retry-After': '1'},
+        )
+    return Response(record.response_body, status=record.status_code, headers={'Idempotent-Replayed': 'true'})
+
+
+def idempotent(scope):
+    """
+    Make a viewset action honour the Idempotency-Key header. Requests without
+    the header, or from anonymous users, run as before.
+    """
+    def decorator(func):
+        @wraps(func)
+        def wrapper(self, request, *args, **kwargs):
+            key = request.headers.get(HEADER)
+            if not key or not request.user.is_authenticated:
+                return func(self, request, *args, **kwargs)
+            if len(key) > 255:
+                return Response({"error": f"{HEADER} must be at most 255 characters."},
+                                status=status.HTTP_400_BAD_REQUEST)
+
+            fingerprint = request_fingerprint(request)
+            record, owned = _claim(scope, request.user, key, fingerprint)
+            if not owned:
+                logger.info("Idempotent %s replay for key %s by %s", scope, key, request.user)
+                return _replay(record, fingerprint)
+
+            try:
+                response = func(self, request, *args, **kwargs)
+            except Exception:
+                record.delete()
+                raise
+            if response.status_code >= 500:
+                record.delete()
+                return response
+            IdempotencyKey.objects.filter(pk=record.pk).update(
+                status_code=response.status_code, response_body=response.data,
+            )
+            return response
+        return wrapper
+    return decorator
+
+
+def purge_expired_keys(batch_size=1000):
+    """Delete expired keys in batches; returns how many were removed."""
+    removed = 0
+    while True:
+        batch = list(
+            IdempotencyKey.objects.filter(expires_at__lte=now()).values_list('pk', flat=True)[:batch_size]
+        )
+        if not batch:
+            return removed
+        removed += IdempotencyKey.objects.filter(pk__in=batch).delete()[0]
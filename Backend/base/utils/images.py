@@ -0,0 +1,118 @@
+# base/utils/images.py
+"""
+Resized derivatives of Item.image.
+
+Each size in ITEM_IMAGE_VARIANTS (longest edge in pixels) is written as WebP
+and JPEG under a path derived from the original's SHA-256, so identical
+uploads share their derivatives and a re-upload under the same file name
+never serves stale ones. The result is stored on the item:
+
+    item.image_variants = {
+        'source': 'items/photo.png',          # the Item.image name it was built from
+        'hash': '<sha256>',
+        'sizes': {'thumb': {'webp': ..., 'jpeg': ..., 'width': 320, 'height': 240}, ...},
+    }
+
+Variants are built off the request thread (see schedule_item_variants in
+base/signals.py); `manage.py generate_image_variants` backfills them.
+"""
+import hashlib
+import io
+import logging
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+logger = logging.getLogger('freemarketbackend')
+
+VARIANT_ROOT = 'items/variants'
+FORMATS = {'webp': 'WEBP', 'jpeg': 'JPEG'}
+CHUNK_SIZE = 64 * 1024
+
+
+def content_hash(fileobj):
+    """SHA-256 hex digest of a file object, read in chunks; rewinds it afterwards."""
+    digest = hashlib.sha256()
+    fileobj.seek(0)
+    for chunk in iter(lambda: fileobj.read(CHUNK_SIZE), b''):
+        digest.update(chunk)
+    fileobj.seek(0)
+    return digest.hexdigest()
+
+
+def variant_path(digest, size, fmt):
+    return f"{VARIANT_ROOT}/{digest[:2]}/{digest}/{size}.{fmt}"
+
+
+def fit_within(width, height, edge):
+    """(width, height) scaled down so the longest side is at most `edge`."""
+    scale = min(1.0, edge / max(width, height))
+    return max(1, round(width * scale)), max(1, round(height * scale))
+
+
+def _encode(image, fmt):
+    if fmt == 'jpeg' and image.mode != 'RGB':
+        # JPEG has no alpha: flatten onto white
+        background = Image.new('RGB', image.size, (255, 255, 255))
+        rgba = image.convert('RGBA')
+        background.paste(rgba, mask=rgba.getchannel('A'))
+        image = background
+    out = io.BytesIO()
+    image.save(out, FORMATS[fmt], quality=getattr(settings, 'ITEM_IMAGE_QUALITY', 80), optimize=True)
+    return out.getvalue()
+
+
+def build_variants(fileobj, digest, storage):
+    """
+    Write every missing derivative of the image in `fileobj` to `storage` and
+    return the `sizes` mapping. Derivatives that already exist are reused.
+    """
+    fileobj.seek(0)
+    with Image.open(fileobj) as source:
+        source = ImageOps.exif_transpose(source)
+        if source.mode not in ('RGB', 'RGBA'):
+            source = source.convert('RGBA' if 'A' in source.getbands() or 'transparency' in source.info else 'RGB')
+        sizes = {}
+        for size, edge in getattr(settings, 'ITEM_IMAGE_VARIANTS', {}).items():
+            width, height = fit_within(*source.size, edge)
+            entry = {'width': width, 'height': height}
+            resized = None
+            for fmt in FORMATS:
+                path = variant_path(digest, size, fmt)
+                if not storage.exists(path):
+                    if resized is None:
+                        resized = source.resize((width, height), Image.Resampling.LANCZOS)
+                    path = storage.save(path, ContentFile(_encode(resized, fmt)))
+                entry[fmt] = path
+            sizes[size] = entry
+    return sizes
+
+
+def generate_item_variants(item_id):
+    """
+    Build the derivatives of item `item_id`'s current image and store them on
+    the item. Returns the new image_variants, or None when there is nothing to do.
+    """
+    from base.models.item import Item
+
+    item = Item.all_objects.filter(pk=item_id).only('image', 'image_variants').first()
+    if item is None or not item.image:
+        return None
+    name = item.image.name
+    if (item.image_variants or {}).get('source') == name:
+        return item.image_variants
+
+    try:
+        with item.image.storage.open(name, 'rb') as fileobj:
+            digest = content_hash(fileobj)
+            sizes = build_variants(fileobj, digest, item.image.storage)
+    except (OSError, UnidentifiedImageError, Image.DecompressionBombError) as e:
+        logger.warning("Could not build image variants for item %s (%s): %s", item_id, name, e)
+        return None
+
+    variants = {'source': name, 'hash': digest, 'sizes': sizes}
+    # only if the image wasn't replaced while we were working
+    Item.all_objects.filter(pk=item_id, image=name).update(image_variants=variants)
+    logger.info("Built %d image variant(s) for item %s", len(sizes), item_id)
+    return variants
@@ -0,0 +1,285 @@
+# base/utils/index_advisor.py
+"""
+Index advice for `manage.py generate_index_doc --advise` (PostgreSQL only).
+
+Two kinds of evidence go into the report:
+
+* Statistics from pg_stat_user_indexes / pg_stat_user_tables: indexes that
+  were never scanned, tables read mostly by sequential scans, and rough bloat
+  estimates (dead-tuple ratio for tables; actual vs. expected size for
+  b-tree indexes, from pg_class and pg_stats).
+* EXPLAIN of the queries the routed viewsets generate for each of their
+  filterset_fields, search_fields and ordering_fields. The plans are taken
+  with enable_seqscan off, so a sequential scan in the plan means there is
+  no index that could serve the query at all, whatever the table size, and
+  the findings don't change with the amount of data.
+
+Statistics are counters since the last stats reset, so compare reports from
+the same environment. They change with every query, so the stable report
+(advise(stable=True), `--stable`) leaves them out: it has the index
+definitions and the query plans only, and two runs against the same schema
+produce the same file, which CI can diff.
+"""
+import json
+import math
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist, FieldError
+from django.db import DatabaseError, connection, transaction
+from django.utils.timezone import now
+
+# Tables below this many live rows are never called sequential-scan heavy
+MIN_ROWS = 1000
+# Bloat is only estimated for indexes of at least this many pages
+MIN_INDEX_PAGES = 10
+BLOAT_RATIO = 0.3
+DEAD_TUPLE_RATIO = 0.2
+
+SEARCH_LOOKUPS = {'^': 'istartswith', '=': 'iexact', '@': 'search', '$': 'iregex'}
+PLACEHOLDERS = {
+    'CharField': 'x', 'TextField': 'x', 'SlugField': 'x', 'EmailField': 'x@example.com',
+    'BooleanField': True, 'DateTimeField': now, 'DateField': lambda: now().date(),
+}
+
+
+def _fetch(sql, params=()):
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        columns = [col[0] for col in cursor.description]
+        return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+
+def list_indexes():
+    """Every index of the current schema with its size and usage counters."""
+    return _fetch("""
+        SELECT t.relname AS table, c.relname AS index, pg_get_indexdef(i.indexrelid) AS definition,
+               am.amname AS type, pg_relation_size(i.indexrelid) AS size_bytes,
+               COALESCE(s.idx_scan, 0) AS scans, i.indisunique AS unique, i.indisprimary AS primary
+        FROM pg_index i
+        JOIN pg_class c ON c.oid = i.indexrelid
+        JOIN pg_class t ON t.oid = i.indrelid
+        JOIN pg_namespace n ON n.oid = t.relnamespace
+        JOIN pg_am am ON am.oid = c.relam
+        LEFT JOIN pg_stat_user_indexes s ON s.indexrelid = i.indexrelid
+        WHERE n.nspname = current_schema()
+        ORDER BY t.relname, c.relname
+    """)
+
+
+def unused_indexes(indexes):
+    """Never-scanned indexes that don't enforce uniqueness (those are needed regardless)."""
+    return [
+        {'table': row['table'], 'index': row['index'], 'size_bytes': row['size_bytes']}
+        for row in indexes
+        if row['scans'] == 0 and not row['unique'] and not row['primary']
+    ]
+
+
+def table_stats():
+    return _fetch("""
+        SELECT relname AS table, seq_scan, seq_tup_read, COALESCE(idx_scan, 0) AS idx_scan,
+               n_live_tup AS live_rows, n_dead_tup AS dead_rows
+        FROM pg_stat_user_tables
+        WHERE schemaname = current_schema()
+        ORDER BY relname
+    """)
+
+
+def seq_scan_tables(stats, min_rows=MIN_ROWS):
+    """Tables of at least `min_rows` rows read more often by sequential than by index scans."""
+    return [
+        {key: row[key] for key in ('table', 'seq_scan', 'idx_scan', 'seq_tup_read', 'live_rows')}
+        for row in stats
+        if row['live_rows'] >= min_rows and row['seq_scan'] > row['idx_scan']
+    ]
+
+
+def table_bloat(stats):
+    found = []
+    for row in stats:
+        total = row['live_rows'] + row['dead_rows']
+        ratio = row['dead_rows'] / total if total else 0
+        if total >= MIN_ROWS and ratio >= DEAD_TUPLE_RATIO:
+            found.append({
+                'table': row['table'], 'live_rows': row['live_rows'],
+                'dead_rows': row['dead_rows'], 'dead_ratio': round(ratio, 2),
+            })
+    return found
+
+
+def index_bloat():
+    """
+    B-tree indexes whose size is well above what their row count needs.
+    Expected size: reltuples * (tuple header + column widths), at the default
+    90% fill factor. An estimate, like every bloat query without pgstattuple.
+    """
+    indexes = _fetch("""
+        SELECT c.relname AS index, t.relname AS table, c.reltuples AS tuples, c.relpages AS pages,
+               current_setting('block_size')::int AS block_size,
+               array_agg(a.attname::text) AS columns
+        FROM pg_index i
+        JOIN pg_class c ON c.oid = i.indexrelid
+        JOIN pg_class t ON t.oid = i.indrelid
+        JOIN pg_namespace n ON n.oid = t.relnamespace
+        JOIN pg_am am ON am.oid = c.relam
+        JOIN pg_attribute a ON a.attrelid = t.oid AND a.attnum = ANY(i.indkey)
+        WHERE n.nspname = current_schema() AND am.amname = 'btree' AND c.relpages >= %s
+        GROUP BY c.relname, t.relname, c.reltuples, c.relpages
+        ORDER BY t.relname, c.relname
+    """, [MIN_INDEX_PAGES])
+    widths = {
+        (row['tablename'], row['attname']): row['avg_width']
+        for row in _fetch("SELECT tablename, attname, avg_width FROM pg_stats WHERE schemaname = current_schema()")
+    }
+
+    found = []
+    for row in indexes:
+        # 8-byte index tuple header + 4-byte line pointer, data MAXALIGNed to 8
+        tuple_bytes = 12 + math.ceil(sum(widths.get((row['table'], col), 8) for col in row['columns']) / 8) * 8
+        expected_pages = math.ceil(max(row['tuples'], 0) * tuple_bytes / (row['block_size'] * 0.9)) + 1
+        ratio = 1 - expected_pages / row['pages']
+        if ratio >= BLOAT_RATIO:
+            found.append({
+                'table': row['table'], 'index': row['index'],
+                'size_bytes': row['pages'] * row['block_size'], 'estimated_bloat_ratio': round(ratio, 2),
+            })
+    return found
+
+
+def _resolve_field(model, path):
+    field = None
+    for part in path.split('__'):
+        field = model._meta.get_field(part)
+        if field.is_relation:
+            model = field.related_model
+    return field
+
+
+def _sample_value(queryset, path):
+    """A value `path` really has in the table, or a placeholder of the right type."""
+    value = (
+        queryset.order_by().exclude(**{f'{path}__isnull': True})
+        .values_list(path, flat=True).first()
+    )
+    if value is not None:
+        return value
+    field = _resolve_field(queryset.model, path)
+    if field.is_relation:
+        return 1
+    placeholder = PLACEHOLDERS.get(field.get_internal_type(), 1)
+    return placeholder() if callable(placeholder) else placeholder
+
+
+def _filter(queryset, path, lookup):
+    if lookup == 'isnull':
+        return queryset.filter(**{f'{path}__isnull': False})
+    value = _sample_value(queryset, path)
+    return queryset.filter(**{f'{path}__{lookup}': [value] if lookup == 'in' else value})
+
+
+def viewset_queries(registry):
+    """(viewset name, kind, field, build) for every filter, search and ordering field; build() makes the queryset."""
+    page_size = settings.REST_FRAMEWORK.get('PAGE_SIZE') or 10
+    for _, viewset, _ in registry:
+        base = getattr(viewset, 'queryset', None)
+        if base is None:
+            continue
+        base = base.all()
+        # filters and searches are judged without the model's default ordering
+        unordered = base.order_by()
+        name = viewset.__name__
+
+        filters = getattr(viewset, 'filterset_fields', None) or ()
+        if isinstance(filters, dict):
+            # django-filter's {field: [lookups]} form
+            filters = [(path, lookup) for path, lookups in filters.items() for lookup in lookups]
+        else:
+            filters = [(path, 'exact') for path in filters]
+        for path, lookup in filters:
+            label = path if lookup == 'exact' else f'{path}__{lookup}'
+            yield name, 'filter', label, lambda base=unordered, path=path, lookup=lookup: _filter(base, path, lookup)
+
+        for term in getattr(viewset, 'search_fields', None) or ():
+            lookup = SEARCH_LOOKUPS.get(term[0], 'icontains')
+            field = term.lstrip('^=@$')
+            yield name, 'search', term, lambda base=unordered, q=f'{field}__{lookup}': base.filter(**{q: 'a'})
+
+        ordering = getattr(viewset, 'ordering_fields', None) or ()
+        if ordering == '__all__':
+            ordering = ()
+        for field in ordering:
+            yield name, 'ordering', field, lambda base=base, field=field: base.order_by(field)[:page_size]
+
+
+def _walk(plan):
+    yield plan
+    for child in plan.get('Plans', ()):
+        yield from _walk(child)
+
+
+def explain_scans(queryset):
+    """
+    Plan `queryset` with sequential scans disabled and return the nodes that
+    still read a whole table: seq scans, index scans without an index
+    condition that only filter, and sorts of their output.
+    """
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute("SET LOCAL enable_seqscan = off")
+        try:
+            plan = queryset.explain(format='json')
+        finally:
+            # SET LOCAL outlives a savepoint when we run inside an outer transaction
+            cursor.execute("SET LOCAL enable_seqscan = on")
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    findings = []
+    for node in _walk(plan[0]['Plan']):
+        kind = node['Node Type']
+        if kind == 'Seq Scan':
+            findings.append({'node': kind, 'table': node.get('Relation Name')})
+        elif kind in ('Index Scan', 'Index Only Scan') and 'Filter' in node and 'Index Cond' not in node:
+            findings.append({'node': f'Full {kind}', 'table': node.get('Relation Name'), 'index': node.get('Index Name')})
+        elif kind in ('Sort', 'Incremental Sort'):
+            findings.append({'node': kind, 'keys': node.get('Sort Key', [])})
+    return findings
+
+
+def query_findings(registry):
+    """EXPLAIN every viewset filter/search/ordering query; see explain_scans()."""
+    results = []
+    for viewset, kind, field, build in viewset_queries(registry):
+        entry = {'viewset': viewset, 'kind': kind, 'field': field}
+        try:
+            scans = explain_scans(build())
+        except (FieldError, FieldDoesNotExist, DatabaseError, ValueError, TypeError) as e:
+            entry.update(status='error', error=str(e).splitlines()[0])
+        else:
+            entry.update(status='unindexed' if scans else 'ok', scans=scans)
+        results.append(entry)
+    return results
+
+
+def advise(registry, min_rows=MIN_ROWS, stable=False):
+    """
+    The full report: index list, statistics-based findings and per-query
+    plans. With `stable`, only what doesn't depend on usage counters: index
+    definitions and per-query plans.
+    """
+    indexes = list_indexes()
+    queries = query_findings(registry)
+    if stable:
+        return {
+            'indexes': [{key: row[key] for key in ('table', 'index', 'type', 'definition')} for row in indexes],
+            'queries': queries,
+        }
+    stats = table_stats()
+    return {
+        'indexes': [
+            {key: row[key] for key in ('table', 'index', 'type', 'definition', 'size_bytes', 'scans')}
+            for row in indexes
+        ],
+        'unused_indexes': unused_indexes(indexes),
+        'seq_scan_tables': seq_scan_tables(stats, min_rows),
+        'bloat': {'tables': table_bloat(stats), 'indexes': index_bloat()},
+        'queries': queries,
+    }
@@ -0,0 +1,185 @@
+# base/utils/inventory.py
+"""
+Stock reservations for products in carts.
+
+Adding a product to a cart holds the units (a StockReservation row plus
+Product.reserved_quantity); checkout turns the holds into decrements of
+Product.quantity; holds that outlive STOCK_HOLD_TTL_MINUTES are handed back
+by `manage.py release_expired_holds`; cancelling an order puts its units
+back into Product.quantity.
+
+Every stock change is a single conditional UPDATE such as
+
+    UPDATE base_product SET reserved_quantity = reserved_quantity + 2
+    WHERE item_ptr_id = 7 AND quantity >= reserved_quantity + 2
+
+so stock can never be oversold: a buyer who loses the race updates zero
+rows and gets InsufficientStock, without reading the product first. The
+UPDATE still locks the product row until the surrounding transaction
+commits, which for cart changes includes the CartActivityLog insert of
+log_cart_action; the Cart methods therefore change stock as their last
+step, after the CartItem write and the new total. Changes that touch
+several products (checkout, releases) are batched into one UPDATE with
+per-product CASE amounts.
+
+A cart's StockReservation rows are locked (SELECT ... FOR UPDATE) before
+the held amount is read, so two changes to the same cart line, or a
+checkout and release_expired_holds, never both apply the same hold.
+
+Services are not stocked; holding one is a no-op.
+"""
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import BigIntegerField, Case, F, Q, Value, When
+from django.db.models.functions import Greatest
+from django.utils.timezone import now
+
+from base.models.inventory import StockReservation
+from base.models.item import Product
+from base.models.order import OrderItem
+
+logger = logging.getLogger('freemarketbackend')
+
+
+class InsufficientStock(ValidationError):
+    pass
+
+
+def hold_expiry():
+    return now() + timedelta(minutes=getattr(settings, 'STOCK_HOLD_TTL_MINUTES', 15))
+
+
+def _per_product(amounts):
+    """CASE expression picking each product's amount from {product_id: amount}."""
+    return Case(
+        *[When(pk=pk, then=Value(amount)) for pk, amount in amounts.items()],
+        default=Value(0), output_field=BigIntegerField(),
+    )
+
+
+def _take(product_id, quantity):
+    """Reserve `quantity` units if that many are available. False when the item is not a product."""
+    taken = Product.all_objects.filter(
+        pk=product_id, quantity__gte=F('reserved_quantity') + quantity,
+    ).update(reserved_quantity=F('reserved_quantity') + quantity)
+    if taken:
+        return True
+    product = Product.all_objects.filter(pk=product_id).values('name', 'quantity', 'reserved_quantity').first()
+    if product is None:
+        return False
+    available = max(0, product['quantity'] - product['reserved_quantity'])
+    raise InsufficientStock(f"Only {available} of {product['name']} available.")
+
+
+def _give_back(amounts):
+    """Return held units to stock, {product_id: quantity}, in one UPDATE."""
+    amounts = {pk: quantity for pk, quantity in amounts.items() if quantity > 0}
+    if amounts:
+        Product.all_objects.filter(pk__in=list(amounts)).update(
+            reserved_quantity=Greatest(F('reserved_quantity') - _per_product(amounts), Value(0)),
+        )
+
+
+def hold(cart, item, quantity):
+    """
+    Make `cart`'s hold on `item` exactly `quantity` units (0 releases it) and
+    renew its expiry. Raises InsufficientStock when the extra units are not available.
+    """
+    with transaction.atomic():
+        reservation = StockReservation.objects.select_for_update().filter(cart=cart, product_id=item.pk).first()
+        held = reservation.quantity if reservation else 0
+        if quantity > held:
+            if not _take(item.pk, quantity - held):
+                return
+        elif quantity < held:
+            _give_back({item.pk: held - quantity})
+
+        if quantity <= 0:
+            if reservation:
+                reservation.delete()
+        elif reservation:
+            StockReservation.objects.filter(pk=reservation.pk).update(quantity=quantity, expires_at=hold_expiry())
+        else:
+            StockReservation.objects.create(cart=cart, product_id=item.pk, quantity=quantity, expires_at=hold_expiry())
+
+
+def release(cart, items=None):
+    """Drop `cart`'s holds (only on `items` when given) and return the units to stock."""
+    reservations = StockReservation.objects.filter(cart=cart)
+    if items is not None:
+        reservations = reservations.filter(product_id__in=[item.pk for item in items])
+    with transaction.atomic():
+        rows = list(reservations.select_for_update().values_list('pk', 'product_id', 'quantity'))
+        _release_rows(rows)
+
+
+def _release_rows(rows):
+    amounts = {}
+    for _, product_id, quantity in rows:
+        amounts[product_id] = amounts.get(product_id, 0) + quantity
+    StockReservation.objects.filter(pk__in=[pk for pk, _, _ in rows]).delete()
+    _give_back(amounts)
+
+
+def convert_holds(cart, lines):
+    """
+    Checkout: take `lines` ({item_id: quantity}) out of stock, using `cart`'s
+    holds first and unreserved stock for the rest (e.g. after a hold
+    expired), in one UPDATE. Raises InsufficientStock, leaving stock
+    untouched, when any product is short. Call inside the checkout transaction.
+    """
+    product_ids = set(Product.all_objects.filter(pk__in=list(lines)).values_list('pk', flat=True))
+    if not product_ids:
+        return
+    reservations = StockReservation.objects.filter(cart=cart, product_id__in=product_ids)
+    # locked so an expiry release can't return a hold that is being converted
+    held = dict(reservations.select_for_update().order_by('pk').values_list('product_id', 'quantity'))
+    ordered = {pk: lines[pk] for pk in product_ids}
+    released = {pk: min(held.get(pk, 0), ordered[pk]) for pk in product_ids}
+
+    # each product must still cover what was ordered on top of everyone else's holds
+    enough = Q()
+    for pk in product_ids:
+        enough |= Q(pk=pk, quantity__gte=F('reserved_quantity') - released[pk] + ordered[pk])
+    taken = Product.all_objects.filter(enough).update(
+        quantity=F('quantity') - _per_product(ordered),
+        reserved_quantity=F('reserved_quantity') - _per_product(released),
+    )
+    if taken != len(product_ids):
+        raise InsufficientStock("Some items in the cart are no longer in stock.")
+    # holds larger than the order (the cart changed underneath) give the rest back
+    _give_back({pk: held[pk] - released[pk] for pk in held})
+    reservations.delete()
+
+
+def restock_orders(order_ids):
+    """
+    Put the products of cancelled orders `order_ids` back in stock, summed per
+    product, in one UPDATE. Call in the transaction that cancels the orders.
+    """
+    amounts = {}
+    for item_id, quantity in OrderItem.objects.filter(order_id__in=list(order_ids)).values_list('item_id', 'quantity'):
+        amounts[item_id] = amounts.get(item_id, 0) + quantity
+    if amounts:
+        Product.all_objects.filter(pk__in=list(amounts)).update(quantity=F('quantity') + _per_product(amounts))
+
+
+def release_expired_holds(batch_size=500):
+    """Release holds past their expiry in batches; returns how many were released."""
+    released = 0
+    while True:
+        with transaction.atomic():
+            rows = list(
+                StockReservation.objects.filter(expires_at__lte=now())
+                .select_for_update(skip_locked=True)
+                .order_by('pk').values_list('pk', 'product_id', 'quantity')[:batch_size]
+            )
+            if not rows:
+                return released
+            _release_rows(rows)
+        released += len(rows)
+        logger.info("Released %d expired stock hold(s)", len(rows))
@@ -0,0 +1,161 @@
+# base/utils/item_import.py
+
+import csv
+import io
+import json
+import logging
+
+from django.db import transaction
+from rest_framework.exceptions import ValidationError
+
+from base.models.category import Category
+from base.models.item import Product, Service
+from base.serializers.item_import import ItemImportRowSerializer
+from base.utils.bulk_items import bulk_create_items, bulk_link_categories
+
+logger = logging.getLogger('freemarketbackend')
+
+IMPORT_FORMATS = {
+    '.csv': 'csv',
+    '.ndjson': 'ndjson',
+    '.jsonl': 'ndjson',
+}
+
+
+def detect_import_format(filename, fmt=None):
+    """
+    Return 'csv' or 'ndjson' from an explicit format or the file extension.
+    """
+    if fmt:
+        if fmt not in IMPORT_FORMATS.values():
+            raise ValueError(f"Unsupported import format '{fmt}'.")
+        return fmt
+    for ext, detected in IMPORT_FORMATS.items():
+        if filename.lower().endswith(ext):
+            return detected
+    raise ValueError(f"Cannot detect import format of '{filename}'; use csv or ndjson.")
+
+
+def iter_import_rows(stream, fmt):
+    """
+    Yield (row_number, data, parse_error) for every row of a binary CSV/NDJSON stream.
+    Rows are read lazily, so uploads are never loaded into memory as a whole.
+    """
+    text = io.TextIOWrapper(stream, encoding='utf-8-sig', newline='')
+    try:
+        if fmt == 'csv':
+            for row_number, row in enumerate(csv.DictReader(text), start=1):
+                # Empty cells mean "use the default", like a missing NDJSON key
+                yield row_number, {k: v for k, v in row.items() if k and v not in ('', None)}, None
+        else:
+            for row_number, line in enumerate(text, start=1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    data = json.loads(line)
+                except json.JSONDecodeError as e:
+                    yield row_number, None, f"Invalid JSON: {e.msg}"
+                    continue
+                if not isinstance(data, dict):
+                    yield row_number, None, "Each line must be a JSON object."
+                    continue
+                yield row_number, data, None
+    finally:
+        text.detach()
+
+
+class ItemImporter:
+    """
+    Validates and inserts Product/Service rows for one seller in batches.
+
+    Each batch resolves its category names with a single query and is written
+    with bulk inserts inside its own transaction. Invalid rows are skipped and
+    reported; valid rows of the same batch are still imported.
+    """
+
+    def __init__(self, seller, batch_size=500, max_errors=1000):
+        self.seller = seller
+        self.batch_size = batch_size
+        self.max_errors = max_errors
+        self.row_serializer = ItemImportRowSerializer()
+        self.report = {'created': 0, 'failed': 0, 'errors': [], 'errors_truncated': False}
+
+    def run(self, rows):
+        batch = []
+        for row_number, data, parse_error in rows:
+            if parse_error:
+                self._add_error(row_number, {'non_field_errors': [parse_error]})
+                continue
+            batch.append((row_number, data))
+            if len(batch) >= self.batch_size:
+                self._import_batch(batch)
+                batch = []
+        if batch:
+            self._import_batch(batch)
+
+        logger.info(
+            "Bulk import by %s: %s created, %s failed",
+            self.seller, self.report['created'], self.report['failed'],
+        )
+        return self.report
+
+    def _add_error(self, row_number, errors):
+        self.report['failed'] += 1
+        if len(self.report['errors']) < self.max_errors:
+            self.report['errors'].append({'row': row_number, 'errors': errors})
+        else:
+            self.report['errors_truncated'] = True
+
+    def _import_batch(self, batch):
+        validated = []
+        for row_number, data in batch:
+            try:
+                validated.append((row_number, self.row_serializer.run_validation(data)))
+            except ValidationError as e:
+                self._add_error(row_number, e.detail)
+
+        names = {name for _, row in validated for name in row['categories']}
+        category_ids = {}
+        if names:
+            for name, category_id in (
+                Category.objects.filter(name__in=names).order_by('-id').values_list('name', 'id')
+            ):
+                category_ids[name] = category_id  # lowest id wins for duplicate names
+
+        instances, links = [], []
+        for row_number, row in validated:
+            missing = [name for name in row['categories'] if name not in category_ids]
+            if missing:
+                self._add_error(row_number, {'categories': [f"Unknown category '{name}'." for name in missing]})
+                continue
+            instance = self._build_instance(row)
+            instances.append(instance)
+            links.append((instance, [category_ids[name] for name in row['categories']]))
+
+        if not instances:
+            return
+        with transaction.atomic():
+            bulk_create_items(instances, batch_size=self.batch_size)
+            bulk_link_categories(
+                [(instance.id, category_id) for instance, ids in links for category_id in ids],
+                batch_size=self.batch_size,
+            )
+        self.report['created'] += len(instances)
+
+    def _build_instance(self, row):
+        common = {
+            'name': row['name'],
+            'description': row.get('description'),
+            'price_cents': row['price_cents'],
+            'currency': row['currency'],
+            'seller': self.seller,
+        }
+        if row['item_type'] == 'product':
+            return Product(quantity=row.get('quantity', 1), **common)
+        service = Service(**common)
+        if 'service_duration' in row:
+            service.service_duration = row['service_duration']
+        if 'service_type' in row:
+            service.service_type = row['service_type']
+        return service
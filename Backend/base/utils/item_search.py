@@ -0,0 +1,32 @@
+# base/utils/item_search.py
+
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db.models import F, Q
+
+from base.models.category import Category
+from base.utils.category_utils import get_descendant_ids
+
+
+def search_querysets(queryset, search_term, vector='search_vector'):
+    """
+    Return (full-text matches ranked best first, ILIKE fallback on name/description).
+    Callers use the full-text queryset when it has rows, the fallback otherwise;
+    checking that is left to them so it can be done with exists() or aexists().
+    """
+    query = SearchQuery(search_term, search_type="plain")
+    ranked = queryset.annotate(rank=SearchRank(F(vector), query))
+    fts = ranked.filter(**{vector: query}).order_by("-rank")
+    fallback = ranked.filter(Q(name__icontains=search_term) | Q(description__icontains=search_term))
+    return fts, fallback
+
+
+def category_item_filter(category_id):
+    """
+    Q() matching items in the category or any of its subcategories,
+    or None when the category does not exist.
+    """
+    try:
+        category = Category.objects.prefetch_related('subcategories').get(id=category_id)
+    except (Category.DoesNotExist, ValueError):
+        return None
+    return Q(categories__id__in=get_descendant_ids(category))
@@ -0,0 +1,84 @@
+# base/utils/live_indexes.py
+
+from django.apps import apps
+from django.core.exceptions import FieldDoesNotExist
+
+from base.models.base_modle import BaseModel, LiveIndex
+
+
+def _live_models():
+    """Managed, concrete BaseModel subclasses of the base app."""
+    return [
+        model for model in apps.get_app_config('base').get_models()
+        if issubclass(model, BaseModel) and model._meta.managed and not model._meta.proxy
+    ]
+
+
+def _viewset_lookups(registry):
+    """(model, lookup, source) for every filterset/ordering field of the routed viewsets."""
+    for _, viewset, _ in registry:
+        queryset = getattr(viewset, 'queryset', None)
+        if queryset is None:
+            continue
+        for attr, source in (('filterset_fields', 'filter'), ('ordering_fields', 'ordering')):
+            for lookup in getattr(viewset, attr, None) or ():
+                yield queryset.model, lookup.lstrip('-').split('__')[0], source
+
+
+def _leading_live_fields(model):
+    return {
+        index.fields[0].lstrip('-')
+        for index in model._meta.indexes
+        if LiveIndex.is_live(index) and index.fields
+    }
+
+
+def hot_filters(registry):
+    """
+    Collect the fields live-row queries filter or order on: the routed viewsets'
+    filterset/ordering fields plus every foreign key of a BaseModel table.
+    Returns {(model, field_name): set(sources)}, keyed by the model owning the column.
+    """
+    found = {}
+    candidates = list(_viewset_lookups(registry))
+    for model in _live_models():
+        candidates.extend(
+            (model, field.name, 'fk')
+            for field in model._meta.local_concrete_fields
+            if field.is_relation and not field.primary_key
+        )
+
+    for model, name, source in candidates:
+        if not issubclass(model, BaseModel):
+            continue
+        try:
+            field = model._meta.get_field(name)
+        except FieldDoesNotExist:
+            continue
+        if not field.concrete or field.primary_key:
+            continue
+        found.setdefault((field.model, field.name), set()).add(source)
+    return found
+
+
+def missing_live_indexes(registry):
+    """
+    Hot filters without a live-row index leading on the field. Fields of a
+    multi-table child (e.g. Product.quantity) are reported as `inherited`:
+    `deleted_at` lives on the parent table, so they cannot get a partial index.
+    """
+    report = []
+    for (model, name), sources in sorted(hot_filters(registry).items(), key=lambda kv: (kv[0][0].__name__, kv[0][1])):
+        if 'deleted_at' not in {f.name for f in model._meta.local_concrete_fields}:
+            status = 'inherited'
+        elif name in _leading_live_fields(model):
+            continue
+        else:
+            status = 'missing'
+        report.append({
+            'model': model.__name__,
+            'field': name,
+            'sources': sorted(sources),
+            'status': status,
+        })
+    return report
@@ -0,0 +1,98 @@
+# base/utils/log_handlers.py
+"""
+Non-blocking logging for settings.LOGGING.
+
+Loggers write to a QueueListenerHandler, which only puts the record on an
+in-memory queue; a background QueueListener thread does the formatting and the
+file/console I/O. When the queue is full, records are dropped (and counted)
+instead of stalling the request thread.
+
+Kept free of model imports: it is loaded while settings.LOGGING is configured.
+"""
+import atexit
+import json
+import logging
+import queue
+import weakref
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+
+# LogRecord attributes that are not user-supplied `extra` fields
+_RESERVED_ATTRS = frozenset(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime'}
+
+_queue_handlers = weakref.WeakSet()
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: time, level, logger, module, message, any `extra` fields and the traceback."""
+
+    def format(self, record):
+        payload = {
+            'time': datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(),
+            'level': record.levelname,
+            'logger': record.name,
+            'module': record.module,
+            'message': record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RESERVED_ATTRS and not key.startswith('_'):
+                payload[key] = value
+        if record.exc_info:
+            payload['exc_info'] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            payload['exc_info'] = record.exc_text
+        if record.stack_info:
+            payload['stack_info'] = self.formatStack(record.stack_info)
+        return json.dumps(payload, default=str)
+
+
+class QueueListenerHandler(QueueHandler):
+    """
+    A QueueHandler that owns the QueueListener feeding `handlers`.
+
+    Configured through the '()' factory key so dictConfig passes `handlers`
+    through untouched; use 'cfg://handlers.<name>' entries, which resolve to the
+    already-configured handlers (dictConfig builds handlers in name order, so
+    this one must sort after its targets).
+    """
+
+    def __init__(self, handlers, queue_size=10000, respect_handler_level=True):
+        super().__init__(queue.Queue(maxsize=queue_size))
+        targets = [handlers[i] for i in range(len(handlers))]
+        self.dropped = 0
+        self.listener = QueueListener(self.queue, *targets, respect_handler_level=respect_handler_level)
+        self.listener.start()
+        _queue_handlers.add(self)
+        atexit.register(self.stop)
+
+    def prepare(self, record):
+        # Merge the args here, while they still hold their current values; the
+        # formatting, JSON encoding and I/O happen on the listener thread.
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def stop(self):
+        """Flush what is queued and stop the listener thread."""
+        if self.listener._thread is not None:
+            self.listener.stop()
+
+    def close(self):
+        self.stop()
+        super().close()
+
+
+def queue_depth():
+    """Records waiting in the log queues, their total capacity, and records dropped because a queue was full."""
+    handlers = list(_queue_handlers)
+    return {
+        'queued': sum(h.queue.qsize() for h in handlers),
+        'capacity': sum(h.queue.maxsize for h in handlers),
+        'dropped': sum(h.dropped for h in handlers),
+    }
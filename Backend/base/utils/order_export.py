@@ -0,0 +1,130 @@
+# base/utils/order_export.py
+
+import csv
+import zlib
+from datetime import datetime, time, timezone as dt_timezone
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils.dateparse import parse_date, parse_datetime
+from django.utils.timezone import is_naive, make_aware
+
+from base.models.order import Order, OrderItem
+from base.models.payment import Payment
+
+# dataset -> (model, [(column header, ORM lookup)], lookup used for the date range)
+EXPORT_DATASETS = {
+    'orders': (Order, [
+        ('id', 'id'),
+        ('user_id', 'user_id'),
+        ('username', 'user__username'),
+        ('status', 'status'),
+        ('total_price_cents', 'total_price_cents'),
+        ('created_at', 'created_at'),
+        ('updated_at', 'updated_at'),
+    ], 'created_at'),
+    'order_items': (OrderItem, [
+        ('id', 'id'),
+        ('order_id', 'order_id'),
+        ('item_id', 'item_id'),
+        ('item_name', 'item__name'),
+        ('quantity', 'quantity'),
+        ('price_cents', 'price_cents'),
+        ('order_created_at', 'order__created_at'),
+    ], 'order__created_at'),
+    'payments': (Payment, [
+        ('id', 'id'),
+        ('order_id', 'order_id'),
+        ('amount_cents', 'amount_cents'),
+        ('payment_method', 'payment_method'),
+        ('transaction_id', 'transaction_id'),
+        ('created_at', 'created_at'),
+        ('order_created_at', 'order__created_at'),
+    ], 'order__created_at'),
+}
+EXPORT_FORMATS = ('csv', 'ndjson')
+
+# Rows are grouped into chunks of roughly this size before being yielded/compressed
+STREAM_CHUNK_BYTES = 64 * 1024
+
+
+def parse_export_bound(value):
+    """
+    Parse an ISO date or datetime into an aware datetime (dates mean midnight UTC).
+    """
+    if not value:
+        return None
+    parsed = parse_datetime(value)
+    if parsed is None:
+        day = parse_date(value)
+        if day is None:
+            raise ValueError(f"Invalid date '{value}'; use YYYY-MM-DD or an ISO datetime.")
+        parsed = datetime.combine(day, time.min, tzinfo=dt_timezone.utc)
+    return make_aware(parsed) if is_naive(parsed) else parsed
+
+
+def export_rows(dataset, start=None, end=None, chunk_size=2000):
+    """
+    Return (headers, row iterator) for a dataset within [start, end).
+    Rows come from a server-side cursor, so memory stays bounded by chunk_size.
+    """
+    if dataset not in EXPORT_DATASETS:
+        raise ValueError(f"Unknown dataset '{dataset}'.")
+    model, columns, date_lookup = EXPORT_DATASETS[dataset]
+
+    queryset = model.objects.all()
+    if start:
+        queryset = queryset.filter(**{f'{date_lookup}__gte': start})
+    if end:
+        queryset = queryset.filter(**{f'{date_lookup}__lt': end})
+    rows = queryset.order_by('id').values_list(*[lookup for _, lookup in columns]).iterator(chunk_size=chunk_size)
+    return [header for header, _ in columns], rows
+
+
+class _Echo:
+    """csv.writer target that hands back each formatted line instead of storing it."""
+    def write(self, value):
+        return value
+
+
+def _iter_lines(headers, rows, fmt):
+    if fmt == 'csv':
+        writer = csv.writer(_Echo())
+        yield writer.writerow(headers)
+        for row in rows:
+            yield writer.writerow(row)
+    else:
+        encoder = DjangoJSONEncoder(separators=(',', ':'))
+        for row in rows:
+            yield encoder.encode(dict(zip(headers, row))) + '\n'
+
+
+def iter_export(dataset, fmt='csv', start=None, end=None, compress=False, chunk_size=2000):
+    """
+    Yield the export as bytes chunks (gzip-compressed when `compress` is set).
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown format '{fmt}'.")
+    headers, rows = export_rows(dataset, start=start, end=end, chunk_size=chunk_size)
+    compressor = zlib.compressobj(wbits=16 + zlib.MAX_WBITS) if compress else None
+
+    buffer, size = [], 0
+    for line in _iter_lines(headers, rows, fmt):
+        buffer.append(line)
+        size += len(line)
+        if size >= STREAM_CHUNK_BYTES:
+            data = ''.join(buffer).encode()
+            buffer, size = [], 0
+            if compressor:
+                data = compressor.compress(data)
+            if data:
+                yield data
+
+    data = ''.join(buffer).encode()
+    if compressor:
+        data = compressor.compress(data) + compressor.flush()
+    if data:
+        yield data
+
+
+def export_filename(dataset, fmt, compress=False):
+    return f"{dataset}.{fmt}{'.gz' if compress else ''}"
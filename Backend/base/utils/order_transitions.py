@@ -0,0 +1,122 @@
+# base/utils/order_transitions.py
+"""
+Bulk order status changes for fulfillment.
+
+transition_orders() moves many orders to one status with a single guarded
+statement per batch:
+
+    WITH movable AS (
+        SELECT id, status FROM base_order
+        WHERE id = ANY(<ids>) AND deleted_at IS NULL AND status = ANY(<sources>)
+        FOR UPDATE
+    )
+    UPDATE base_order SET status = <target>, updated_at = now()
+    FROM movable WHERE base_order.id = movable.id
+    RETURNING base_order.id, movable.status
+
+where <sources> are the statuses ORDER_TRANSITIONS allows to reach the
+target, so an order that changed concurrently is simply not matched. Orders
+that were not moved are looked up afterwards to report why. One
+UserActivityLog row per moved order is written with a single bulk insert,
+and cancelled orders give their units back to Product.quantity in one
+UPDATE, in the same transaction as the status change.
+
+Only TARGETS can be reached this way: orders become PAID when payment
+settlement authorizes their payment, never by fiat.
+"""
+import logging
+
+from django.apps import apps
+from django.db import connection, transaction
+from django.utils.timezone import now
+
+from base.models.order import Order, OrderStatus, sources_for
+from base.utils.inventory import restock_orders
+
+logger = logging.getLogger('freemarketbackend')
+
+UPDATED = 'updated'
+INVALID = 'invalid_transition'
+NOT_FOUND = 'not_found'
+
+TARGETS = (OrderStatus.SHIPPED, OrderStatus.DELIVERED, OrderStatus.CANCELLED)
+
+
+def _transition_batch(order_ids, target, sources):
+    """{order_id: previous_status} for the orders of `order_ids` that were moved."""
+    table = connection.ops.quote_name(Order._meta.db_table)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            WITH movable AS (
+                SELECT id, status FROM {table}
+                WHERE id = ANY(%s) AND deleted_at IS NULL AND status = ANY(%s)
+                FOR UPDATE
+            )
+            UPDATE {table} SET status = %s, updated_at = %s
+            FROM movable WHERE {table}.id = movable.id
+            RETURNING {table}.id, movable.status
+            """,
+            [list(order_ids), [source.value for source in sources], target.value, now()],
+        )
+        return dict(cursor.fetchall())
+
+
+def _log_transitions(moved, target, actor, ip_address):
+    if actor is None or not moved:
+        return
+    UserActivityLog = apps.get_model('base', 'UserActivityLog')
+    timestamp = now()
+    UserActivityLog.objects.bulk_create([
+        UserActivityLog(
+            user=actor,
+            action='order_status_change',
+            description=f"Action 'order_status_change' performed by {actor.username}",
+            metadata={'order_id': order_id, 'from': previous, 'to': target},
+            status='success',
+            ip_address=ip_address or 'Unknown',
+            created_at=timestamp,
+        )
+        for order_id, previous in moved.items()
+    ])
+
+
+def transition_orders(order_ids, target, actor=None, ip_address=None, batch_size=1000):
+    """
+    Move the orders in `order_ids` to `target` where ORDER_TRANSITIONS allows it.
+
+    Returns one result per distinct id, in the order given:
+    {'id', 'result': 'updated' | 'invalid_transition' | 'not_found', 'from'}
+    where `from` is the status the order had (None when it does not exist).
+    Raises ValueError when `target` is not one of TARGETS.
+    """
+    target = OrderStatus(target)
+    if target not in TARGETS:
+        raise ValueError(f"Orders cannot be moved to {target}.")
+    sources = sources_for(target)
+
+    order_ids = list(dict.fromkeys(int(order_id) for order_id in order_ids))
+    moved = {}
+    for start in range(0, len(order_ids), batch_size):
+        batch = order_ids[start:start + batch_size]
+        with transaction.atomic():
+            batch_moved = _transition_batch(batch, target, sources)
+            if target == OrderStatus.CANCELLED and batch_moved:
+                # checkout took these units out of stock (convert_holds)
+                restock_orders(batch_moved)
+            _log_transitions(batch_moved, target, actor, ip_address)
+        moved.update(batch_moved)
+
+    unmoved = [order_id for order_id in order_ids if order_id not in moved]
+    current = dict(Order.objects.filter(pk__in=unmoved).values_list('pk', 'status')) if unmoved else {}
+
+    results = []
+    for order_id in order_ids:
+        if order_id in moved:
+            results.append({'id': order_id, 'result': UPDATED, 'from': moved[order_id]})
+        elif order_id in current:
+            results.append({'id': order_id, 'result': INVALID, 'from': current[order_id]})
+        else:
+            results.append({'id': order_id, 'result': NOT_FOUND, 'from': None})
+    logger.info("Moved %d of %d order(s) to %s", len(moved), len(order_ids), target)
+    return results
@@ -0,0 +1,248 @@
+# base/utils/partitioning.py
+"""
+Monthly range partitioning for the activity-log tables (PostgreSQL only).
+
+Converting a table is a one-off (`manage.py manage_log_partitions --convert`):
+the existing table is renamed to `<table>_p_initial`, and a partitioned table
+with the same columns, defaults, identity, foreign keys and indexes takes its
+name. The old table is then attached as the partition covering everything up
+to the end of next month. From then on the command is run periodically
+(e.g. daily cron) to create upcoming monthly partitions and detach/drop the
+ones older than ACTIVITY_LOG_RETENTION_MONTHS.
+
+Django keeps treating `id` as the primary key; in the database it becomes
+(id, <partition column>) because PostgreSQL requires the partition key in it.
+"""
+import re
+from datetime import date, datetime, timezone as dt_timezone
+
+from django.apps import apps
+from django.db import connection
+
+# model label -> partition column and extra indexes created on the parent
+# (they cascade to every partition)
+PARTITIONED_LOGS = {
+    'base.UserActivityLog': {
+        'column': 'created_at',
+        'indexes': [('created_at',), ('user_id', 'created_at')],
+    },
+    'base.CartActivityLog': {
+        'column': 'timestamp',
+        'indexes': [('timestamp',), ('action', 'timestamp')],
+    },
+}
+
+INITIAL_PARTITION_SUFFIX = '_p_initial'
+
+_BOUND_RE = re.compile(r"FROM \((.+?)\) TO \((.+?)\)")
+
+
+def month_start(value):
+    """First day of the month containing `value` (a date or datetime)."""
+    return date(value.year, value.month, 1)
+
+
+def add_months(month, count):
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(table, month):
+    return f"{table}_p{month:%Y_%m}"
+
+
+def bound_literal(month):
+    """A month boundary as a timestamptz literal, midnight UTC."""
+    return datetime(month.year, month.month, 1, tzinfo=dt_timezone.utc).isoformat()
+
+
+def parse_bound(expr):
+    """
+    Parse one side of a `pg_get_expr(relpartbound)` range into a date,
+    or None for MINVALUE/MAXVALUE.
+    """
+    expr = expr.strip()
+    if expr.upper() in ('MINVALUE', 'MAXVALUE'):
+        return None
+    return month_start(datetime.fromisoformat(expr.strip("'").replace(' ', 'T')))
+
+
+def parse_partition_bounds(expr):
+    """`FOR VALUES FROM (...) TO (...)` -> (lower, upper); None means unbounded."""
+    match = _BOUND_RE.search(expr)
+    if match is None:
+        raise ValueError(f"Not a range partition bound: {expr}")
+    return parse_bound(match.group(1)), parse_bound(match.group(2))
+
+
+def missing_months(partitions, first, last):
+    """Months in [first, last] not covered by any (lower, upper) partition range."""
+    months = []
+    month = first
+    while month <= last:
+        end = add_months(month, 1)
+        covered = any(
+            (lower is None or lower <= month) and (upper is None or upper >= end)
+            for lower, upper in partitions.values()
+        )
+        if not covered:
+            months.append(month)
+        month = end
+    return months
+
+
+def expired_partitions(partitions, cutoff):
+    """Partitions whose whole range ends on or before the cutoff month."""
+    return sorted(name for name, (_, upper) in partitions.items() if upper is not None and upper <= cutoff)
+
+
+class LogPartitioner:
+    """Plans (and optionally runs) the partition DDL for one activity-log model."""
+
+    def __init__(self, label, cursor=None):
+        spec = PARTITIONED_LOGS[label]
+        self.model = apps.get_model(label)
+        self.table = self.model._meta.db_table
+        self.column = spec['column']
+        self.indexes = spec['indexes']
+        self.cursor = cursor
+
+    def q(self, name):
+        return connection.ops.quote_name(name)
+
+    def _fetch(self, sql, params=()):
+        self.cursor.execute(sql, params)
+        return self.cursor.fetchall()
+
+    def is_partitioned(self):
+        rows = self._fetch("SELECT relkind FROM pg_class WHERE oid = to_regclass(%s)", [self.table])
+        return bool(rows) and rows[0][0] == 'p'
+
+    def partitions(self):
+        """{partition name: (lower month, upper month)} for the attached partitions."""
+        rows = self._fetch(
+            """
+            SELECT c.relname, pg_get_expr(c.relpartbound, c.oid)
+            FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid
+            WHERE i.inhparent = to_regclass(%s)
+            """,
+            [self.table],
+        )
+        return {name: parse_partition_bounds(expr) for name, expr in rows}
+
+    def index_statements(self):
+        """
+        The extra indexes, built without blocking writes: an index ON ONLY the
+        parent, then one per partition built CONCURRENTLY and attached to it.
+        Partitions created later inherit the parent index automatically.
+        """
+        statements = []
+        partitions = sorted(self.partitions())
+        for cols in self.indexes:
+            columns = ', '.join(self.q(c) for c in cols)
+            parent_index = self._index_name(self.table, cols)
+            statements.append(
+                f"CREATE INDEX IF NOT EXISTS {self.q(parent_index)} ON ONLY {self.q(self.table)} ({columns})"
+            )
+            for partition in partitions:
+                child_index = self._index_name(partition, cols)
+                statements += [
+                    f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {self.q(child_index)} ON {self.q(partition)} ({columns})",
+                    f"ALTER INDEX {self.q(parent_index)} ATTACH PARTITION {self.q(child_index)}",
+                ]
+        return statements
+
+    @staticmethod
+    def _index_name(table, cols):
+        return f"{table}_{'_'.join(cols)}_idx"[:63]
+
+    def conversion_statements(self, today):
+        """
+        DDL that turns the plain table into a partitioned one, as
+        (online, swap): `online` runs first in autocommit without blocking
+        writers, `swap` runs in one transaction under a short exclusive lock.
+        """
+        table, col, q = self.table, self.column, self.q
+        legacy = f"{table}{INITIAL_PARTITION_SUFFIX}"
+        # The initial partition runs through next month, so a conversion that
+        # straddles a month end never rejects inserts on the temporary CHECK
+        split = bound_literal(add_months(month_start(today), 2))
+        key_index = f"{table}_id_{col}_key"[:63]
+        check = f"{table}_{col}_bound_check"[:63]
+
+        (primary_key,), = self._fetch(
+            "SELECT conname FROM pg_constraint WHERE conrelid = to_regclass(%s) AND contype = 'p'",
+            [table],
+        )
+        existing_fks = self._fetch(
+            """
+            SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint
+            WHERE conrelid = to_regclass(%s) AND contype = 'f'
+            """,
+            [table],
+        )
+        existing_indexes = self._fetch(
+            """
+            SELECT c.relname, pg_get_indexdef(i.indexrelid) FROM pg_index i
+            JOIN pg_class c ON c.oid = i.indexrelid
+            WHERE i.indrelid = to_regclass(%s) AND NOT i.indisunique
+            """,
+            [table],
+        )
+
+        # Build the (id, col) key and prove the range bound without blocking
+        # writes, so ATTACH PARTITION below needs neither a scan nor an index build.
+        online = [
+            f"CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS {q(key_index)} ON {q(table)} ({q('id')}, {q(col)})",
+            f"ALTER TABLE {q(table)} ADD CONSTRAINT {q(check)} "
+            f"CHECK ({q(col)} IS NOT NULL AND {q(col)} < '{split}') NOT VALID",
+            f"ALTER TABLE {q(table)} VALIDATE CONSTRAINT {q(check)}",
+        ]
+
+        swap = [
+            f"LOCK TABLE {q(table)} IN ACCESS EXCLUSIVE MODE",
+            f"ALTER TABLE {q(table)} RENAME TO {q(legacy)}",
+            f"ALTER TABLE {q(legacy)} RENAME CONSTRAINT {q(primary_key)} "
+            f"TO {q((primary_key + INITIAL_PARTITION_SUFFIX)[:63])}",
+            f"CREATE TABLE {q(table)} (LIKE {q(legacy)} INCLUDING DEFAULTS INCLUDING IDENTITY "
+            f"INCLUDING CONSTRAINTS INCLUDING STORAGE INCLUDING COMMENTS) PARTITION BY RANGE ({q(col)})",
+            f"ALTER TABLE {q(table)} DROP CONSTRAINT {q(check)}",
+            # ids now come from the parent's identity sequence
+            f"ALTER TABLE {q(legacy)} ALTER COLUMN {q('id')} DROP IDENTITY IF EXISTS",
+            f"ALTER TABLE {q(table)} ADD CONSTRAINT {q(primary_key)} PRIMARY KEY ({q('id')}, {q(col)})",
+            f"ALTER TABLE {q(legacy)} ADD CONSTRAINT {q(key_index)} UNIQUE USING INDEX {q(key_index)}",
+        ]
+        for name, definition in existing_fks:
+            swap.append(f"ALTER TABLE {q(table)} ADD CONSTRAINT {q(name)} {definition}")
+        for name, definition in existing_indexes:
+            # Index names are schema-wide: move the old one aside and recreate the
+            # original on the (still empty) parent; ATTACH adopts the old index.
+            # `definition` was read before the rename, so it names the new parent.
+            swap.append(f"ALTER INDEX {q(name)} RENAME TO {q((name + INITIAL_PARTITION_SUFFIX)[:63])}")
+            swap.append(definition)
+        swap += [
+            f"ALTER TABLE {q(table)} ATTACH PARTITION {q(legacy)} FOR VALUES FROM (MINVALUE) TO ('{split}')",
+            f"ALTER TABLE {q(legacy)} DROP CONSTRAINT {q(check)}",
+            # keep ids increasing: start the parent's sequence after the existing rows
+            f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), "
+            f"GREATEST((SELECT COALESCE(MAX({q('id')}), 0) FROM {q(table)}), 1))",
+        ]
+        return online, swap
+
+    def ensure_statements(self, today, ahead):
+        first = month_start(today)
+        return [
+            f"CREATE TABLE IF NOT EXISTS {self.q(partition_name(self.table, month))} "
+            f"PARTITION OF {self.q(self.table)} "
+            f"FOR VALUES FROM ('{bound_literal(month)}') TO ('{bound_literal(add_months(month, 1))}')"
+            for month in missing_months(self.partitions(), first, add_months(first, ahead))
+        ]
+
+    def expire_statements(self, today, retention_months, drop=True):
+        cutoff = add_months(month_start(today), -retention_months)
+        statements = []
+        for name in expired_partitions(self.partitions(), cutoff):
+            statements.append(f"ALTER TABLE {self.q(self.table)} DETACH PARTITION {self.q(name)}")
+            if drop:
+                statements.append(f"DROP TABLE {self.q(name)}")
+        return statements
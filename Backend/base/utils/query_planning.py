@@ -0,0 +1,98 @@
+# base/utils/query_planning.py
+"""
+select_related/prefetch_related derived from a serializer's declared fields.
+
+`related_lookups(SerializerClass)` walks the fields the serializer renders:
+nested serializers and dotted sources over forward foreign keys become
+select_related paths, nested `many=True` serializers and many-to-many fields
+become prefetch paths (and everything below a prefetch is prefetched too).
+Plain PrimaryKeyRelatedFields need nothing: DRF renders them from the
+foreign key column. SerializerMethodFields are opaque and are not planned.
+
+`assert_constant_queries` backs the ASSERT_CONSTANT_LIST_QUERIES debug mode.
+"""
+from functools import partial
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db import connections
+from rest_framework import serializers
+from rest_framework.relations import PrimaryKeyRelatedField
+
+_lookups = {}
+
+
+class QueryCountGrowth(AssertionError):
+    """A list action's query count grows with the number of rows it renders."""
+
+
+def _walk(serializer, model, prefix, prefetching, select, prefetch):
+    for field in serializer.fields.values():
+        if field.write_only or field.source == '*':
+            continue
+        attrs = field.source_attrs
+        current, path, many = model, [], prefetching
+        for i, attr in enumerate(attrs):
+            try:
+                model_field = current._meta.get_field(attr)
+            except FieldDoesNotExist:
+                break
+            if not model_field.is_relation:
+                break
+            last = i == len(attrs) - 1
+            if last and isinstance(field, PrimaryKeyRelatedField) and not model_field.many_to_many \
+                    and not model_field.auto_created:
+                break  # rendered from the FK column
+            path.append(model_field.name)
+            lookup = '__'.join(prefix + path)
+            to_many = model_field.many_to_many or model_field.one_to_many
+            many = many or to_many
+            (prefetch if many else select).add(lookup)
+            current = model_field.related_model
+
+        nested = field.child if isinstance(field, serializers.ListSerializer) else field
+        if isinstance(nested, serializers.ModelSerializer) and path:
+            _walk(nested, nested.Meta.model, prefix + path, many, select, prefetch)
+
+
+def related_lookups(serializer_class):
+    """(select_related, prefetch_related) lookups for rendering `serializer_class`; cached per class."""
+    if serializer_class not in _lookups:
+        select, prefetch = set(), set()
+        if issubclass(serializer_class, serializers.ModelSerializer):
+            _walk(serializer_class(), serializer_class.Meta.model, [], False, select, prefetch)
+        _lookups[serializer_class] = (sorted(select), sorted(prefetch))
+    return _lookups[serializer_class]
+
+
+def plan_queryset(queryset, serializer_class):
+    """`queryset` with the joins and prefetches `serializer_class` needs."""
+    select, prefetch = related_lookups(serializer_class)
+    if select:
+        queryset = queryset.select_related(*select)
+    if prefetch:
+        queryset = queryset.prefetch_related(*prefetch)
+    return queryset
+
+
+def _count_query(counter, execute, sql, params, many, context):
+    counter[0] += 1
+    return execute(sql, params, many, context)
+
+
+def assert_constant_queries(queryset, render, size):
+    """
+    Render the first row and then the first `size` rows of `queryset` and
+    raise QueryCountGrowth when the second run needs more queries.
+    """
+    counts = []
+    for limit in (1, size):
+        counter = [0]
+        with connections[queryset.db].execute_wrapper(partial(_count_query, counter)):
+            rows = list(queryset[:limit])
+            render(rows)
+        counts.append((len(rows), counter[0]))
+    (_, one), (rows, many) = counts
+    if rows > 1 and many > one:
+        raise QueryCountGrowth(
+            f"{queryset.model.__name__} list: {one} queries for 1 row but {many} for {rows} rows"
+        )
@@ -0,0 +1,146 @@
+# base/utils/retention.py
+
+import logging
+import time
+from collections import Counter, namedtuple
+from datetime import timedelta
+
+from django.apps import apps
+from django.conf import settings
+from django.core import serializers
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connections, router, transaction
+from django.db.models import Exists, OuterRef
+from django.db.models.deletion import Collector
+from django.utils.timezone import now
+
+from base.models.archive import ArchivedRecord
+from base.models.base_modle import BaseModel
+
+logger = logging.getLogger('freemarketbackend')
+
+RETENTION_MODES = ('archive', 'purge')
+
+RetentionPolicy = namedtuple('RetentionPolicy', ['model', 'days', 'mode', 'protect'])
+
+
+def retention_policies(labels=None):
+    """
+    Resolve settings.SOFT_DELETE_RETENTION into RetentionPolicy tuples,
+    optionally limited to the given model labels (e.g. 'base.Item').
+    """
+    configured = getattr(settings, 'SOFT_DELETE_RETENTION', {})
+    if labels:
+        unknown = set(labels) - set(configured)
+        if unknown:
+            raise ImproperlyConfigured(f"No retention policy for: {', '.join(sorted(unknown))}")
+
+    policies = []
+    for label, policy in configured.items():
+        if labels and label not in labels:
+            continue
+        model = apps.get_model(label)
+        if not issubclass(model, BaseModel):
+            raise ImproperlyConfigured(f"{label} is not a soft-deletable BaseModel")
+        mode = policy.get('mode', 'archive')
+        if mode not in RETENTION_MODES:
+            raise ImproperlyConfigured(f"{label}: mode must be one of {', '.join(RETENTION_MODES)}")
+        protect = [apps.get_model(name) for name in policy.get('protect', ())]
+        policies.append(RetentionPolicy(model, int(policy['days']), mode, protect))
+    return policies
+
+
+def expired_queryset(policy, cutoff=None):
+    """
+    Rows of `policy.model` soft-deleted before the cutoff that no live row of a
+    protecting model still references.
+    """
+    cutoff = cutoff or now() - timedelta(days=policy.days)
+    queryset = policy.model.all_objects.filter(deleted_at__isnull=False, deleted_at__lt=cutoff)
+
+    targets = {policy.model, *policy.model._meta.get_parent_list()}
+    for related in policy.protect:
+        for field in related._meta.concrete_fields:
+            if field.is_relation and field.related_model in targets:
+                live_refs = related.all_objects.filter(**{field.name: OuterRef('pk')})
+                if issubclass(related, BaseModel):
+                    live_refs = live_refs.filter(deleted_at__isnull=True)
+                queryset = queryset.exclude(Exists(live_refs))
+    return queryset.order_by('pk')
+
+
+def _archive_records(collector):
+    """One ArchivedRecord per row the collector is about to delete."""
+    groups = [(model, list(instances)) for model, instances in collector.data.items()]
+    groups += [(qs.model, list(qs)) for qs in collector.fast_deletes]
+
+    records = []
+    for model, instances in groups:
+        if not instances:
+            continue
+        payloads = serializers.serialize('python', instances)
+        for instance, payload in zip(instances, payloads):
+            records.append(ArchivedRecord(
+                model=model._meta.label,
+                object_id=instance.pk,
+                payload=payload['fields'],
+                deleted_at=getattr(instance, 'deleted_at', None),
+            ))
+    return records
+
+
+def process_batch(policy, batch_size=500):
+    """
+    Archive/purge one batch of expired rows in its own short transaction.
+
+    Rows another transaction is holding are skipped (SKIP LOCKED) and picked up
+    by a later run, so the job never waits on live traffic.
+    Returns (rows selected, Counter of deleted rows per model label).
+    """
+    using = router.db_for_write(policy.model)
+    with transaction.atomic(using=using):
+        batch = list(
+            expired_queryset(policy).using(using)
+            .select_for_update(skip_locked=True, of=('self',))[:batch_size]
+        )
+        if not batch:
+            return 0, Counter()
+
+        collector = Collector(using=using)
+        collector.collect(batch)
+        if policy.mode == 'archive':
+            ArchivedRecord.objects.using(using).bulk_create(_archive_records(collector), batch_size=batch_size)
+        _, per_model = collector.delete()
+    return len(batch), Counter(per_model)
+
+
+def apply_policy(policy, batch_size=500, sleep=0.0, max_batches=None):
+    """
+    Run batches until the policy has nothing left to do (or max_batches is hit).
+    `sleep` pauses between batches to leave headroom for live traffic.
+    """
+    totals = Counter()
+    batches = 0
+    while max_batches is None or batches < max_batches:
+        selected, deleted = process_batch(policy, batch_size=batch_size)
+        if not selected:
+            break
+        batches += 1
+        totals.update(deleted)
+        logger.info(
+            "Retention %s %s: %s rows in batch %s",
+            policy.mode, policy.model._meta.label, selected, batches,
+        )
+        if selected < batch_size:
+            break
+        if sleep:
+            time.sleep(sleep)
+    return totals
+
+
+def vacuum_tables(models, using='default'):
+    """VACUUM ANALYZE the given tables so freed space and planner stats catch up."""
+    connection = connections[using]
+    with connection.cursor() as cursor:
+        for model in models:
+            cursor.execute(f"VACUUM (ANALYZE) {connection.ops.quote_name(model._meta.db_table)}")
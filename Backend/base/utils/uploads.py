@@ -0,0 +1,101 @@
+# base/utils/uploads.py
+"""
+Bounded, streaming handling of item image uploads.
+
+HashingUploadHandler (FILE_UPLOAD_HANDLERS) writes every uploaded file to a
+temporary file chunk by chunk while hashing it, so request bodies are never
+held in memory. Image uploads (image/* content types) stop being written
+once they pass MAX_IMAGE_UPLOAD_BYTES; the rest of the body is discarded and
+the file is flagged so validation can reject it.
+
+check_image_upload() rejects oversized files and images whose header
+declares more than MAX_IMAGE_PIXELS before Pillow decodes anything, and
+stored_image_name() maps an upload to a content-addressed name under
+Item.image's upload_to, so identical images are stored once.
+"""
+import hashlib
+
+from django.conf import settings
+from django.core.files.uploadhandler import TemporaryFileUploadHandler
+from PIL import Image, UnidentifiedImageError
+from rest_framework.exceptions import ValidationError
+
+from base.utils.images import content_hash
+
+# Pillow format -> file extension for the formats we accept
+IMAGE_FORMATS = {'JPEG': 'jpg', 'PNG': 'png', 'WEBP': 'webp', 'GIF': 'gif'}
+
+
+def max_image_bytes():
+    return getattr(settings, 'MAX_IMAGE_UPLOAD_BYTES', 10 * 1024 * 1024)
+
+
+class HashingUploadHandler(TemporaryFileUploadHandler):
+    """TemporaryFileUploadHandler that also computes the SHA-256 and caps image sizes."""
+
+    def new_file(self, *args, **kwargs):
+        super().new_file(*args, **kwargs)
+        self.sha256 = hashlib.sha256()
+        self.limit = max_image_bytes() if (self.content_type or '').startswith('image/') else None
+        self.received = 0
+        self.too_large = False
+
+    def receive_data_chunk(self, raw_data, start):
+        self.received += len(raw_data)
+        if self.too_large:
+            return None
+        if self.limit is not None and self.received > self.limit:
+            # keep draining the request, but stop storing the file
+            self.too_large = True
+            return None
+        self.sha256.update(raw_data)
+        return super().receive_data_chunk(raw_data, start)
+
+    def file_complete(self, file_size):
+        upload = super().file_complete(file_size)
+        upload.size = self.received
+        upload.too_large = self.too_large
+        upload.content_hash = None if self.too_large else self.sha256.hexdigest()
+        return upload
+
+
+def check_image_upload(upload):
+    """
+    Validate an image upload from its size and header only. Returns the
+    Pillow format name; raises ValidationError.
+    """
+    limit = max_image_bytes()
+    if getattr(upload, 'too_large', False) or (upload.size or 0) > limit:
+        raise ValidationError(f"Image exceeds the {limit // (1024 * 1024)} MB upload limit.")
+    try:
+        upload.seek(0)
+        # open() only parses the header; nothing is decoded yet
+        with Image.open(upload) as image:
+            width, height = image.size
+            fmt = image.format
+    except Image.DecompressionBombError:
+        raise ValidationError("Image has too many pixels.")
+    except (UnidentifiedImageError, OSError):
+        raise ValidationError("Upload a valid image.")
+    finally:
+        upload.seek(0)
+    if fmt not in IMAGE_FORMATS:
+        raise ValidationError(f"Unsupported image format {fmt}; use JPEG, PNG, WebP or GIF.")
+    max_pixels = getattr(settings, 'MAX_IMAGE_PIXELS', 40_000_000)
+    if width * height > max_pixels:
+        raise ValidationError(f"Image is {width}x{height}; at most {max_pixels} pixels are allowed.")
+    return fmt
+
+
+def stored_image_name(upload, fmt):
+    """
+    (name, exists): the content-addressed Item.image name for `upload`, and
+    whether that file is already in storage. Also renames the upload to it.
+    """
+    from base.models.item import Item
+
+    digest = getattr(upload, 'content_hash', None) or content_hash(upload)
+    upload.name = f"{digest}.{IMAGE_FORMATS[fmt]}"
+    field = Item._meta.get_field('image')
+    name = field.generate_filename(None, upload.name)
+    return name, field.storage.exists(name)
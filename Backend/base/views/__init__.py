@@ -1,3 +1,5 @@
 from .models import *
 from .views import *
-from .health import *
\ No newline at end of file
+from .health import *
+from .exports import *
+from .async_catalog import *
\ No newline at end of file
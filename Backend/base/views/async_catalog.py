@@ -0,0 +1,199 @@
+# base/views/async_catalog.py
+"""
+Async (ASGI-native) read endpoints for item search and the catalog lists.
+
+They mirror the GET lists of ItemSearchViewSet, ItemViewSet, ProductViewSet,
+ServiceViewSet and CategoryViewSet (same serializers, filters and ordering)
+but await the ORM instead of holding a worker thread for the whole request.
+All of them use ItemSearchViewSet's page format, including the catalog lists,
+which are unpaginated in the sync API. Served under /api/async/...; run
+behind myproj.asgi (SERVER_MODE=asgi in gunicorn.conf.py) to get the benefit.
+"""
+from asgiref.sync import sync_to_async
+from django.core.exceptions import ValidationError
+from django.http import JsonResponse
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+
+from base.db_router import reset_read_database, select_read_database, set_read_database
+from base.models import Category, Item, Product, Service
+from base.serializers.item_search import ItemSearchSerializer
+from base.serializers.models import CategorySerializer, ItemSerializer, ProductSerializer, ServiceSerializer
+from base.utils.item_search import category_item_filter, search_querysets
+from base.views.baseviews import StandardResultsSetPagination
+
+__all__ = [
+    'async_item_search', 'async_item_autocomplete',
+    'async_item_list', 'async_product_list', 'async_service_list', 'async_category_list',
+]
+
+_jwt = JWTAuthentication()
+
+
+async def _authenticate(request):
+    """The JWT user, or None. Token decoding is CPU-only; the user lookup is awaited."""
+    header = _jwt.get_header(request)
+    raw_token = _jwt.get_raw_token(header) if header else None
+    if raw_token is None:
+        return None
+    validated = _jwt.get_validated_token(raw_token)
+    return await sync_to_async(_jwt.get_user)(validated)
+
+
+def _error(detail, status):
+    return JsonResponse({'detail': detail}, status=status)
+
+
+def _apply_filters(request, queryset, filter_fields, ordering_fields, default_ordering):
+    filters = {f: request.GET[f] for f in filter_fields if request.GET.get(f) not in (None, '')}
+    if filters:
+        queryset = queryset.filter(**filters)
+    ordering = request.GET.get('ordering')
+    if ordering and ordering.lstrip('-') in ordering_fields:
+        return queryset.order_by(ordering)
+    if default_ordering:
+        return queryset.order_by(*default_ordering)
+    return queryset
+
+
+def _page_url(request, page, last_page):
+    if page < 1 or page > last_page:
+        return None
+    url = request.build_absolute_uri()
+    return remove_query_param(url, 'page') if page == 1 else replace_query_param(url, 'page', page)
+
+
+async def _paginated_response(request, queryset, serializer_class):
+    """Same shape as StandardResultsSetPagination: count/next/previous/results."""
+    paginator = StandardResultsSetPagination
+    try:
+        page = int(request.GET.get('page', 1))
+        page_size = min(int(request.GET.get(paginator.page_size_query_param, paginator.page_size)),
+                        paginator.max_page_size)
+    except ValueError:
+        return _error("Invalid page.", 404)
+    if page < 1 or page_size < 1:
+        return _error("Invalid page.", 404)
+
+    count = await queryset.acount()
+    last_page = max(1, -(-count // page_size))
+    if page > last_page:
+        return _error("Invalid page.", 404)
+
+    offset = (page - 1) * page_size
+    rows = [obj async for obj in queryset[offset:offset + page_size]]
+    # Method fields may still touch the database, so serialize off the event loop
+    results = await sync_to_async(
+        lambda: serializer_class(rows, many=True, context={'request': request, 'image_size': 'thumb'}).data
+    )()
+    return JsonResponse({
+        'count': count,
+        'next': _page_url(request, page + 1, last_page),
+        'previous': _page_url(request, page - 1, last_page),
+        'results': results,
+    })
+
+
+def async_list_view(build_queryset, serializer_class):
+    """
+    Wrap `build_queryset(request)` (sync or async, returning a queryset) into an
+    authenticated, paginated async GET endpoint that reads from a replica when
+    one is configured.
+    """
+    async def view(request):
+        if request.method != 'GET':
+            return _error(f'Method "{request.method}" not allowed.', 405)
+        try:
+            user = await _authenticate(request)
+        except (AuthenticationFailed, InvalidToken, TokenError) as e:
+            return _error(str(getattr(e, 'detail', e)), 401)
+        if user is None:
+            return _error("Authentication credentials were not provided.", 401)
+
+        token = None
+        alias = select_read_database(request, user)
+        if alias:
+            token = set_read_database(alias)
+        try:
+            queryset = build_queryset(request)
+            if hasattr(queryset, '__await__'):
+                queryset = await queryset
+            return await _paginated_response(request, queryset, serializer_class)
+        except (ValueError, ValidationError):
+            return _error("Invalid filter value.", 400)
+        finally:
+            if token is not None:
+                reset_read_database(token)
+    return view
+
+
+async def _item_search_queryset(request):
+    qs = (
+        Item.objects.select_related('seller', 'product', 'service').prefetch_related('categories')
+    )
+    search_term = request.GET.get('search')
+    if search_term:
+        fts, fallback = search_querysets(qs, search_term)
+        qs = fts if await fts.aexists() else fallback
+    else:
+        category_id = request.GET.get('category_id')
+        if category_id:
+            in_category = await sync_to_async(category_item_filter)(category_id)
+            if in_category is not None:
+                qs = qs.filter(in_category)
+    return _apply_filters(request, qs, ['currency', 'seller'], ['price_cents'], ['-price_cents'])
+
+
+async_item_search = async_list_view(_item_search_queryset, ItemSearchSerializer)
+
+async_item_list = async_list_view(
+    lambda request: _apply_filters(
+        request, Item.objects.select_related('seller').prefetch_related('categories'),
+        ['name', 'price_cents', 'currency', 'seller'], ['created_at', 'updated_at', 'name'], ['-created_at'],
+    ),
+    ItemSerializer,
+)
+
+async_product_list = async_list_view(
+    lambda request: _apply_filters(
+        request, Product.objects.prefetch_related('categories'),
+        ['name', 'quantity'], ['created_at', 'updated_at', 'quantity'], ['-created_at'],
+    ),
+    ProductSerializer,
+)
+
+async_service_list = async_list_view(
+    lambda request: _apply_filters(
+        request, Service.objects.prefetch_related('categories'),
+        ['name', 'service_duration'], ['created_at', 'updated_at', 'service_duration'], ['-created_at'],
+    ),
+    ServiceSerializer,
+)
+
+async_category_list = async_list_view(
+    lambda request: _apply_filters(
+        request, Category.objects.select_related('parent'), ['name'], ['name'], ['name'],
+    ),
+    CategorySerializer,
+)
+
+
+async def async_item_autocomplete(request):
+    """Up to 10 distinct item names containing ?q=, like ItemSearchViewSet.autocomplete."""
+    try:
+        user = await _authenticate(request)
+    except (AuthenticationFailed, InvalidToken, TokenError) as e:
+        return _error(str(getattr(e, 'detail', e)), 401)
+    if user is None:
+        return _error("Authentication credentials were not provided.", 401)
+
+    query = request.GET.get('q', '').strip()
+    if not query:
+        return JsonResponse([], safe=False)
+    names = (
+        Item.objects.filter(name__icontains=query)
+        .order_by('name').values_list('name', flat=True).distinct()[:10]
+    )
+    return JsonResponse([name async for name in names], safe=False)
@@ -4,14 +4,20 @@ from rest_framework.viewsets import ReadOnlyModelViewSet
 from rest_framework.viewsets import ModelViewSet
 from rest_framework.filters import SearchFilter, OrderingFilter
 from rest_framework.response import Response
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.permissions import IsAuthenticated, SAFE_METHODS
 from rest_framework.decorators import action
 from rest_framework.pagination import PageNumberPagination
 
 from django_filters.rest_framework import DjangoFilterBackend
+from django.conf import settings
 from django.shortcuts import get_object_or_404
 
+from base.db_router import pin_to_primary, reset_read_database, select_read_database, set_read_database
+from base.middleware.instrumentation import timed
 from base.permissions import HasRole
+from base.serializers.fast import compile_read_plan
+from base.utils.item_search import search_querysets
+from base.utils.query_planning import assert_constant_queries, plan_queryset
 from base.utils.metadata import generate_product_metadata, generate_order_metadata, generate_service_metadata
 from base.utils.decorators import log_user_activity
 
@@ -23,7 +29,106 @@ class StandardResultsSetPagination(PageNumberPagination):
     max_page_size = 100
 
 
-class BaseViewSet(ModelViewSet):
+class TimedListMixin:
+    """
+    DRF's list() with the serializer pass timed separately, so it shows up as
+    `serialize` in the Server-Timing header next to db and view time.
+
+    With `fast_read = True` (and FAST_READ_SERIALIZERS on), lists are rendered
+    from `.values()` rows by a compiled read plan instead of the serializer
+    (see base/serializers/fast.py); serializers it can't compile fall back.
+    """
+    fast_read = False
+
+    def get_read_plan(self):
+        if not (self.fast_read and getattr(settings, 'FAST_READ_SERIALIZERS', True)):
+            return None
+        return compile_read_plan(self.get_serializer_class())
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+
+        plan = self.get_read_plan()
+        if getattr(settings, 'ASSERT_CONSTANT_LIST_QUERIES', False):
+            self.assert_constant_list_queries(queryset, plan)
+        if plan is not None:
+            rows = plan.values(queryset)
+            page = self.paginate_queryset(rows)
+            with timed('serialize'):
+                data = plan.render(page if page is not None else rows, self.get_serializer_context())
+            return self.get_paginated_response(data) if page is not None else Response(data)
+
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            with timed('serialize'):
+                data = serializer.data
+            return self.get_paginated_response(data)
+
+        serializer = self.get_serializer(queryset, many=True)
+        with timed('serialize'):
+            data = serializer.data
+        return Response(data)
+
+    def assert_constant_list_queries(self, queryset, plan):
+        """ASSERT_CONSTANT_LIST_QUERIES: fail when rendering a page costs a query per row."""
+        size = getattr(self.paginator, 'page_size', None) or StandardResultsSetPagination.page_size
+        if plan is not None:
+            context = self.get_serializer_context()
+            assert_constant_queries(plan.values(queryset), lambda rows: plan.render(rows, context), size)
+        else:
+            assert_constant_queries(queryset, lambda rows: self.get_serializer(rows, many=True).data, size)
+
+
+class RelatedPlanningMixin:
+    """
+    For list and retrieve, add the select_related/prefetch_related the
+    serializer's nested fields need (see base/utils/query_planning.py), so
+    viewsets with a bare `queryset` don't query once per row.
+    """
+    plan_related = True
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.plan_related and getattr(self, 'action', None) in ('list', 'retrieve'):
+            queryset = plan_queryset(queryset, self.get_serializer_class())
+        return queryset
+
+
+class ReplicaReadMixin:
+    """
+    Serve safe-method requests from a read replica (when DATABASE_REPLICAS is
+    set), unless the user wrote something in the last REPLICA_STICKY_SECONDS.
+    Successful writes pin the user to the primary. Authentication and
+    permission checks always read from the primary.
+    """
+    replica_reads = True
+
+    def dispatch(self, request, *args, **kwargs):
+        self._read_database_token = None
+        try:
+            return super().dispatch(request, *args, **kwargs)
+        finally:
+            # also when an exception escapes handle_exception: the alias must not outlive the request
+            if self._read_database_token is not None:
+                reset_read_database(self._read_database_token)
+                self._read_database_token = None
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if self.replica_reads and request.method in SAFE_METHODS:
+            alias = select_read_database(request, request.user)
+            if alias:
+                self._read_database_token = set_read_database(alias)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        if request.method not in SAFE_METHODS and response.status_code < 400:
+            # `_user` is only set once authentication ran; don't re-trigger it here
+            pin_to_primary(response, getattr(request, '_user', None))
+        return super().finalize_response(request, response, *args, **kwargs)
+
+
+class BaseViewSet(ReplicaReadMixin, TimedListMixin, RelatedPlanningMixin, ModelViewSet):
     """
     ViewSet automatically provides:
     - list()         → GET 
@@ -40,7 +145,7 @@ class BaseViewSet(ModelViewSet):
         return super().get_queryset().filter(deleted_at__isnull=True)
 
     def list(self, request, *args, **kwargs):
-        logger.info(f"Listing {self.queryset.model.__name__}s requested by {request.user}")
+        logger.info("Listing %ss requested by %s", self.queryset.model.__name__, request.user)
         return super().list(request, *args, **kwargs)
 
     @log_user_activity(
@@ -52,13 +157,13 @@ class BaseViewSet(ModelViewSet):
         status='success'
     )
     def create(self, request, *args, **kwargs):
-        logger.info(f"Creating a new {self.queryset.model.__name__} requested by {request.user}")
+        logger.info("Creating a new %s requested by %s", self.queryset.model.__name__, request.user)
         try:
             response = super().create(request, *args, **kwargs)
-            logger.info(f"{self.queryset.model.__name__} created successfully.")
+            logger.info("%s created successfully.", self.queryset.model.__name__)
             return response
         except Exception as e:
-            logger.error(f"Failed to create {self.queryset.model.__name__}: {str(e)}", exc_info=True)
+            logger.error("Failed to create %s: %s", self.queryset.model.__name__, e, exc_info=True)
             return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
     @log_user_activity(
@@ -70,13 +175,13 @@ class BaseViewSet(ModelViewSet):
         status='success'
     )
     def update(self, request, *args, **kwargs):
-        logger.info(f"Updating {self.queryset.model.__name__} with ID {kwargs.get('pk')} requested by {request.user}")
+        logger.info("Updating %s with ID %s requested by %s", self.queryset.model.__name__, kwargs.get('pk'), request.user)
         try:
             response = super().update(request, *args, **kwargs)
-            logger.info(f"{self.queryset.model.__name__} with ID {kwargs.get('pk')} updated successfully.")
+            logger.info("%s with ID %s updated successfully.", self.queryset.model.__name__, kwargs.get('pk'))
             return response
         except Exception as e:
-            logger.error(f"Failed to update {self.queryset.model.__name__}: {str(e)}", exc_info=True)
+            logger.error("Failed to update %s: %s", self.queryset.model.__name__, e, exc_info=True)
             return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
     @log_user_activity(
@@ -88,13 +193,13 @@ class BaseViewSet(ModelViewSet):
         status='success'
     )    
     def destroy(self, request, *args, **kwargs):
-        logger.info(f"Deleting {self.queryset.model.__name__} with ID {kwargs.get('pk')} requested by {request.user}")
+        logger.info("Deleting %s with ID %s requested by %s", self.queryset.model.__name__, kwargs.get('pk'), request.user)
         try:
             response = super().destroy(request, *args, **kwargs)
-            logger.info(f"{self.queryset.model.__name__} with ID {kwargs.get('pk')} deleted successfully.")
+            logger.info("%s with ID %s deleted successfully.", self.queryset.model.__name__, kwargs.get('pk'))
             return response
         except Exception as e:
-            logger.error(f"Failed to delete {self.queryset.model.__name__}: {str(e)}", exc_info=True)
+            logger.error("Failed to delete %s: %s", self.queryset.model.__name__, e, exc_info=True)
             return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
     @action(detail=True, methods=['POST'])
@@ -106,7 +211,7 @@ class BaseViewSet(ModelViewSet):
         """Soft delete an object by setting deleted_at instead of hard deleting."""
         obj = get_object_or_404(self.queryset.model.objects.all_with_deleted(), pk=pk)
         obj.soft_delete()
-        logger.info(f"Soft deleted {self.queryset.model.__name__} with ID {pk}")
+        logger.info("Soft deleted %s with ID %s", self.queryset.model.__name__, pk)
         return Response({'status': 'soft deleted'}, status=status.HTTP_200_OK)
 
     @action(detail=True, methods=['POST'])
@@ -118,7 +223,7 @@ class BaseViewSet(ModelViewSet):
         """Restore a previously soft-deleted object."""
         obj = get_object_or_404(self.queryset.model.objects.deleted(), pk=pk)
         obj.restore()
-        logger.info(f"Restored {self.queryset.model.__name__} with ID {pk}")
+        logger.info("Restored %s with ID %s", self.queryset.model.__name__, pk)
         return Response({'status': 'restored'}, status=status.HTTP_200_OK)
 
     @action(detail=False, methods=['GET'])
@@ -129,7 +234,7 @@ class BaseViewSet(ModelViewSet):
         return Response(serializer.data, status=status.HTTP_200_OK)
 
 
-class BaseReadOnlyViewSet(ReadOnlyModelViewSet):
+class BaseReadOnlyViewSet(ReplicaReadMixin, TimedListMixin, RelatedPlanningMixin, ReadOnlyModelViewSet):
     filter_backends = [DjangoFilterBackend, OrderingFilter] 
     pagination_class = StandardResultsSetPagination
     permission_classes = [IsAuthenticated, HasRole]
@@ -142,20 +247,7 @@ class BaseReadOnlyViewSet(ReadOnlyModelViewSet):
         search_term = self.request.query_params.get("search")
 
         if search_term:
-            search_vector = getattr(self, "search_field", "search_vector")
-            query = SearchQuery(search_term, search_type="plain")
-
-            # ✅ Correct FTS query
-            queryset = queryset.annotate(rank=SearchRank(F(search_vector), query))
-            fts = queryset.filter(**{search_vector: query}).order_by("-rank")
-
-            if fts.exists():
-                return fts
-
-            # ✅ Fallback to ILIKE for non-indexed fallback
-            return queryset.filter(
-                Q(name__icontains=search_term) |
-                Q(description__icontains=search_term)
-            )
+            fts, fallback = search_querysets(queryset, search_term, getattr(self, "search_field", "search_vector"))
+            return fts if fts.exists() else fallback
 
         return queryset
@@ -0,0 +1,50 @@
+# backend/base/views/exports.py
+
+from django.http import StreamingHttpResponse
+from rest_framework import status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from base.permissions import IsAdminRole
+from base.utils.order_export import (
+    EXPORT_DATASETS, EXPORT_FORMATS, export_filename, iter_export, parse_export_bound,
+)
+
+CONTENT_TYPES = {
+    'csv': 'text/csv',
+    'ndjson': 'application/x-ndjson',
+}
+
+
+class OrderExportView(APIView):
+    """
+    GET /api/exports/orders/?dataset=orders|order_items|payments
+        &output=csv|ndjson&start=YYYY-MM-DD&end=YYYY-MM-DD&gzip=1
+
+    Streams the requested rows for [start, end) without building the file in memory.
+    """
+    permission_classes = [IsAuthenticated, IsAdminRole]
+
+    def get(self, request):
+        dataset = request.query_params.get('dataset', 'orders')
+        # `format` is reserved by DRF for renderer selection
+        fmt = request.query_params.get('output', 'csv')
+        compress = request.query_params.get('gzip') in ('1', 'true')
+
+        if dataset not in EXPORT_DATASETS:
+            return Response({"error": f"dataset must be one of {sorted(EXPORT_DATASETS)}."}, status=status.HTTP_400_BAD_REQUEST)
+        if fmt not in EXPORT_FORMATS:
+            return Response({"error": f"output must be one of {list(EXPORT_FORMATS)}."}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            start = parse_export_bound(request.query_params.get('start'))
+            end = parse_export_bound(request.query_params.get('end'))
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        response = StreamingHttpResponse(
+            iter_export(dataset, fmt=fmt, start=start, end=end, compress=compress),
+            content_type='application/gzip' if compress else CONTENT_TYPES[fmt],
+        )
+        response['Content-Disposition'] = f'attachment; filename="{export_filename(dataset, fmt, compress)}"'
+        return response
@@ -3,6 +3,11 @@
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
+from rest_framework.permissions import AllowAny, IsAuthenticated
+
+from base.middleware.instrumentation import metrics_registry
+from base.permissions import IsAdminRole
+from base.utils.health import FAIL, readiness
 
 class HealthCheckView(APIView):
     """
@@ -10,3 +15,43 @@ class HealthCheckView(APIView):
     """
     def get(self, request):
         return Response({"status": "ok"}, status=status.HTTP_200_OK)
+
+
+class LivenessView(HealthCheckView):
+    """
+    Liveness probe: 200 while the process can serve requests. It checks no
+    dependencies on purpose; a database outage must not get pods restarted.
+    """
+    authentication_classes = []
+    permission_classes = [AllowAny]
+
+
+class ReadinessView(APIView):
+    """
+    Readiness probe: database round trip, connection-pool saturation, cache
+    and log-queue depth (see base/utils/health.py). 503 when the pod should
+    get no traffic (database unreachable or pool exhausted); `degraded`
+    checks still answer 200. Results are cached for HEALTH_CACHE_SECONDS.
+    """
+    authentication_classes = []
+    permission_classes = [AllowAny]
+
+    def get(self, request):
+        report = readiness()
+        code = status.HTTP_503_SERVICE_UNAVAILABLE if report['status'] == FAIL else status.HTTP_200_OK
+        return Response(report, status=code)
+
+
+class MetricsView(APIView):
+    """
+    Admin-only: per-route request counts, latency and DB usage aggregated
+    in this process by RequestInstrumentationMiddleware. DELETE resets them.
+    """
+    permission_classes = [IsAuthenticated, IsAdminRole]
+
+    def get(self, request):
+        return Response({"routes": metrics_registry.snapshot()}, status=status.HTTP_200_OK)
+
+    def delete(self, request):
+        metrics_registry.reset()
+        return Response(status=status.HTTP_204_NO_CONTENT)
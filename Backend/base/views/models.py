@@ -5,18 +5,20 @@ from django.http import JsonResponse
 
 from rest_framework import status
 from rest_framework.decorators import action
+from rest_framework.exceptions import PermissionDenied, ValidationError as DRFValidationError
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, AllowAny
+from rest_framework.parsers import MultiPartParser
 
 from base.models.views import CartOverview
 from base.serializers.views import CartOverviewSerializer
-from base.permissions import HasRole, IsOwnerOrAdmin, ReadOnlyOrOwner
+from base.permissions import HasRole, IsFulfillmentStaff, IsOwnerOrAdmin, ReadOnlyOrOwner
 from base.views.baseviews import BaseReadOnlyViewSet, BaseViewSet
 from base.models.item import Product, Service, Item
 from base.models.user import CustomUser
 from base.models.address import Address
 from base.models.cart import Cart, CartItem
-from base.models.order import Order, OrderItem
+from base.models.order import Order, OrderItem, OrderStatus
 from base.models.payment import Payment
 from base.models.category import Category
 from base.serializers.models import (
@@ -29,11 +31,19 @@ from base.serializers.models import (
     AddressSerializer,
     CartSerializer,
     ItemSerializer,
+    OrderBulkTransitionSerializer,
     OrderSerializer,
     PaymentSerializer,
 )
+from base.payments.settlement import LIVE_PAYMENT_STATUSES, request_settlement
+from base.utils.idempotency import idempotent
+from base.utils.inventory import InsufficientStock, convert_holds, release
+from base.utils.item_import import ItemImporter, detect_import_format, iter_import_rows
+from base.utils.order_transitions import transition_orders
 import logging
+from django.apps import apps
 from django.db import transaction
+from django.utils.timezone import now
 
 logger = logging.getLogger('freemarketbackend')
 
@@ -41,16 +51,49 @@ logger = logging.getLogger('freemarketbackend')
 class ItemViewSet(BaseViewSet):
     queryset = Item.objects.all()
     serializer_class = ItemSerializer
+    fast_read = True
     permission_classes = [IsAuthenticated, HasRole, ReadOnlyOrOwner]
     required_roles    = ['Seller']
     filterset_fields  = ['name', 'price_cents', 'currency', 'seller']
     search_fields     = ['name', 'description']
     ordering_fields   = ['created_at', 'updated_at', 'name']
 
+    @action(detail=False, methods=['POST'], url_path='import', parser_classes=[MultiPartParser])
+    def bulk_import(self, request):
+        """
+        POST /api/items/import/ with a CSV or NDJSON `file` of products/services.
+        Rows are validated and inserted in batches; per-row errors are reported.
+        """
+        upload = request.FILES.get('file')
+        if not upload:
+            return Response({"error": "A 'file' upload is required."}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            fmt = detect_import_format(upload.name, request.data.get('format'))
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        upload.seek(0)
+        report = ItemImporter(seller=request.user).run(iter_import_rows(upload.file, fmt))
+
+        # One audit row for the whole import instead of one per item
+        UserActivityLog = apps.get_model('base', 'UserActivityLog')
+        UserActivityLog.objects.create(
+            user=request.user,
+            action='bulk_import_items',
+            description=f"Action 'bulk_import_items' performed by {request.user.username}",
+            metadata={'file': upload.name, 'created': report['created'], 'failed': report['failed']},
+            status='success' if report['created'] else 'failed',
+            ip_address=request.META.get('REMOTE_ADDR', 'Unknown'),
+            created_at=now(),
+        )
+        response_status = status.HTTP_201_CREATED if report['created'] else status.HTTP_400_BAD_REQUEST
+        return Response(report, status=response_status)
+
 
 class ProductViewSet(BaseViewSet):
     queryset = Product.objects.all()
     serializer_class = ProductSerializer
+    fast_read = True
     permission_classes = [IsAuthenticated, HasRole, ReadOnlyOrOwner]
     required_roles    = ['Seller']
     filterset_fields  = ['name', 'quantity']
@@ -61,6 +104,7 @@ class ProductViewSet(BaseViewSet):
 class ServiceViewSet(BaseViewSet):
     queryset = Service.objects.all()
     serializer_class = ServiceSerializer
+    fast_read = True
     permission_classes = [IsAuthenticated, HasRole, ReadOnlyOrOwner]
     required_roles    = ['Seller']
     filterset_fields  = ['name', 'service_duration']
@@ -91,6 +135,7 @@ class UserViewSet(BaseViewSet):
 class AddressViewSet(BaseViewSet):
     queryset = Address.objects.all()
     serializer_class = AddressSerializer
+    fast_read = True
     permission_classes = [IsAuthenticated, HasRole, IsOwnerOrAdmin]
     required_roles    = ['Buyer', 'Seller']
     filterset_fields  = ['user__username', 'city', 'country']
@@ -144,6 +189,7 @@ class CartViewSet(BaseReadOnlyViewSet):
 class CartItemViewSet(BaseViewSet):
     queryset = CartItem.objects.all()
     serializer_class = CartItemSerializer
+    fast_read = True
     permission_classes = [IsAuthenticated, HasRole]
     required_roles = ['Buyer']
 
@@ -179,6 +225,9 @@ class CartItemViewSet(BaseViewSet):
         except Item.DoesNotExist:
             return Response({"error": "Item does not exist."}, status=status.HTTP_400_BAD_REQUEST)
 
+        except InsufficientStock as e:
+            return Response({"error": e.message}, status=status.HTTP_409_CONFLICT)
+
         except CartOverview.DoesNotExist:
             return Response({"error": "Cart overview not found after adding item."}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
@@ -199,15 +248,21 @@ class CartItemViewSet(BaseViewSet):
         except Cart.DoesNotExist:
             return Response({"error": "Cart does not exist."}, status=status.HTTP_400_BAD_REQUEST)
 
+        except InsufficientStock as e:
+            return Response({"error": e.message}, status=status.HTTP_409_CONFLICT)
+
     def destroy(self, request, *args, **kwargs):
         cart_item = self.get_object()
-        cart_item.delete()
+        with transaction.atomic():
+            cart_item.delete()
+            release(cart_item.cart, [cart_item.item])
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 
 class OrderViewSet(BaseViewSet):
     queryset = Order.objects.all().select_related('user').prefetch_related('order_items', 'order_items__item')
     serializer_class = OrderSerializer
+    fast_read = True
     permission_classes = [IsAuthenticated, HasRole, IsOwnerOrAdmin]
     required_roles    = ['Buyer', 'Support']
     filterset_fields  = ['user__username', 'status']
@@ -225,32 +280,46 @@ class OrderViewSet(BaseViewSet):
                 .distinct()
         )
 
-    @transaction.atomic
+    @idempotent('order')
     def create(self, request, *args, **kwargs):
         user = request.user
         try:
-            cart = Cart.objects.get(user=user)
-            if not cart.cart_items.exists():
-                raise ValidationError("Cart is empty. Cannot create an order.")
-            order = Order.objects.create(user=user)
-            order_items = [
-                OrderItem(
+            with transaction.atomic():
+                cart = Cart.objects.get(user=user)
+                if not cart.cart_items.exists():
+                    raise ValidationError("Cart is empty. Cannot create an order.")
+                order = Order.objects.create(user=user)
+                order_items = [
+                    OrderItem(
+                        order=order,
+                        item=ci.item,
+                        quantity=ci.quantity,
+                        price_cents=ci.price_snapshot_cents
+                    )
+                    for ci in cart.cart_items.all()
+                ]
+                OrderItem.objects.bulk_create(order_items)
+                lines = {}
+                for order_item in order_items:
+                    lines[order_item.item_id] = lines.get(order_item.item_id, 0) + order_item.quantity
+                # the cart's stock holds become decrements; raises InsufficientStock
+                convert_holds(cart, lines)
+                order.calculate_total()
+                payment = Payment.objects.create(
                     order=order,
-                    item=ci.item,
-                    quantity=ci.quantity,
-                    price_cents=ci.price_snapshot_cents
+                    amount_cents=order.total_price_cents,
+                    payment_method=request.data.get('payment_method') or 'card',
                 )
-                for ci in cart.cart_items.all()
-            ]
-            OrderItem.objects.bulk_create(order_items)
-            order.calculate_total()
-            order.status = 'PAID'
-            order.save()
-            cart.cart_items.all().delete()
+                cart.cart_items.all().delete()
+            # Authorization happens after the commit: inline or in the settlement worker
+            request_settlement(payment)
+            order.refresh_from_db()
             serializer = self.get_serializer(order)
             return Response(serializer.data, status=status.HTTP_201_CREATED)
         except Cart.DoesNotExist:
             return Response({"error": "No cart found for the user."}, status=status.HTTP_400_BAD_REQUEST)
+        except InsufficientStock as e:
+            return Response({"error": e.message}, status=status.HTTP_409_CONFLICT)
         except ValidationError as e:
             return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
         except Exception as e:
@@ -258,22 +327,51 @@ class OrderViewSet(BaseViewSet):
 
     def update(self, request, *args, **kwargs):
         order = self.get_object()
-        if order.status in ['PAID', 'SHIPPED', 'DELIVERED', 'CANCELLED']:
+        if not order.is_editable:
             return Response({"error": "Cannot update an order that is already processed."}, status=status.HTTP_400_BAD_REQUEST)
+        requested = request.data.get('status')
+        if requested and requested != order.status:
+            # paid by settlement, cancelled with DELETE, moved on by fulfillment staff
+            return Response({"error": f"Cannot move an order from {order.status} to {requested}."}, status=status.HTTP_400_BAD_REQUEST)
         return super().update(request, *args, **kwargs)
 
     def destroy(self, request, *args, **kwargs):
         order = self.get_object()
-        if order.status in ['PAID', 'SHIPPED', 'DELIVERED']:
+        if order.status == OrderStatus.CANCELLED:
+            return Response({"status": "Order cancelled."}, status=status.HTTP_200_OK)
+        result, = transition_orders(
+            [order.pk], OrderStatus.CANCELLED, actor=request.user, ip_address=request.META.get('REMOTE_ADDR'),
+        )
+        if result['result'] != 'updated':
             return Response({"error": "Cannot cancel an order that is already processed."}, status=status.HTTP_400_BAD_REQUEST)
-        order.status = 'CANCELLED'
-        order.save()
         return Response({"status": "Order cancelled."}, status=status.HTTP_200_OK)
 
+    @action(detail=False, methods=['post'], url_path='bulk-transition',
+            permission_classes=[IsAuthenticated, IsFulfillmentStaff])
+    def bulk_transition(self, request):
+        """
+        POST /api/orders/bulk-transition/ {"order_ids": [...], "status": "SHIPPED"}
+        Moves every order the state machine allows, across all users, and
+        reports the outcome per order.
+        """
+        serializer = OrderBulkTransitionSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        target = serializer.validated_data['status']
+        results = transition_orders(
+            serializer.validated_data['order_ids'], target,
+            actor=request.user, ip_address=request.META.get('REMOTE_ADDR'),
+        )
+        return Response({
+            "status": target,
+            "updated": sum(result['result'] == 'updated' for result in results),
+            "results": results,
+        })
+
 
 class OrderItemViewSet(BaseViewSet):
     queryset = OrderItem.objects.all().select_related('order', 'item')
     serializer_class = OrderItemSerializer
+    fast_read = True
     permission_classes = [IsAuthenticated, HasRole, IsOwnerOrAdmin]
     required_roles    = ['Buyer']
     filterset_fields  = ['order', 'item']
@@ -292,44 +390,60 @@ class OrderItemViewSet(BaseViewSet):
     def create(self, request, *args, **kwargs):
         return Response({"error": "OrderItems can only be created through the Order endpoint."}, status=status.HTTP_400_BAD_REQUEST)
 
+    # Checkout took these quantities out of stock and charged for them, and a
+    # cancel restocks from them: they stay as checked out.
     def update(self, request, *args, **kwargs):
-        order_item = self.get_object()
-        if order_item.order.status in ['PAID', 'SHIPPED', 'DELIVERED', 'CANCELLED']:
-            return Response({"error": "Cannot update an item in an already processed order."}, status=status.HTTP_400_BAD_REQUEST)
-        return super().update(request, *args, **kwargs)
+        self.get_object()
+        return Response({"error": "Order items cannot be changed after checkout; cancel the order instead."}, status=status.HTTP_400_BAD_REQUEST)
 
     def destroy(self, request, *args, **kwargs):
-        order_item = self.get_object()
-        if order_item.order.status in ['PAID', 'SHIPPED', 'DELIVERED', 'CANCELLED']:
-            return Response({"error": "Cannot delete an item from an already processed order."}, status=status.HTTP_400_BAD_REQUEST)
-        return super().destroy(request, *args, **kwargs)
+        self.get_object()
+        return Response({"error": "Order items cannot be removed after checkout; cancel the order instead."}, status=status.HTTP_400_BAD_REQUEST)
 
 
 class PaymentViewSet(BaseViewSet):
     queryset = Payment.objects.all()
     serializer_class = PaymentSerializer
+    fast_read = True
     permission_classes = [IsAuthenticated, HasRole, IsOwnerOrAdmin]
     required_roles    = ['Buyer']
     filterset_fields  = ['order__id', 'payment_method']
     search_fields     = ['transaction_id']
     ordering_fields   = ['created_at', 'updated_at', 'amount_cents']
 
+    @idempotent('payment')
+    def create(self, request, *args, **kwargs):
+        return super().create(request, *args, **kwargs)
+
+    def perform_create(self, serializer):
+        order = serializer.validated_data['order']
+        user = self.request.user
+        if order.user_id != user.id and not (user.is_staff or user.is_superuser):
+            raise PermissionDenied("You can only record payments for your own orders.")
+        if order.status != OrderStatus.PENDING:
+            raise DRFValidationError({"order_id": f"Order is {order.status.lower()}."})
+        if Payment.objects.filter(order=order, status__in=LIVE_PAYMENT_STATUSES).exists():
+            raise DRFValidationError({"order_id": "Order already has a payment."})
+        payment = serializer.save(amount_cents=order.total_price_cents)
+        request_settlement(payment)
+        payment.refresh_from_db()
+
 
 def index(request):
-    logger.info(f"Index page accessed by {request.user}")
+    logger.info("Index page accessed by %s", request.user)
     return JsonResponse('hello', safe=False)
 
 
 def test(request):
-    logger.info(f"Test page accessed by {request.user}")
+    logger.info("Test page accessed by %s", request.user)
     return JsonResponse('hello second', safe=False)
 
 
 def myproducts(request):
-    logger.info(f"Fetching all products for {request.user}")
+    logger.info("Fetching all products for %s", request.user)
     try:
         all_products = ProductSerializer(Product.objects.all(), many=True).data
         return JsonResponse(all_products, safe=False)
     except Exception as e:
-        logger.error(f"Failed to retrieve products: {str(e)}", exc_info=True)
+        logger.error("Failed to retrieve products: %s", e, exc_info=True)
         return JsonResponse({'error': str(e)}, status=500)
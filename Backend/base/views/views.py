@@ -5,12 +5,10 @@ from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.filters import SearchFilter, OrderingFilter
 from django_filters.rest_framework import DjangoFilterBackend
-from django.contrib.postgres.search import SearchQuery, SearchRank
-from django.db.models import Q, F
 
 from base.views.baseviews import BaseReadOnlyViewSet
 from base.permissions import HasRole
-from base.models import Item, Category
+from base.models import Item
 from base.models.views import (
     ItemDetails, OrderDetails, OrderItemDetails, UserOrderHistory,
     CartOverview, TopSellingProducts, MostActiveUsers
@@ -21,7 +19,7 @@ from base.serializers.views import (
     UserOrderHistorySerializer, CartOverviewSerializer,
     TopSellingProductsSerializer, MostActiveUsersSerializer
 )
-from base.utils.category_utils import get_descendant_ids
+from base.utils.item_search import category_item_filter, search_querysets
 
 
 class ItemSearchViewSet(BaseReadOnlyViewSet):
@@ -57,26 +55,14 @@ class ItemSearchViewSet(BaseReadOnlyViewSet):
 
         search_term = self.request.query_params.get("search")
         if search_term:
-            vector = self.search_field
-            sq = SearchQuery(search_term, search_type="plain")
-            qs = qs.annotate(rank=SearchRank(F(vector), sq))
-            fts = qs.filter(**{vector: sq}).order_by("-rank")
-            if fts.exists():
-                return fts
-            # fallback
-            return qs.filter(
-                Q(name__icontains=search_term) |
-                Q(description__icontains=search_term)
-            )
+            fts, fallback = search_querysets(qs, search_term, self.search_field)
+            return fts if fts.exists() else fallback
 
         cat_id = self.request.query_params.get('category_id')
         if cat_id:
-            try:
-                cat = Category.objects.prefetch_related('subcategories').get(id=cat_id)
-                ids = get_descendant_ids(cat)
-                qs = qs.filter(categories__id__in=ids)
-            except Category.DoesNotExist:
-                pass
+            in_category = category_item_filter(cat_id)
+            if in_category is not None:
+                qs = qs.filter(in_category)
 
         return qs
 
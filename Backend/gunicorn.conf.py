@@ -0,0 +1,50 @@
+"""
+Gunicorn configuration for the production profile:
+
+    DJANGO_SETTINGS_MODULE=myproj.settings_production gunicorn -c gunicorn.conf.py
+
+SERVER_MODE=wsgi (default) runs myproj.wsgi on threaded workers;
+SERVER_MODE=asgi runs myproj.asgi on uvicorn workers.
+
+Each worker thread holds its own persistent DB connection (CONN_MAX_AGE), so
+PostgreSQL sees up to workers x threads connections; with DB_POOL=1 they share
+a pool of DB_POOL_MAX_SIZE per worker instead.
+"""
+import multiprocessing
+import os
+
+
+def _env_int(name, default):
+    value = os.environ.get(name)
+    return int(value) if value else default
+
+
+SERVER_MODE = os.environ.get('SERVER_MODE', 'wsgi')
+CPU_COUNT = multiprocessing.cpu_count()
+
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:8000')
+
+if SERVER_MODE == 'asgi':
+    wsgi_app = 'myproj.asgi:application'
+    worker_class = 'uvicorn_worker.UvicornWorker'
+    # an event loop per worker; one per core is enough
+    workers = _env_int('GUNICORN_WORKERS', CPU_COUNT)
+else:
+    wsgi_app = 'myproj.wsgi:application'
+    worker_class = 'gthread'
+    workers = _env_int('GUNICORN_WORKERS', CPU_COUNT * 2 + 1)
+    threads = _env_int('GUNICORN_THREADS', 4)
+
+# Recycle workers now and then to cap slow memory growth
+max_requests = _env_int('GUNICORN_MAX_REQUESTS', 5000)
+max_requests_jitter = _env_int('GUNICORN_MAX_REQUESTS_JITTER', 500)
+
+timeout = _env_int('GUNICORN_TIMEOUT', 30)
+graceful_timeout = _env_int('GUNICORN_GRACEFUL_TIMEOUT', 30)
+keepalive = _env_int('GUNICORN_KEEPALIVE', 5)
+
+# Request logging is done by the app (base.middleware.instrumentation);
+# set GUNICORN_ACCESS_LOG=- to get gunicorn's access log as well
+accesslog = os.environ.get('GUNICORN_ACCESS_LOG') or None
+errorlog = '-'
+loglevel = os.environ.get('GUNICORN_LOG_LEVEL', 'info')
@@ -29,8 +29,8 @@ env.read_env(os.path.join(BASE_DIR, '.env.backend'))
 
 # Setup logging
 logger = logging.getLogger(__name__)
-logger.info(f"POSTGRES_HOST: {env('POSTGRES_HOST')}")
-logger.info(f"POSTGRES_PORT: {env('POSTGRES_PORT')}")
+logger.info("POSTGRES_HOST: %s", env('POSTGRES_HOST'))
+logger.info("POSTGRES_PORT: %s", env('POSTGRES_PORT'))
 
 # Quick-start development settings - unsuitable for production
 # See https://docs.djangoproject.com/en/5.1/howto/deployment/checklist/
@@ -66,6 +66,16 @@ REST_FRAMEWORK = {
         'rest_framework_simplejwt.authentication.JWTAuthentication',
     ),
         'DEFAULT_FILTER_BACKENDS': ['django_filters.rest_framework.DjangoFilterBackend'],
+    # orjson-backed, same output as DRF's JSONRenderer/JSONParser
+    'DEFAULT_RENDERER_CLASSES': (
+        'base.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
+    'DEFAULT_PARSER_CLASSES': (
+        'base.renderers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ),
 
 }
 
@@ -97,6 +107,7 @@ SIMPLE_JWT = {
 }
 
 MIDDLEWARE = [
+    'base.middleware.RequestInstrumentationMiddleware',
     'django.middleware.security.SecurityMiddleware',
     "corsheaders.middleware.CorsMiddleware",
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -108,6 +119,15 @@ MIDDLEWARE = [
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
+# Per-request DB/view/serializer timing (Server-Timing header + structured logs)
+REQUEST_INSTRUMENTATION = env.bool('REQUEST_INSTRUMENTATION', default=True)
+# Requests slower than this are logged with their slowest SQL; unset disables it
+SLOW_REQUEST_THRESHOLD_MS = env.int('SLOW_REQUEST_THRESHOLD_MS', default=None)
+# Viewsets with `fast_read = True` render lists from compiled .values() plans
+FAST_READ_SERIALIZERS = env.bool('FAST_READ_SERIALIZERS', default=True)
+# Debug/test mode: list actions raise when their query count grows with page size
+ASSERT_CONSTANT_LIST_QUERIES = env.bool('ASSERT_CONSTANT_LIST_QUERIES', default=False)
+
 ROOT_URLCONF = 'myproj.urls'
 
 TEMPLATES = [
@@ -140,9 +160,43 @@ DATABASES = {
         'PASSWORD': env('POSTGRES_PASSWORD'),
         'HOST': env('POSTGRES_HOST'),
         'PORT': env('POSTGRES_PORT'),
+        # Reuse connections across requests; health checks drop ones the server closed
+        'CONN_MAX_AGE': env.int('DB_CONN_MAX_AGE', default=60),
+        'CONN_HEALTH_CHECKS': True,
     }
 }
 
+# Optional psycopg3 connection pool (pip install psycopg-pool). Django requires
+# CONN_MAX_AGE = 0 with a pool: connections go back to the pool after each request.
+if env.bool('DB_POOL', default=False):
+    DATABASES['default']['CONN_MAX_AGE'] = 0
+    DATABASES['default']['OPTIONS'] = {
+        'pool': {
+            'min_size': env.int('DB_POOL_MIN_SIZE', default=2),
+            'max_size': env.int('DB_POOL_MAX_SIZE', default=10),
+            'timeout': env.int('DB_POOL_TIMEOUT', default=10),
+        },
+    }
+
+# Read replicas: one `replica_<n>` alias per host, otherwise identical to
+# `default`. To try it locally, point POSTGRES_REPLICA_HOSTS at the primary.
+DATABASE_REPLICAS = []
+for index, host in enumerate(env.list('POSTGRES_REPLICA_HOSTS', default=[])):
+    alias = f'replica_{index}'
+    DATABASES[alias] = {
+        **DATABASES['default'],
+        'HOST': host,
+        'PORT': env('POSTGRES_REPLICA_PORT', default=DATABASES['default']['PORT']),
+        'TEST': {'MIRROR': 'default'},
+    }
+    DATABASE_REPLICAS.append(alias)
+
+DATABASE_ROUTERS = ['base.db_router.PrimaryReplicaRouter']
+# After a write, the user's reads stay on the primary for this long
+# (a signed cookie, so the pin holds across workers)
+REPLICA_STICKY_SECONDS = env.int('REPLICA_STICKY_SECONDS', default=5)
+REPLICA_PIN_COOKIE = 'replica_pin'
+
 
 
 # Password validation
@@ -187,12 +241,73 @@ STATICFILES_DIRS = [BASE_DIR / 'static']
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Item.image derivatives (longest edge in px), written as WebP and JPEG
+ITEM_IMAGE_VARIANTS = {'thumb': 320, 'medium': 960}
+ITEM_IMAGE_QUALITY = env.int('ITEM_IMAGE_QUALITY', default=80)
+
+# In-process worker pool for off-request work (base/utils/background.py)
+BACKGROUND_WORKERS = env.int('BACKGROUND_WORKERS', default=2)
+BACKGROUND_TASKS_EAGER = env.bool('BACKGROUND_TASKS_EAGER', default=False)
+
+# Uploads stream to temp files (hashed on the way); images are bounded in
+# bytes and in pixels before Pillow decodes them (base/utils/uploads.py)
+FILE_UPLOAD_HANDLERS = ['base.utils.uploads.HashingUploadHandler']
+MAX_IMAGE_UPLOAD_BYTES = env.int('MAX_IMAGE_UPLOAD_BYTES', default=10 * 1024 * 1024)
+MAX_IMAGE_PIXELS = env.int('MAX_IMAGE_PIXELS', default=40_000_000)
+
+# Idempotency-Key handling on order/payment creation (base/utils/idempotency.py);
+# expired keys are removed by `manage.py purge_idempotency_keys`
+IDEMPOTENCY_KEY_TTL_HOURS = env.int('IDEMPOTENCY_KEY_TTL_HOURS', default=24)
+IDEMPOTENCY_LOCK_SECONDS = env.int('IDEMPOTENCY_LOCK_SECONDS', default=60)
+
+# Payment authorization (base/payments): the backend class and its options,
+# and whether checkout settles inline ('sync') or in the worker pool ('async')
+PAYMENT_BACKEND = env('PAYMENT_BACKEND', default='base.payments.simulator.SimulatorBackend')
+PAYMENT_BACKEND_OPTIONS = {
+    'latency_ms': env.int('PAYMENT_SIMULATOR_LATENCY_MS', default=0),
+    'jitter_ms': env.int('PAYMENT_SIMULATOR_JITTER_MS', default=0),
+    'failure_rate': env.float('PAYMENT_SIMULATOR_FAILURE_RATE', default=0.0),
+}
+PAYMENT_SETTLEMENT = env('PAYMENT_SETTLEMENT', default='sync')
+
+# How long adding a product to a cart holds its stock (base/utils/inventory.py)
+STOCK_HOLD_TTL_MINUTES = env.int('STOCK_HOLD_TTL_MINUTES', default=15)
+
+# Most orders POST /api/orders/bulk-transition/ accepts at once
+ORDER_BULK_TRANSITION_MAX = env.int('ORDER_BULK_TRANSITION_MAX', default=5000)
+
+# Readiness probe (base/utils/health.py): how long a probe report is reused,
+# and the pool usage above which it reports `degraded`
+HEALTH_CACHE_SECONDS = env.int('HEALTH_CACHE_SECONDS', default=5)
+HEALTH_POOL_SATURATION = env.float('HEALTH_POOL_SATURATION', default=0.9)
+
 
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.1/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+# Retention for soft-deleted rows, applied by `manage.py purge_deleted`.
+# mode: 'archive' copies rows (and anything their deletion cascades to) into
+# ArchivedRecord before deleting them, 'purge' just deletes them.
+# protect: models whose live rows keep a referenced row in place.
+SOFT_DELETE_RETENTION_DAYS = env.int('SOFT_DELETE_RETENTION_DAYS', default=90)
+SOFT_DELETE_RETENTION = {
+    'base.CartItem': {'days': 30, 'mode': 'purge'},
+    'base.Address': {'days': SOFT_DELETE_RETENTION_DAYS, 'mode': 'archive'},
+    'base.Item': {
+        'days': SOFT_DELETE_RETENTION_DAYS,
+        'mode': 'archive',
+        'protect': ['base.OrderItem', 'base.CartItem'],
+    },
+    'base.Order': {'days': 365, 'mode': 'archive'},
+}
+
+# Activity logs are range-partitioned by month (`manage.py manage_log_partitions`).
+# Partitions older than the retention are detached and dropped; 0 keeps them all.
+ACTIVITY_LOG_RETENTION_MONTHS = env.int('ACTIVITY_LOG_RETENTION_MONTHS', default=12)
+ACTIVITY_LOG_PARTITIONS_AHEAD = env.int('ACTIVITY_LOG_PARTITIONS_AHEAD', default=3)
+
 CORS_ALLOW_CREDENTIALS = True
 
 CORS_ALLOWED_ORIGINS = [
@@ -208,6 +323,11 @@ log_directory = os.path.dirname(LOG_FILE_PATH)
 os.makedirs(log_directory, exist_ok=True)
 
 
+# Loggers only enqueue records; a listener thread formats them as JSON and does
+# the file/console I/O (see base/utils/log_handlers.py)
+LOG_LEVEL = env('LOG_LEVEL', default='INFO')
+DJANGO_LOG_LEVEL = env('DJANGO_LOG_LEVEL', default='INFO')
+
 LOGGING = {
     'version': 1,
     'disable_existing_loggers': False,
@@ -217,34 +337,40 @@ LOGGING = {
             'style': '{',
         },
         'json': {
-            'format': '{{"time": "{asctime}", "level": "{levelname}", "module": "{module}", "message": "{message}"}}',
-            'style': '{',
+            '()': 'base.utils.log_handlers.JsonFormatter',
         },
     },
     'handlers': {
-        'file': {
-            'level': 'INFO',
-            'class': 'logging.FileHandler',
-            'filename': LOG_FILE_PATH,
-            'formatter': 'verbose',
-        },
         'console': {
             'level': 'DEBUG',
             'class': 'logging.StreamHandler',
             'formatter': 'json',
         },
+        'file': {
+            'level': 'INFO',
+            'class': 'logging.handlers.RotatingFileHandler',
+            'filename': LOG_FILE_PATH,
+            'maxBytes': env.int('LOG_FILE_MAX_BYTES', default=10 * 1024 * 1024),
+            'backupCount': env.int('LOG_FILE_BACKUP_COUNT', default=5),
+            'formatter': 'json',
+        },
+        # must sort after the handlers it feeds
+        'queue': {
+            '()': 'base.utils.log_handlers.QueueListenerHandler',
+            'handlers': ['cfg://handlers.console', 'cfg://handlers.file'],
+            'queue_size': env.int('LOG_QUEUE_SIZE', default=10000),
+        },
     },
     'loggers': {
         'django': {
-            'handlers': ['file', 'console'],
-            'level': 'INFO',
+            'handlers': ['queue'],
+            'level': DJANGO_LOG_LEVEL,
             'propagate': True,
         },
         'freemarketbackend': {  # Custom logger for your app
-            'handlers': ['file', 'console'],
-            'level': 'DEBUG',
+            'handlers': ['queue'],
+            'level': LOG_LEVEL,
             'propagate': False,
         },
     },
 }
-
@@ -0,0 +1,25 @@
+"""
+Production settings for myproj: DJANGO_SETTINGS_MODULE=myproj.settings_production.
+
+Everything is inherited from myproj.settings (still configured through the
+environment); this module only switches off development-only overhead.
+Serve with `gunicorn -c gunicorn.conf.py` (see Backend/gunicorn.conf.py).
+"""
+
+from .settings import *  # noqa: F401,F403
+from .settings import REST_FRAMEWORK, env
+
+DEBUG = False
+
+# The browsable API renders templates and forms for every browser request
+REST_FRAMEWORK = {
+    **REST_FRAMEWORK,
+    'DEFAULT_RENDERER_CLASSES': (
+        'base.renderers.FastJSONRenderer',
+    ),
+}
+
+# Behind a reverse proxy that terminates TLS
+USE_X_FORWARDED_HOST = env.bool('USE_X_FORWARDED_HOST', default=False)
+if env.bool('SECURE_PROXY_SSL', default=False):
+    SECURE_PROXY_SSL_HEADER = ('HTTP_X_FORWARDED_PROTO', 'https')
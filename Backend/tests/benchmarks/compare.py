@@ -0,0 +1,58 @@
+# tests/benchmarks/compare.py
+"""
+Compare two benchmark result files:
+
+    python -m tests.benchmarks.compare bench-results/abc123.json bench-results/def456.json
+
+Exits with status 1 when any benchmark issues more queries, or its p95 grows
+by more than --tolerance percent.
+"""
+import argparse
+import json
+import sys
+
+
+def compare(baseline, current, tolerance):
+    regressions = []
+    lines = [f"{'benchmark':<28}{'queries':>16}{'p50 ms':>20}{'p95 ms':>20}"]
+    for name, new in sorted(current['results'].items()):
+        old = baseline['results'].get(name)
+        # benchmarks timed without a request (measure_callable) have no query count
+        new_queries = new.get('queries', '-')
+        if old is None:
+            lines.append(f"{name:<28}{new_queries:>16}{new['p50_ms']:>20}{new['p95_ms']:>20}  (new)")
+            continue
+        old_queries = old.get('queries', '-')
+        lines.append(
+            f"{name:<28}{old_queries:>7} -> {new_queries:<6}"
+            f"{old['p50_ms']:>9} -> {new['p50_ms']:<8}{old['p95_ms']:>9} -> {new['p95_ms']:<8}"
+        )
+        if 'queries' in new and 'queries' in old and new['queries'] > old['queries']:
+            regressions.append(f"{name}: queries {old['queries']} -> {new['queries']}")
+        if new['p95_ms'] > old['p95_ms'] * (1 + tolerance / 100):
+            regressions.append(f"{name}: p95 {old['p95_ms']}ms -> {new['p95_ms']}ms")
+    return lines, regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('baseline')
+    parser.add_argument('current')
+    parser.add_argument('--tolerance', type=float, default=20.0, help="Allowed p95 growth in percent")
+    args = parser.parse_args(argv)
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.current) as f:
+        current = json.load(f)
+
+    lines, regressions = compare(baseline, current, args.tolerance)
+    print("\n".join(lines))
+    if regressions:
+        print("\nRegressions:\n  " + "\n  ".join(regressions))
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,64 @@
+# tests/benchmarks/conftest.py
+import io
+import os
+
+import pytest
+from django.core.management import call_command
+from rest_framework.test import APIClient
+
+from base.models.user import CustomUser
+from tests.benchmarks.harness import BENCH_ENABLED, BENCH_SIZES, BenchmarkRecorder
+
+if BENCH_ENABLED and os.environ.get('FREEMARKET_TEMPLATE_DB'):
+    @pytest.fixture(scope='session')
+    def django_db_setup(django_test_environment, django_db_blocker):
+        """
+        Clone the test database from a snapshot made with
+        `manage.py db_snapshot save` instead of migrating a new one. Only the
+        benchmarks use it: the rest of the suite expects empty tables.
+        """
+        from django.db import connections
+        from base.utils.db_snapshot import drop_database, use_snapshot_for_tests
+
+        with django_db_blocker.unblock():
+            name = use_snapshot_for_tests(os.environ['FREEMARKET_TEMPLATE_DB'])
+        yield
+        with django_db_blocker.unblock():
+            connections.close_all()
+            drop_database(name)
+
+
+@pytest.fixture(scope='session')
+def bench_dataset(django_db_setup, django_db_blocker):
+    """
+    Seed the benchmark dataset once per session. The rows are committed, so the
+    benchmark suite must run on its own (see tests/benchmarks/harness.py).
+    """
+    if not BENCH_ENABLED:
+        pytest.skip("set FREEMARKET_BENCHMARK=1 to run benchmarks")
+    with django_db_blocker.unblock():
+        if not CustomUser.objects.filter(username='user0').exists():
+            call_command('seed', seed=1234, stdout=io.StringIO(), **BENCH_SIZES)
+    return BENCH_SIZES
+
+
+@pytest.fixture(scope='session')
+def bench_recorder():
+    recorder = BenchmarkRecorder()
+    yield recorder
+    path = recorder.write()
+    if path:
+        print(f"\nBenchmark results written to {path}")
+
+
+@pytest.fixture
+def bench_user(bench_dataset, db):
+    """The first seeded user: a Buyer and a Seller."""
+    return CustomUser.objects.get(username='user0')
+
+
+@pytest.fixture
+def bench_client(bench_user):
+    client = APIClient()
+    client.force_authenticate(bench_user)
+    return client
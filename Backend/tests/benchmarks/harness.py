@@ -0,0 +1,135 @@
+# tests/benchmarks/harness.py
+"""
+Shared helpers for the API benchmark suite.
+
+Benchmarks only run when FREEMARKET_BENCHMARK=1, against a dataset seeded once
+per session (sizes from FREEMARKET_BENCH_USERS / _ITEMS / _ORDERS):
+
+    FREEMARKET_BENCHMARK=1 pytest tests/benchmarks -p no:cacheprovider --no-cov
+
+Seeding a large dataset dominates the run; save it once as a template
+database and every later run clones it instead (sizes and seed must match
+the FREEMARKET_BENCH_* values, which are the defaults below):
+
+    python manage.py db_snapshot save --build --template freemarket_bench
+    FREEMARKET_TEMPLATE_DB=freemarket_bench FREEMARKET_BENCHMARK=1 pytest tests/benchmarks ...
+"""
+import json
+import math
+import os
+import subprocess
+import time
+from pathlib import Path
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+BENCH_ENABLED = os.environ.get('FREEMARKET_BENCHMARK') == '1'
+BENCH_SIZES = {
+    'users': int(os.environ.get('FREEMARKET_BENCH_USERS', 200)),
+    'items': int(os.environ.get('FREEMARKET_BENCH_ITEMS', 2000)),
+    'orders': int(os.environ.get('FREEMARKET_BENCH_ORDERS', 2000)),
+}
+BENCH_ITERATIONS = int(os.environ.get('FREEMARKET_BENCH_ITERATIONS', 30))
+BENCH_OUTPUT = os.environ.get('FREEMARKET_BENCH_OUTPUT', 'bench-results/{commit}.json')
+BUDGETS = json.loads((Path(__file__).parent / 'budgets.json').read_text())
+
+requires_benchmark = pytest.mark.skipif(not BENCH_ENABLED, reason="set FREEMARKET_BENCHMARK=1 to run benchmarks")
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def measure(client, method, path, iterations=BENCH_ITERATIONS, warmup=2, setup=None, expected_status=None, **kwargs):
+    """
+    Call an endpoint repeatedly and return latency percentiles and query counts.
+    `setup` runs before every call and is excluded from the timing.
+    """
+    timings, queries = [], []
+    for i in range(warmup + iterations):
+        if setup:
+            setup()
+        with CaptureQueriesContext(connection) as ctx:
+            start = time.perf_counter()
+            response = getattr(client, method)(path, **kwargs)
+            elapsed = (time.perf_counter() - start) * 1000
+        if expected_status is not None:
+            assert response.status_code == expected_status, response.content[:500]
+        else:
+            assert response.status_code < 400, response.content[:500]
+        if i >= warmup:
+            timings.append(elapsed)
+            queries.append(len(ctx.captured_queries))
+    return {
+        'iterations': iterations,
+        'p50_ms': round(percentile(timings, 50), 3),
+        'p95_ms': round(percentile(timings, 95), 3),
+        'queries': max(queries),
+    }
+
+
+def measure_callable(func, iterations=BENCH_ITERATIONS, warmup=2):
+    """Latency percentiles of calling `func()` repeatedly (no HTTP round trip)."""
+    timings = []
+    for i in range(warmup + iterations):
+        start = time.perf_counter()
+        func()
+        elapsed = (time.perf_counter() - start) * 1000
+        if i >= warmup:
+            timings.append(elapsed)
+    return {
+        'iterations': iterations,
+        'p50_ms': round(percentile(timings, 50), 3),
+        'p95_ms': round(percentile(timings, 95), 3),
+    }
+
+
+def assert_within_budget(name, result):
+    """Fail when a result exceeds its entry in budgets.json."""
+    budget = BUDGETS.get(name)
+    if not budget:
+        return
+    if 'queries' in budget:
+        assert result['queries'] <= budget['queries'], (
+            f"{name}: {result['queries']} queries exceeds budget of {budget['queries']}"
+        )
+    if 'p95_ms' in budget:
+        assert result['p95_ms'] <= budget['p95_ms'], (
+            f"{name}: p95 {result['p95_ms']}ms exceeds budget of {budget['p95_ms']}ms"
+        )
+
+
+def current_commit():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'local'
+
+
+class BenchmarkRecorder:
+    """Collects per-benchmark results and writes them as one JSON document."""
+
+    def __init__(self):
+        self.results = {}
+
+    def record(self, name, result):
+        self.results[name] = result
+        return result
+
+    def write(self):
+        if not self.results:
+            return None
+        commit = current_commit()
+        path = Path(BENCH_OUTPUT.format(commit=commit))
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps({
+            'commit': commit,
+            'dataset': BENCH_SIZES,
+            'results': dict(sorted(self.results.items())),
+        }, indent=2))
+        return path
@@ -0,0 +1,81 @@
+# tests/benchmarks/test_api_benchmarks.py
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from base.models.cart import Cart, CartItem
+from base.models.category import Category
+from base.models.item import Item, Product
+from tests.benchmarks.harness import assert_within_budget, measure, requires_benchmark
+
+pytestmark = [pytest.mark.benchmark, pytest.mark.django_db, requires_benchmark]
+
+
+def _run(bench_recorder, name, *args, **kwargs):
+    result = bench_recorder.record(name, measure(*args, **kwargs))
+    assert_within_budget(name, result)
+    return result
+
+
+def test_item_search_list(bench_client, bench_recorder):
+    _run(bench_recorder, 'item_search_list', bench_client, 'get', reverse('item-search-list'))
+
+
+def test_item_search_full_text(bench_client, bench_recorder):
+    _run(bench_recorder, 'item_search_fts', bench_client, 'get', reverse('item-search-list'), data={'search': 'Item1'})
+
+
+def test_cart_items_list(bench_client, bench_user, bench_recorder):
+    cart, _ = Cart.objects.get_or_create(user=bench_user)
+    for item in Item.objects.order_by('id')[:5]:
+        cart.add_item(item, quantity=1)
+    _run(bench_recorder, 'cart_items_list', bench_client, 'get', reverse('cart-item-list'))
+
+
+def _cart_filler(user):
+    cart, _ = Cart.objects.get_or_create(user=user)
+    items = list(Item.objects.order_by('id')[:3])
+
+    def fill_cart():
+        CartItem.all_objects.filter(cart=cart).delete()
+        # checkout takes the units out of stock; keep the products available
+        Product.all_objects.filter(pk__in=[item.pk for item in items]).update(quantity=1000, reserved_quantity=0)
+        for item in items:
+            CartItem.objects.create(cart=cart, item=item, quantity=2, price_snapshot_cents=item.price_cents)
+    return fill_cart
+
+
+def test_checkout(bench_client, bench_user, bench_recorder):
+    _run(bench_recorder, 'checkout', bench_client, 'post', reverse('order-list'),
+         setup=_cart_filler(bench_user), expected_status=201, data={}, format='json')
+
+
+def test_category_list(bench_client, bench_recorder):
+    _run(bench_recorder, 'category_list', bench_client, 'get', reverse('category-list'))
+
+
+def test_category_list_queries_do_not_grow_with_tree_size(bench_client):
+    def count_queries():
+        with CaptureQueriesContext(connection) as ctx:
+            assert bench_client.get(reverse('category-list')).status_code == 200
+        return len(ctx.captured_queries)
+
+    before = count_queries()
+    parents = Category.objects.bulk_create([Category(name=f"Bench{i}") for i in range(50)])
+    Category.objects.bulk_create([Category(name=f"Bench{p.id}-child", parent=p) for p in parents])
+    assert count_queries() == before
+
+
+def test_order_details_list(bench_client, bench_recorder):
+    _run(bench_recorder, 'order_details_list', bench_client, 'get', reverse('order-details-list'))
+
+
+@pytest.mark.parametrize('fast_read', [True, False], ids=['fast', 'serializer'])
+@pytest.mark.parametrize('route', ['item-list', 'payment-list'])
+def test_fast_read_lists(bench_client, bench_recorder, settings, route, fast_read):
+    # The serializer runs are the baseline the fast path is compared against
+    settings.FAST_READ_SERIALIZERS = fast_read
+    name = f"{route.replace('-', '_')}_{'fast' if fast_read else 'serializer'}"
+    _run(bench_recorder, name, bench_client, 'get', reverse(route), iterations=5)
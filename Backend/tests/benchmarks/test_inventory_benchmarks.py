@@ -0,0 +1,73 @@
+# tests/benchmarks/test_inventory_benchmarks.py
+"""
+Flash sale: many buyers adding the same product to their carts at once.
+
+The buyers are threads with their own database connections, so this runs
+outside the per-test transaction and removes the rows it creates.
+"""
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from django.db import connection
+
+from base.models import Cart, CartItem, CustomUser, Product, StockReservation
+from base.utils.inventory import InsufficientStock
+from tests.benchmarks.harness import assert_within_budget, percentile, requires_benchmark
+
+pytestmark = [pytest.mark.benchmark, requires_benchmark]
+
+BUYERS = int(os.environ.get('FREEMARKET_BENCH_BUYERS', 50))
+STOCK = max(1, BUYERS // 5)
+
+
+@pytest.fixture
+def flash_sale(bench_dataset, django_db_blocker):
+    with django_db_blocker.unblock():
+        users = list(CustomUser.objects.order_by('pk')[:BUYERS])
+        carts = [Cart.objects.get_or_create(user=user)[0] for user in users]
+        product = Product.objects.create(
+            name='Flash sale', price_cents=100, currency='USD', seller=users[0], quantity=STOCK,
+        )
+        yield product, carts
+        StockReservation.objects.filter(product=product).delete()
+        CartItem.all_objects.filter(item=product).delete()
+        Product.all_objects.filter(pk=product.pk).delete()
+
+
+def test_flash_sale_reservations(flash_sale, bench_recorder):
+    product, carts = flash_sale
+    start_line = threading.Barrier(len(carts))
+
+    def buy(cart):
+        start_line.wait()
+        start = time.perf_counter()
+        try:
+            cart.add_item(product, quantity=1)
+            bought = True
+        except InsufficientStock:
+            bought = False
+        finally:
+            elapsed = (time.perf_counter() - start) * 1000
+            connection.close()
+        return bought, elapsed
+
+    with ThreadPoolExecutor(max_workers=len(carts)) as pool:
+        outcomes = list(pool.map(buy, carts))
+    timings = [elapsed for _, elapsed in outcomes]
+    result = bench_recorder.record('flash_sale_reserve', {
+        'buyers': len(carts),
+        'stock': STOCK,
+        'sold': sum(bought for bought, _ in outcomes),
+        'p50_ms': round(percentile(timings, 50), 3),
+        'p95_ms': round(percentile(timings, 95), 3),
+    })
+
+    # never oversold, never undersold
+    product.refresh_from_db()
+    assert result['sold'] == STOCK
+    assert product.reserved_quantity == STOCK
+    assert StockReservation.objects.filter(product=product).count() == STOCK
+    assert_within_budget('flash_sale_reserve', result)
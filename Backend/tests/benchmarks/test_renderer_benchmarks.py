@@ -0,0 +1,39 @@
+# tests/benchmarks/test_renderer_benchmarks.py
+
+import pytest
+from rest_framework.renderers import JSONRenderer
+
+from base.models import Item, Order
+from base.renderers import FastJSONRenderer
+from base.serializers.item_search import ItemSearchSerializer
+from base.serializers.models import OrderSerializer
+from tests.benchmarks.harness import measure_callable, requires_benchmark
+
+pytestmark = [pytest.mark.benchmark, pytest.mark.django_db, requires_benchmark]
+
+PAGE_SIZE = 100  # StandardResultsSetPagination.max_page_size
+
+
+def _item_search_payload():
+    items = (
+        Item.objects.select_related('seller', 'product', 'service').prefetch_related('categories')
+        .order_by('-price_cents')[:PAGE_SIZE]
+    )
+    return ItemSearchSerializer(items, many=True).data
+
+
+def _order_payload():
+    orders = Order.objects.prefetch_related('order_items', 'order_items__item').order_by('-created_at')[:PAGE_SIZE]
+    return OrderSerializer(orders, many=True).data
+
+
+@pytest.mark.parametrize('payload', [_item_search_payload, _order_payload], ids=['item_search', 'orders'])
+def test_render_throughput(bench_dataset, bench_recorder, payload):
+    data = payload()
+    stock, fast = JSONRenderer(), FastJSONRenderer()
+    assert fast.render(data) == stock.render(data)
+
+    name = payload.__name__.strip('_').replace('_payload', '')
+    baseline = bench_recorder.record(f"render_{name}_json", measure_callable(lambda: stock.render(data)))
+    result = bench_recorder.record(f"render_{name}_orjson", measure_callable(lambda: fast.render(data)))
+    assert result['p50_ms'] <= baseline['p50_ms']
@@ -0,0 +1,108 @@
+# tests/benchmarks/test_settlement_benchmarks.py
+"""
+Checkout throughput against a slow payment gateway (~200ms per authorization).
+
+CHECKOUTS buyers check out through SERVER_THREADS request threads, standing
+in for the threads of the serving processes. With PAYMENT_SETTLEMENT=sync
+each request holds its thread while the gateway authorizes; with async the
+request returns once the order commits and the background pool
+(BACKGROUND_WORKERS) authorizes. Reported per mode: checkout requests per
+second, orders settled per second (first request to last payment leaving
+PENDING/PROCESSING) and request latency.
+
+The requests run in their own threads and connections and really commit,
+so on_commit fires and the workers see the orders; this runs outside the
+per-test transaction and removes the buyers (and with them their carts,
+orders and payments) afterwards.
+"""
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from django.contrib.auth.models import Group
+from django.db import connection
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from base.models import Cart, CustomUser, Order, Payment, Product
+from base.models.payment import PaymentStatus
+from base.payments import reset_backend
+from tests.benchmarks.harness import assert_within_budget, percentile, requires_benchmark
+
+pytestmark = [pytest.mark.benchmark, requires_benchmark]
+
+CHECKOUTS = int(os.environ.get('FREEMARKET_BENCH_CHECKOUTS', 40))
+SERVER_THREADS = int(os.environ.get('FREEMARKET_BENCH_SERVER_THREADS', 4))
+GATEWAY_MS = 200
+SETTLE_TIMEOUT_S = 120
+
+
+@pytest.fixture
+def checkout_buyers(bench_dataset, django_db_blocker):
+    with django_db_blocker.unblock():
+        buyer_group, _ = Group.objects.get_or_create(name='Buyer')
+        buyers = [
+            CustomUser.objects.create_user(username=f'settlement-bench-{i}', password='x')
+            for i in range(CHECKOUTS)
+        ]
+        buyer_group.user_set.add(*buyers)
+        product = Product.objects.create(
+            name='Settlement bench', price_cents=100, currency='USD', seller=buyers[0], quantity=CHECKOUTS,
+        )
+        for buyer in buyers:
+            Cart.objects.create(user=buyer).add_item(product, quantity=1)
+        yield buyers
+        CustomUser.objects.filter(pk__in=[buyer.pk for buyer in buyers]).delete()
+        Product.all_objects.filter(pk=product.pk).delete()
+
+
+@pytest.mark.parametrize('mode', ['sync', 'async'])
+def test_checkout_settlement_throughput(checkout_buyers, bench_recorder, settings, mode):
+    settings.PAYMENT_BACKEND_OPTIONS = {'latency_ms': GATEWAY_MS}
+    settings.PAYMENT_SETTLEMENT = mode
+    settings.BACKGROUND_TASKS_EAGER = False
+    reset_backend()
+
+    def checkout(buyer):
+        client = APIClient()
+        client.force_authenticate(buyer)
+        start = time.perf_counter()
+        try:
+            response = client.post(reverse('order-list'), {}, format='json')
+            return response.status_code, response.json().get('id'), (time.perf_counter() - start) * 1000
+        finally:
+            connection.close()
+
+    try:
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=SERVER_THREADS) as pool:
+            outcomes = list(pool.map(checkout, checkout_buyers))
+        accepted = time.perf_counter() - started
+        assert [status for status, _, _ in outcomes] == [201] * len(outcomes)
+
+        order_ids = [order_id for _, order_id, _ in outcomes]
+        unsettled = Payment.objects.filter(
+            order_id__in=order_ids, status__in=[PaymentStatus.PENDING, PaymentStatus.PROCESSING],
+        )
+        while unsettled.exists():
+            assert time.perf_counter() - started < SETTLE_TIMEOUT_S, f"{unsettled.count()} payment(s) never settled"
+            time.sleep(0.02)
+        settled = time.perf_counter() - started
+    finally:
+        reset_backend()
+
+    timings = [elapsed for _, _, elapsed in outcomes]
+    name = f'checkout_throughput_{mode}'
+    result = bench_recorder.record(name, {
+        'checkouts': len(outcomes),
+        'server_threads': SERVER_THREADS,
+        'gateway_ms': GATEWAY_MS,
+        'requests_per_s': round(len(outcomes) / accepted, 2),
+        'settled_per_s': round(len(outcomes) / settled, 2),
+        'p50_ms': round(percentile(timings, 50), 3),
+        'p95_ms': round(percentile(timings, 95), 3),
+    })
+
+    assert Order.objects.filter(pk__in=order_ids, status='PAID').count() == len(order_ids)
+    assert_within_budget(name, result)
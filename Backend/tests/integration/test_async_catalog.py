@@ -0,0 +1,62 @@
+# tests/integration/test_async_catalog.py
+import pytest
+from django.test import Client
+from django.urls import reverse
+from rest_framework_simplejwt.tokens import AccessToken
+
+pytestmark = [pytest.mark.integration, pytest.mark.django_db]
+
+
+@pytest.fixture
+def jwt_client(user):
+    return Client(HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(user)}")
+
+
+def test_requires_a_token():
+    resp = Client().get(reverse('async-item-search'))
+    assert resp.status_code == 401
+
+
+def test_item_search_matches_the_sync_endpoint(jwt_client, authed_client, product_factory, service_factory):
+    for price in (500, 1500, 2500):
+        product_factory(price_cents=price)
+    service_factory(price_cents=900)
+
+    async_resp = jwt_client.get(reverse('async-item-search'), {'page_size': 3})
+    sync_resp = authed_client.get(reverse('item-search-list'), {'page_size': 3})
+
+    assert async_resp.status_code == 200
+    body = async_resp.json()
+    assert body['count'] == sync_resp.data['count'] == 4
+    assert [r['id'] for r in body['results']] == [r['id'] for r in sync_resp.data['results']]
+    assert body['results'][0]['price_cents'] == 2500
+    assert body['next'] and body['previous'] is None
+
+
+def test_item_search_filters_and_orders(jwt_client, user, product_factory):
+    mine = product_factory(seller=user, price_cents=100)
+    product_factory(price_cents=200)
+
+    resp = jwt_client.get(reverse('async-item-search'), {'seller': user.id, 'ordering': 'price_cents'})
+    assert [r['id'] for r in resp.json()['results']] == [mine.id]
+
+    assert jwt_client.get(reverse('async-item-search'), {'seller': 'abc'}).status_code == 400
+    assert jwt_client.get(reverse('async-item-search'), {'page': 99}).status_code == 404
+
+
+def test_autocomplete_returns_distinct_names(jwt_client, product_factory):
+    product_factory(name='lamp')
+    product_factory(name='lamp')
+    product_factory(name='table')
+
+    resp = jwt_client.get(reverse('async-item-autocomplete'), {'q': 'la'})
+    assert resp.json() == ['lamp']
+
+
+@pytest.mark.parametrize('name', ['async-item-list', 'async-product-list', 'async-service-list', 'async-category-list'])
+def test_catalog_lists(jwt_client, product_factory, service_factory, name):
+    product_factory()
+    service_factory()
+    resp = jwt_client.get(reverse(name))
+    assert resp.status_code == 200
+    assert resp.json()['count'] >= 0
@@ -0,0 +1,48 @@
+# tests/integration/test_db_snapshot.py
+
+import io
+
+import pytest
+from django.core.management import CommandError, call_command
+
+from base.utils.db_snapshot import copy_database, database_exists, drop_database
+
+pytestmark = [pytest.mark.integration, pytest.mark.django_db]
+
+SCRATCH = 'freemarket_snapshot_test'
+
+
+@pytest.fixture
+def scratch():
+    yield SCRATCH
+    drop_database(SCRATCH)
+    drop_database(f'{SCRATCH}_clone')
+
+
+def test_copy_and_drop_round_trip(scratch):
+    # template0 always exists and nobody is connected to it
+    copy_database('template0', scratch, as_template=True)
+    assert database_exists(scratch)
+
+    call_command('db_snapshot', 'clone', template=scratch, target=f'{scratch}_clone', stdout=io.StringIO())
+    assert database_exists(f'{scratch}_clone')
+
+    out = io.StringIO()
+    call_command('db_snapshot', 'drop', template=scratch, stdout=out)
+    assert not database_exists(scratch)
+    assert "Dropped snapshot" in out.getvalue()
+
+
+def test_restore_needs_an_existing_snapshot():
+    with pytest.raises(CommandError, match="No snapshot named"):
+        call_command('db_snapshot', 'restore', template='freemarket_missing_snapshot', stdout=io.StringIO())
+
+
+def test_build_keeps_migrated_permissions(mocker):
+    save = mocker.patch('base.management.commands.db_snapshot.save_snapshot')
+    commands = mocker.patch('base.management.commands.db_snapshot.call_command')
+    call_command('db_snapshot', 'save', build=True, template=SCRATCH, stdout=io.StringIO())
+
+    reset = next(call for call in commands.call_args_list if call.args[0] == 'dbreset')
+    assert reset.kwargs['keep_auth'] is True
+    save.assert_called_once()
@@ -0,0 +1,42 @@
+# tests/integration/test_dbreset.py
+
+import io
+
+import pytest
+from django.contrib.auth.models import Group, Permission
+from django.core.management import call_command
+
+from base.models.item import Item, Product
+from base.models.order import Order
+from base.models.user import CustomUser
+
+pytestmark = [pytest.mark.integration, pytest.mark.django_db]
+
+
+@pytest.fixture
+def seeded():
+    call_command('seed', seed=7, users=5, items=10, orders=5, stdout=io.StringIO())
+
+
+def test_dbreset_empties_app_tables_and_restarts_ids(seeded):
+    call_command('dbreset', stdout=io.StringIO())
+
+    assert not CustomUser.objects.exists()
+    assert not Item.all_objects.exists()
+    assert not Order.all_objects.exists()
+    assert not Group.objects.exists()
+
+    user = CustomUser.objects.create_user(username='fresh', password='x')
+    product = Product.objects.create(name='fresh', price_cents=1, currency='USD', seller=user)
+    assert (user.pk, product.pk) == (1, 1)
+
+
+def test_dbreset_can_keep_auth(seeded):
+    groups = set(Group.objects.values_list('name', flat=True))
+    permissions = Permission.objects.count()
+
+    call_command('dbreset', keep_auth=True, stdout=io.StringIO())
+
+    assert not CustomUser.objects.exists()
+    assert set(Group.objects.values_list('name', flat=True)) == groups
+    assert Permission.objects.count() == permissions
@@ -0,0 +1,77 @@
+# tests/integration/test_health.py
+from types import SimpleNamespace
+
+import pytest
+from django.urls import reverse
+
+from base.utils import health
+
+pytestmark = [pytest.mark.integration, pytest.mark.django_db]
+
+
+@pytest.fixture(autouse=True)
+def fresh_report():
+    health.reset()
+    yield
+    health.reset()
+
+
+def test_liveness_checks_nothing(api_client, django_assert_num_queries):
+    with django_assert_num_queries(0):
+        resp = api_client.get(reverse('health_live'))
+    assert resp.json() == {"status": "ok"}
+    assert api_client.get(reverse('health_check')).json() == {"status": "ok"}
+
+
+def test_readiness_probes_dependencies(api_client):
+    resp = api_client.get(reverse('health_ready'))
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body['status'] == 'ok'
+    assert body['checks']['database']['status'] == 'ok'
+    assert body['checks']['cache']['status'] == 'ok'
+    assert {'queued', 'capacity', 'dropped'} <= set(body['checks']['log_queue'])
+
+
+def test_readiness_reuses_recent_results(api_client, django_assert_num_queries, settings):
+    settings.HEALTH_CACHE_SECONDS = 60
+    api_client.get(reverse('health_ready'))
+    with django_assert_num_queries(0):
+        assert api_client.get(reverse('health_ready')).status_code == 200
+
+
+def test_exhausted_pool_fails_without_waiting_for_a_connection(api_client, mocker):
+    mocker.patch.object(health, 'probe_db_pool', return_value={'status': 'fail', 'requests_waiting': 4})
+    probe_database = mocker.spy(health, 'probe_database')
+
+    resp = api_client.get(reverse('health_ready'))
+    assert resp.status_code == 503
+    assert resp.json()['checks']['database'] == {'status': 'fail', 'error': "connection pool exhausted"}
+    probe_database.assert_not_called()
+
+
+def test_probe_errors_do_not_leak_details(api_client, mocker):
+    cache = mocker.patch.object(health, 'cache')
+    cache.set.side_effect = ConnectionError('connection to server at "10.0.0.5", port 6379 failed')
+
+    resp = api_client.get(reverse('health_ready'))
+    assert resp.json()['checks']['cache'] == {'status': 'degraded', 'error': 'ConnectionError'}
+    assert '10.0.0.5' not in resp.content.decode()
+
+
+def test_dropped_log_records_degrade_but_stay_ready(api_client, mocker):
+    mocker.patch.object(health, 'queue_depth', return_value={'queued': 0, 'capacity': 100, 'dropped': 3})
+    resp = api_client.get(reverse('health_ready'))
+    assert resp.status_code == 200
+    assert resp.json()['status'] == 'degraded'
+
+
+@pytest.mark.parametrize('stats, expected', [
+    ({'pool_size': 4, 'pool_available': 3}, 'ok'),
+    ({'pool_size': 10, 'pool_available': 0}, 'degraded'),
+    ({'pool_size': 10, 'pool_available': 0, 'requests_waiting': 2}, 'fail'),
+])
+def test_pool_saturation(mocker, stats, expected):
+    pool = SimpleNamespace(max_size=10, get_stats=lambda: stats)
+    mocker.patch.object(health, 'connections', {'default': SimpleNamespace(pool=pool)})
+    assert health.probe_db_pool()['status'] == expected
@@ -0,0 +1,79 @@
+# tests/integration/test_idempotency.py
+from datetime import timedelta
+from types import SimpleNamespace
+
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils.timezone import now
+
+from base.models import Cart, IdempotencyKey, Order, Payment
+from base.utils.idempotency import request_fingerprint
+
+pytestmark = [pytest.mark.integration, pytest.mark.django_db]
+
+
+@pytest.fixture
+def filled_cart(user, product_factory):
+    cart, _ = Cart.objects.get_or_create(user=user)
+    cart.add_item(product_factory(price_cents=250), quantity=2)
+    return cart
+
+
+def _checkout(client, key):
+    return client.post(reverse('order-list'), {}, format='json', HTTP_IDEMPOTENCY_KEY=key)
+
+
+def test_repeated_checkout_replays_the_first_response(authed_client, user, filled_cart):
+    first = _checkout(authed_client, 'checkout-1')
+    second = _checkout(authed_client, 'checkout-1')
+
+    assert first.status_code == second.status_code == 201
+    assert second.json() == first.json()
+    assert second['Idempotent-Replayed'] == 'true'
+    assert Order.objects.filter(user=user).count() == 1
+
+
+def test_key_reused_for_another_payload_is_rejected(authed_client, user, filled_cart):
+    order = Order.objects.create(user=user, total_price_cents=500)
+    url = reverse('payment-list')
+    payload = {'order_id': order.id, 'amount_cents': 500, 'payment_method': 'card', 'transaction_id': 'tx-1'}
+
+    assert authed_client.post(url, payload, format='json', HTTP_IDEMPOTENCY_KEY='pay-1').status_code == 201
+    payload['amount_cents'] = 400
+    assert authed_client.post(url, payload, format='json', HTTP_IDEMPOTENCY_KEY='pay-1').status_code == 422
+    assert Payment.objects.count() == 1
+
+
+def test_in_flight_key_returns_conflict(authed_client, user):
+    checkout = SimpleNamespace(method='POST', path=reverse('order-list'), data={})
+    IdempotencyKey.objects.create(
+        scope='order', user=user, key='busy', request_hash=request_fingerprint(checkout),
+        expires_at=now() + timedelta(hours=1),
+    )
+    resp = _checkout(authed_client, 'busy')
+    assert resp.status_code == 409
+    assert resp['Retry-After'] == '1'
+
+
+def test_abandoned_claim_is_taken_over(authed_client, user, filled_cart, settings):
+    settings.IDEMPOTENCY_LOCK_SECONDS = 60
+    stale = now() - timedelta(minutes=5)
+    IdempotencyKey.objects.create(
+        scope='order', user=user, key='stuck', request_hash='x', created_at=stale, expires_at=now() + timedelta(hours=1),
+    )
+    assert _checkout(authed_client, 'stuck').status_code == 201
+    assert IdempotencyKey.objects.get(key='stuck').status_code == 201
+
+
+def test_server_errors_release_the_key(authed_client, user, filled_cart, mocker):
+    mocker.patch('base.views.models.OrderItem.objects.bulk_create', side_effect=RuntimeError('boom'))
+    assert _checkout(authed_client, 'retry-me').status_code == 500
+    assert not IdempotencyKey.objects.filter(key='retry-me').exists()
+
+
+def test_purge_removes_only_expired_keys(user):
+    IdempotencyKey.objects.create(scope='order', user=user, key='old', request_hash='x', expires_at=now() - timedelta(seconds=1))
+    IdempotencyKey.objects.create(scope='order', user=user, key='new', request_hash='x', expires_at=now() + timedelta(hours=1))
+    call_command('purge_idempotency_keys')
+    assert list(IdempotencyKey.objects.values_list('key', flat=True)) == ['new']
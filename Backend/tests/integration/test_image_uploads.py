@@ -0,0 +1,49 @@
+# tests/integration/test_image_uploads.py
+import io
+
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.urls import reverse
+from PIL import Image
+
+from base.models import Product
+
+pytestmark = [pytest.mark.integration, pytest.mark.django_db]
+
+
+def _png(name='photo.png', color=(10, 120, 200)):
+    out = io.BytesIO()
+    Image.new('RGB', (200, 150), color).save(out, 'PNG')
+    return SimpleUploadedFile(name, out.getvalue(), content_type='image/png')
+
+
+@pytest.fixture
+def seller_client(authed_client, user, settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    user.is_staff = True
+    user.save()
+    return authed_client
+
+
+def _create(client, user, image, name='Lamp'):
+    return client.post(reverse('product-list'), {
+        'name': name, 'price_cents': 1000, 'currency': 'USD', 'seller': user.id, 'quantity': 1, 'image': image,
+    }, format='multipart')
+
+
+def test_identical_images_are_stored_once(seller_client, user, tmp_path):
+    first = _create(seller_client, user, _png('a.png'))
+    second = _create(seller_client, user, _png('b.png'), name='Lamp 2')
+    assert first.status_code == second.status_code == 201
+
+    a, b = Product.objects.order_by('pk')
+    assert a.image.name == b.image.name
+    assert a.image.name.startswith('items/') and a.image.name.endswith('.png')
+    assert len(list((tmp_path / 'items').glob('*.png'))) == 1
+
+
+def test_oversized_image_is_rejected(seller_client, user, settings):
+    settings.MAX_IMAGE_UPLOAD_BYTES = 100
+    resp = _create(seller_client, user, _png())
+    assert resp.status_code == 400
+    assert not Product.objects.exists()
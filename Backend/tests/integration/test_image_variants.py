@@ -0,0 +1,73 @@
+# tests/integration/test_image_variants.py
+import io
+
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.urls import reverse
+from PIL import Image
+
+from base.models import Item
+from base.utils.images import variant_path
+
+pytestmark = [pytest.mark.integration, pytest.mark.django_db]
+
+
+def _png(width=1600, height=1200, name='photo.png'):
+    out = io.BytesIO()
+    Image.new('RGBA', (width, height), (200, 30, 30, 255)).save(out, 'PNG')
+    return SimpleUploadedFile(name, out.getvalue(), content_type='image/png')
+
+
+@pytest.fixture
+def media(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    settings.BACKGROUND_TASKS_EAGER = True
+    return tmp_path
+
+
+def test_saving_an_image_builds_hashed_variants(media, user, product_factory, django_capture_on_commit_callbacks):
+    with django_capture_on_commit_callbacks(execute=True):
+        product = product_factory(seller=user, image=_png())
+
+    variants = Item.objects.get(pk=product.pk).image_variants
+    assert variants['source'] == product.image.name
+    thumb = variants['sizes']['thumb']
+    assert (thumb['width'], thumb['height']) == (320, 240)
+    assert thumb['webp'] == variant_path(variants['hash'], 'thumb', 'webp')
+    with Image.open(media / thumb['jpeg']) as image:
+        assert image.format == 'JPEG' and image.size == (320, 240)
+
+
+def test_identical_uploads_share_variants(media, user, product_factory, django_capture_on_commit_callbacks):
+    with django_capture_on_commit_callbacks(execute=True):
+        first = product_factory(seller=user, image=_png(name='a.png'))
+        second = product_factory(seller=user, image=_png(name='b.png'))
+    first.refresh_from_db()
+    second.refresh_from_db()
+    assert first.image_variants['sizes'] == second.image_variants['sizes']
+
+
+def test_list_serves_thumbnails_and_detail_medium(media, authed_client, user, product_factory,
+                                                  django_capture_on_commit_callbacks):
+    with django_capture_on_commit_callbacks(execute=True):
+        product = product_factory(seller=user, image=_png())
+    product.refresh_from_db()
+    sizes = product.image_variants['sizes']
+
+    listed = authed_client.get(reverse('product-list')).json()[0]['image']
+    assert listed.endswith(sizes['thumb']['webp'])
+    detail = authed_client.get(reverse('product-detail', args=[product.pk])).json()['image']
+    assert detail.endswith(sizes['medium']['webp'])
+    jpeg = authed_client.get(reverse('product-list'), {'image_format': 'jpeg'}).json()[0]['image']
+    assert jpeg.endswith(sizes['thumb']['jpeg'])
+    original = authed_client.get(reverse('product-list'), {'image_size': 'original'}).json()[0]['image']
+    assert original.endswith(product.image.name)
+
+
+def test_backfill_command(media, user, product_factory):
+    product = product_factory(seller=user, image=_png())
+    Item.objects.filter(pk=product.pk).update(image_variants={})
+
+    call_command('generate_image_variants')
+    assert Item.objects.get(pk=product.pk).image_variants['source'] == product.image.name
@@ -0,0 +1,60 @@
+# tests/integration/test_index_advisor.py
+
+import io
+import json
+
+import pytest
+from django.core.management import call_command
+
+from base.models import Order
+from base.urls import router
+from base.utils.index_advisor import explain_scans, query_findings
+
+pytestmark = [pytest.mark.integration, pytest.mark.django_db]
+
+
+def _finding(findings, viewset, kind, field):
+    return next(f for f in findings if (f['viewset'], f['kind'], f['field']) == (viewset, kind, field))
+
+
+def test_unindexed_viewset_filters_are_flagged(user):
+    Order.objects.create(user=user, status='PAID')
+    findings = query_findings(router.registry)
+
+    status_filter = _finding(findings, 'OrderViewSet', 'filter', 'status')
+    assert status_filter['status'] == 'unindexed'
+    # a seq scan, or a full scan of a partial index that only filters
+    assert any(scan.get('table') == 'base_order' for scan in status_filter['scans'])
+
+    # live_order_user_created serves the user filter
+    assert explain_scans(Order.objects.filter(user=user)) == []
+
+
+def test_advise_writes_a_stable_json_report(tmp_path, user):
+    runs = []
+    for _ in range(2):
+        output = tmp_path / f'index-report-{len(runs)}.json'
+        call_command('generate_index_doc', advise=True, stable=True, format='json', output=str(output),
+                     stdout=io.StringIO())
+        runs.append(output.read_text())
+        # queries in between move the usage counters the stable report leaves out
+        list(Order.objects.filter(user=user))
+
+    assert runs[0] == runs[1]
+    report = json.loads(runs[0])
+    assert set(report) == {'indexes', 'queries'}
+    assert report['indexes'] == sorted(report['indexes'], key=lambda row: (row['table'], row['index']))
+
+
+def test_full_json_report_has_the_statistics(tmp_path):
+    output = tmp_path / 'index-report.json'
+    call_command('generate_index_doc', advise=True, format='json', output=str(output), stdout=io.StringIO())
+    assert set(json.loads(output.read_text())) == {'bloat', 'indexes', 'queries', 'seq_scan_tables', 'unused_indexes'}
+
+
+def test_markdown_report_keeps_the_index_table(tmp_path):
+    output = tmp_path / 'indexes.md'
+    call_command('generate_index_doc', advise=True, output=str(output), stdout=io.StringIO())
+    text = output.read_text()
+    assert text.startswith("# FreeMarket Indexes\n\n| Table | Index Name | Fields | Index Type |")
+    assert "## Viewset queries without a usable index" in text
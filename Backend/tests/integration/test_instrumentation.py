@@ -0,0 +1,73 @@
+# tests/integration/test_instrumentation.py
+
+import asyncio
+import logging
+
+import pytest
+from asgiref.sync import iscoroutinefunction
+from django.http import HttpResponse
+from django.test import RequestFactory
+from django.urls import reverse
+
+from base.middleware.instrumentation import RequestInstrumentationMiddleware, metrics_registry
+from base.models.user import CustomUser
+
+pytestmark = [pytest.mark.integration, pytest.mark.django_db]
+
+
+@pytest.fixture(autouse=True)
+def clean_registry():
+    metrics_registry.reset()
+    yield
+    metrics_registry.reset()
+
+
+def _timings(response):
+    return {entry.split(';')[0].strip(): entry for entry in response['Server-Timing'].split(',')}
+
+
+def test_server_timing_header_reports_db_view_and_serializer(authed_client, product_factory):
+    product_factory()
+    resp = authed_client.get(reverse('item-search-list'))
+
+    assert resp.status_code == 200
+    timings = _timings(resp)
+    assert {'total', 'db', 'view', 'serialize'} <= set(timings)
+    assert 'queries' in timings['db']
+
+
+def test_slow_requests_log_their_sql(authed_client, settings, caplog, monkeypatch):
+    settings.SLOW_REQUEST_THRESHOLD_MS = 0
+    # the app logger only feeds the log queue; let caplog's root handler see it too
+    monkeypatch.setattr(logging.getLogger('freemarketbackend'), 'propagate', True)
+    with caplog.at_level(logging.WARNING, logger='freemarketbackend'):
+        authed_client.get(reverse('cart-item-list'))
+
+    slow = [r for r in caplog.records if r.getMessage().startswith('Slow request')]
+    assert slow and slow[0].slow_sql
+    assert slow[0].route == 'cart-item-list'
+
+
+def test_metrics_endpoint_is_admin_only_and_aggregates(api_client, authed_client):
+    authed_client.get(reverse('health_check'))
+    assert authed_client.get(reverse('metrics')).status_code == 403
+
+    admin = CustomUser.objects.create_superuser(username='ops', password='pass123')
+    api_client.force_authenticate(admin)
+    resp = api_client.get(reverse('metrics'))
+
+    assert resp.status_code == 200
+    assert resp.data['routes']['health_check']['count'] == 1
+
+
+def test_middleware_stays_async_under_asgi():
+    async def view(request):
+        return HttpResponse()
+
+    middleware = RequestInstrumentationMiddleware(view)
+    assert iscoroutinefunction(middleware)
+    assert iscoroutinefunction(middleware.process_view)
+    assert not iscoroutinefunction(RequestInstrumentationMiddleware(lambda request: HttpResponse()))
+
+    response = asyncio.run(middleware(RequestFactory().get('/')))
+    assert 'total' in _timings(response)
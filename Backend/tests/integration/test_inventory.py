@@ -0,0 +1,117 @@
+# tests/integration/test_inventory.py
+from datetime import timedelta
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils.timezone import now
+
+from base.models import Cart, CartItem, Product, StockReservation
+from base.utils.inventory import InsufficientStock, convert_holds, hold
+
+pytestmark = [pytest.mark.integration, pytest.mark.django_db]
+
+
+def _stock(product):
+    product = Product.all_objects.get(pk=product.pk)
+    return product.quantity, product.reserved_quantity
+
+
+def test_adding_to_cart_holds_stock(authed_client, product_factory):
+    product = product_factory(quantity=5)
+    resp = authed_client.post(reverse('cart-item-list'), {"item_id": product.id, "quantity": 3}, format='json')
+    assert resp.status_code == 201
+    assert _stock(product) == (5, 3)
+
+    resp = authed_client.post(reverse('cart-item-list'), {"item_id": product.id, "quantity": 3}, format='json')
+    assert resp.status_code == 409
+    assert CartItem.objects.get(item=product).quantity == 3
+    assert _stock(product) == (5, 3)
+
+
+def test_holds_from_other_carts_count(user, product_factory, django_user_model):
+    product = product_factory(quantity=2)
+    other = Cart.objects.create(user=django_user_model.objects.create_user(username='other', password='x'))
+    other.add_item(product, quantity=2)
+
+    with pytest.raises(InsufficientStock):
+        Cart.objects.create(user=user).add_item(product, quantity=1)
+
+
+def test_changing_and_removing_cart_lines_adjusts_the_hold(authed_client, product_factory):
+    product = product_factory(quantity=10)
+    resp = authed_client.post(reverse('cart-item-list'), {"item_id": product.id, "quantity": 2}, format='json')
+    assert resp.status_code == 201
+    cart_item = CartItem.objects.get(item=product)
+
+    authed_client.put(reverse('cart-item-detail', args=[cart_item.id]), {"quantity": 6}, format='json')
+    assert _stock(product) == (10, 6)
+    authed_client.put(reverse('cart-item-detail', args=[cart_item.id]), {"quantity": 1}, format='json')
+    assert _stock(product) == (10, 1)
+
+    assert authed_client.delete(reverse('cart-item-detail', args=[cart_item.id])).status_code == 204
+    assert _stock(product) == (10, 0)
+    assert not StockReservation.objects.exists()
+
+
+def test_services_are_not_stocked(user, service_factory):
+    cart = Cart.objects.create(user=user)
+    cart.add_item(service_factory(), quantity=50)
+    assert not StockReservation.objects.exists()
+
+
+def test_checkout_turns_holds_into_decrements(authed_client, user, product_factory):
+    product = product_factory(quantity=5)
+    Cart.objects.create(user=user).add_item(product, quantity=2)
+
+    assert authed_client.post(reverse('order-list'), {}, format='json').status_code == 201
+    assert _stock(product) == (3, 0)
+    assert not StockReservation.objects.exists()
+
+
+def test_checkout_fails_when_stock_went_to_another_cart_after_expiry(authed_client, user, product_factory,
+                                                                     django_user_model):
+    product = product_factory(quantity=2)
+    cart = Cart.objects.create(user=user)
+    cart.add_item(product, quantity=2)
+    StockReservation.objects.update(expires_at=now() - timedelta(minutes=1))
+    call_command('release_expired_holds')
+    assert _stock(product) == (2, 0)
+
+    other = Cart.objects.create(user=django_user_model.objects.create_user(username='other', password='x'))
+    other.add_item(product, quantity=1)
+
+    resp = authed_client.post(reverse('order-list'), {}, format='json')
+    assert resp.status_code == 409
+    assert _stock(product) == (2, 1)
+    assert cart.cart_items.count() == 1
+
+
+def test_release_expired_holds_only_touches_expired(user, product_factory):
+    fresh, stale = product_factory(quantity=5), product_factory(quantity=5)
+    cart = Cart.objects.create(user=user)
+    hold(cart, fresh, 2)
+    hold(cart, stale, 3)
+    StockReservation.objects.filter(product=stale).update(expires_at=now() - timedelta(seconds=1))
+
+    call_command('release_expired_holds', batch_size=1)
+    assert _stock(fresh) == (5, 2)
+    assert _stock(stale) == (5, 0)
+
+
+def test_reservations_are_locked_before_the_held_amount_is_read(user, product_factory):
+    product = product_factory(quantity=5)
+    cart = Cart.objects.create(user=user)
+    hold(cart, product, 1)
+
+    def locked_reads(func, *args):
+        with CaptureQueriesContext(connection) as ctx:
+            func(*args)
+        table = StockReservation._meta.db_table
+        return [q['sql'] for q in ctx.captured_queries if q['sql'].startswith('SELECT') and table in q['sql']]
+
+    for reads in (locked_reads(hold, cart, product, 2), locked_reads(convert_holds, cart, {product.pk: 2})):
+        assert reads and all('FOR UPDATE' in sql for sql in reads)
+    assert _stock(product) == (3, 0)
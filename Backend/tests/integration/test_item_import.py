@@ -0,0 +1,78 @@
+# tests/integration/test_item_import.py
+
+import io
+import json
+
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework import status
+
+from base.models.category import Category
+from base.models.item import Item, Product, Service, ItemCategory
+from base.models.user import CustomUser
+
+pytestmark = [pytest.mark.integration, pytest.mark.django_db]
+
+CSV_ROWS = (
+    "item_type,name,price_cents,currency,quantity,service_duration,categories\n"
+    "product,Desk,12000,USD,4,,Furniture\n"
+    "service,Assembly,3000,USD,,90,Furniture|Services\n"
+    "product,Broken,-5,USD,1,,\n"
+    "product,Lamp,2500,EUR,2,,Unknown\n"
+)
+
+
+@pytest.fixture
+def seller():
+    return CustomUser.objects.create_seller(username='importer', password='pass123')
+
+
+@pytest.fixture
+def categories():
+    return [Category.objects.create(name='Furniture'), Category.objects.create(name='Services')]
+
+
+def test_csv_upload_creates_items_and_reports_row_errors(api_client, seller, categories):
+    api_client.force_authenticate(seller)
+    upload = SimpleUploadedFile('items.csv', CSV_ROWS.encode(), content_type='text/csv')
+
+    resp = api_client.post(reverse('item-bulk-import'), {'file': upload}, format='multipart')
+
+    assert resp.status_code == status.HTTP_201_CREATED
+    assert resp.data['created'] == 2
+    assert resp.data['failed'] == 2
+    assert [e['row'] for e in resp.data['errors']] == [3, 4]
+    assert 'price_cents' in resp.data['errors'][0]['errors']
+    assert 'categories' in resp.data['errors'][1]['errors']
+
+    desk = Product.objects.get(name='Desk')
+    assert desk.seller == seller and desk.quantity == 4
+    assembly = Service.objects.get(name='Assembly')
+    assert assembly.service_duration == 90
+    assert set(assembly.categories.values_list('name', flat=True)) == {'Furniture', 'Services'}
+    assert ItemCategory.objects.count() == 3
+
+
+def test_upload_requires_file(api_client, seller):
+    api_client.force_authenticate(seller)
+    resp = api_client.post(reverse('item-bulk-import'), {}, format='multipart')
+    assert resp.status_code == status.HTTP_400_BAD_REQUEST
+
+
+def test_import_items_command_reads_ndjson(tmp_path, seller, categories):
+    path = tmp_path / 'items.ndjson'
+    lines = [
+        {"item_type": "product", "name": "Chair", "price_cents": 4000, "currency": "GBP", "categories": ["Furniture"]},
+        {"item_type": "service", "name": "Repair", "price_cents": 900, "currency": "USD", "service_type": "Maintenance"},
+    ]
+    path.write_text("\n".join(json.dumps(line) for line in lines) + "\n{not json}\n")
+    out = io.StringIO()
+
+    call_command('import_items', str(path), seller=seller.username, batch_size=1, stdout=out)
+
+    assert Item.objects.filter(seller=seller).count() == 2
+    assert Service.objects.get(name='Repair').service_type == 'Maintenance'
+    assert "Imported 2 items" in out.getvalue()
+    assert "Row 3" in out.getvalue()
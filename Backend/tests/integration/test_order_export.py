@@ -0,0 +1,71 @@
+# tests/integration/test_order_export.py
+
+import csv
+import gzip
+import io
+import json
+from datetime import timedelta
+
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils.timezone import now
+from rest_framework import status
+
+from base.models.order import Order, OrderItem
+from base.models.payment import Payment
+from base.models.user import CustomUser
+
+pytestmark = [pytest.mark.integration, pytest.mark.django_db]
+
+
+@pytest.fixture
+def orders(user, product_factory):
+    product = product_factory(price_cents=250)
+    recent = Order.objects.create(user=user, status='PAID', total_price_cents=500)
+    OrderItem.objects.create(order=recent, item=product, quantity=2, price_cents=250)
+    Payment.objects.create(order=recent, amount_cents=500, payment_method='Credit Card', transaction_id='tx-1')
+    old = Order.objects.create(user=user, status='PAID', total_price_cents=250, created_at=now() - timedelta(days=30))
+    return recent, old
+
+
+def _streamed(resp):
+    return b''.join(resp.streaming_content)
+
+
+def test_admin_streams_orders_csv_in_range(api_client, orders):
+    admin = CustomUser.objects.create_superuser(username='finance', password='pass123')
+    api_client.force_authenticate(admin)
+    start = (now() - timedelta(days=1)).date().isoformat()
+
+    resp = api_client.get(reverse('order_export'), {'start': start})
+
+    assert resp.status_code == status.HTTP_200_OK
+    assert resp['Content-Type'] == 'text/csv'
+    rows = list(csv.DictReader(io.StringIO(_streamed(resp).decode())))
+    assert [int(r['id']) for r in rows] == [orders[0].id]
+    assert rows[0]['total_price_cents'] == '500'
+
+
+def test_gzip_ndjson_order_items(api_client, orders):
+    admin = CustomUser.objects.create_superuser(username='finance', password='pass123')
+    api_client.force_authenticate(admin)
+
+    resp = api_client.get(reverse('order_export'), {'dataset': 'order_items', 'output': 'ndjson', 'gzip': '1'})
+
+    assert resp['Content-Type'] == 'application/gzip'
+    lines = gzip.decompress(_streamed(resp)).decode().splitlines()
+    assert json.loads(lines[0])['quantity'] == 2
+
+
+def test_non_admin_forbidden(authed_client, orders):
+    resp = authed_client.get(reverse('order_export'))
+    assert resp.status_code == status.HTTP_403_FORBIDDEN
+
+
+def test_export_orders_command_writes_file(tmp_path, orders):
+    path = tmp_path / 'payments.csv.gz'
+    call_command('export_orders', dataset='payments', gzip=True, output=str(path), stderr=io.StringIO())
+
+    rows = list(csv.DictReader(io.StringIO(gzip.decompress(path.read_bytes()).decode())))
+    assert [r['transaction_id'] for r in rows] == ['tx-1']
@@ -0,0 +1,140 @@
+# tests/integration/test_order_transitions.py
+import io
+
+import pytest
+from django.apps import apps
+from django.contrib.auth.models import Group
+from django.core.management import call_command
+from django.urls import reverse
+
+from base.models import Cart, Order, OrderItem, Product
+from base.utils.order_transitions import transition_orders
+
+pytestmark = [pytest.mark.integration, pytest.mark.django_db]
+
+
+@pytest.fixture
+def fulfillment_client(api_client, django_user_model):
+    clerk = django_user_model.objects.create_user(username='clerk', password='x')
+    clerk.groups.add(Group.objects.get_or_create(name='Fulfillment')[0])
+    api_client.force_authenticate(clerk)
+    return api_client
+
+
+def test_bulk_transition_moves_only_allowed_orders(fulfillment_client, user):
+    paid = [Order.objects.create(user=user, status='PAID') for _ in range(3)]
+    pending = Order.objects.create(user=user, status='PENDING')
+
+    resp = fulfillment_client.post(reverse('order-bulk-transition'), {
+        "order_ids": [o.id for o in paid] + [pending.id, 999999],
+        "status": "SHIPPED",
+    }, format='json')
+
+    assert resp.status_code == 200
+    assert resp.data['updated'] == 3
+    results = {r['id']: r for r in resp.data['results']}
+    assert all(results[o.id] == {'id': o.id, 'result': 'updated', 'from': 'PAID'} for o in paid)
+    assert results[pending.id]['result'] == 'invalid_transition'
+    assert results[999999]['result'] == 'not_found'
+    assert set(Order.objects.filter(pk__in=[o.id for o in paid]).values_list('status', flat=True)) == {'SHIPPED'}
+    assert Order.objects.get(pk=pending.pk).status == 'PENDING'
+
+
+def test_bulk_transition_is_staff_only(authed_client, user):
+    order = Order.objects.create(user=user, status='PAID')
+    resp = authed_client.post(reverse('order-bulk-transition'), {"order_ids": [order.id], "status": "SHIPPED"},
+                              format='json')
+    assert resp.status_code == 403
+
+
+def test_bulk_transition_rejects_unreachable_status(fulfillment_client, user):
+    order = Order.objects.create(user=user, status='PAID')
+    resp = fulfillment_client.post(reverse('order-bulk-transition'), {"order_ids": [order.id], "status": "PENDING"},
+                                   format='json')
+    assert resp.status_code == 400
+
+
+def test_bulk_transition_cannot_mark_orders_paid(fulfillment_client, user):
+    order = Order.objects.create(user=user, status='PENDING')
+    resp = fulfillment_client.post(reverse('order-bulk-transition'), {"order_ids": [order.id], "status": "PAID"},
+                                   format='json')
+    assert resp.status_code == 400
+    with pytest.raises(ValueError):
+        transition_orders([order.id], 'PAID')
+    assert Order.objects.get(pk=order.pk).status == 'PENDING'
+
+
+def test_transitions_are_logged_in_one_batch(user, django_assert_num_queries, django_user_model):
+    clerk = django_user_model.objects.create_user(username='clerk', password='x')
+    orders = [Order.objects.create(user=user, status='SHIPPED') for _ in range(5)]
+    # savepoint, guarded UPDATE, log insert, release
+    with django_assert_num_queries(4):
+        transition_orders([o.id for o in orders], 'DELIVERED', actor=clerk)
+    logs = apps.get_model('base', 'UserActivityLog').objects.filter(action='order_status_change')
+    assert logs.count() == 5
+
+
+def test_buyer_cannot_skip_states(authed_client, user):
+    order = Order.objects.create(user=user, status='PENDING')
+    resp = authed_client.patch(reverse('order-detail', args=[order.id]), {'status': 'DELIVERED'}, format='json')
+    assert resp.status_code == 400
+    assert Order.objects.get(pk=order.pk).status == 'PENDING'
+
+
+def test_buyer_cannot_mark_an_order_paid(authed_client, user):
+    order = Order.objects.create(user=user, status='PENDING')
+    resp = authed_client.patch(reverse('order-detail', args=[order.id]), {'status': 'PAID'}, format='json')
+    assert resp.status_code == 400
+    assert Order.objects.get(pk=order.pk).status == 'PENDING'
+
+
+def test_cancelling_returns_the_stock(authed_client, user, product_factory, settings):
+    settings.PAYMENT_SETTLEMENT = 'async'  # keep the orders PENDING
+    product = product_factory(quantity=10)
+    orders = []
+    for quantity in (2, 3):
+        Cart.objects.get_or_create(user=user)[0].add_item(product, quantity=quantity)
+        orders.append(authed_client.post(reverse('order-list'), {}, format='json').json()['id'])
+    assert Product.all_objects.get(pk=product.pk).quantity == 5
+
+    assert authed_client.delete(reverse('order-detail', args=[orders[0]])).status_code == 200
+    assert Product.all_objects.get(pk=product.pk).quantity == 7
+
+    results = transition_orders(orders, 'CANCELLED')
+    assert [result['result'] for result in results] == ['invalid_transition', 'updated']
+    # the order cancelled before is not restocked twice
+    assert Product.all_objects.get(pk=product.pk).quantity == 10
+    assert OrderItem.objects.filter(order_id__in=orders).count() == 2
+
+
+def test_order_items_are_fixed_at_checkout(authed_client, user, product_factory, settings):
+    settings.PAYMENT_SETTLEMENT = 'async'  # keep the order PENDING
+    product = product_factory(quantity=10)
+    Cart.objects.get_or_create(user=user)[0].add_item(product, quantity=2)
+    order_id = authed_client.post(reverse('order-list'), {}, format='json').json()['id']
+    order_item = OrderItem.objects.get(order_id=order_id)
+
+    url = reverse('order-item-detail', args=[order_item.id])
+    assert authed_client.patch(url, {'quantity': 9}, format='json').status_code == 400
+    assert authed_client.delete(url).status_code == 400
+    assert OrderItem.objects.get(pk=order_item.pk).quantity == 2
+
+    assert authed_client.delete(reverse('order-detail', args=[order_id])).status_code == 200
+    assert Product.all_objects.get(pk=product.pk).quantity == 10
+
+
+def test_paid_orders_cannot_be_cancelled_by_the_buyer(authed_client, user):
+    order = Order.objects.create(user=user, status='PAID')
+    assert authed_client.delete(reverse('order-detail', args=[order.id])).status_code == 400
+    assert Order.objects.get(pk=order.pk).status == 'PAID'
+
+
+def test_transition_orders_command(user, tmp_path):
+    orders = [Order.objects.create(user=user, status='PAID') for _ in range(4)]
+    ids_file = tmp_path / 'ids.txt'
+    ids_file.write_text('\n'.join(str(o.id) for o in orders[:3]) + '\n')
+
+    out = io.StringIO()
+    call_command('transition_orders', 'SHIPPED', str(orders[3].id), file=str(ids_file), batch_size=2, stdout=out)
+    assert "Moved 4 order(s) to SHIPPED" in out.getvalue()
+    assert set(Order.objects.values_list('status', flat=True)) == {'SHIPPED'}
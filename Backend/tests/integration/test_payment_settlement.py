@@ -0,0 +1,169 @@
+# tests/integration/test_payment_settlement.py
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+
+from base.models import Cart, Order, Payment, Product
+from base.payments import AuthorizationResult, get_backend, reset_backend
+from base.payments.settlement import settle_payment
+from base.payments.simulator import SimulatorBackend
+
+pytestmark = [pytest.mark.integration, pytest.mark.django_db]
+
+
+@pytest.fixture
+def gateway(settings):
+    def configure(**options):
+        settings.PAYMENT_BACKEND_OPTIONS = options
+        reset_backend()
+        return get_backend()
+    yield configure
+    reset_backend()
+
+
+@pytest.fixture
+def filled_cart(user, product_factory):
+    cart, _ = Cart.objects.get_or_create(user=user)
+    cart.add_item(product_factory(price_cents=300), quantity=2)
+    return cart
+
+
+def test_sync_checkout_authorizes_inline(authed_client, user, filled_cart, gateway):
+    gateway(failure_rate=0.0)
+    resp = authed_client.post(reverse('order-list'), {}, format='json')
+    assert resp.status_code == 201
+    assert resp.json()['status'] == 'PAID'
+
+    payment = Payment.objects.get(order_id=resp.json()['id'])
+    assert payment.status == 'AUTHORIZED'
+    assert payment.amount_cents == 600
+    assert payment.transaction_id.startswith('sim-')
+
+
+def test_declined_payment_cancels_the_order_and_restocks(authed_client, user, gateway, product_factory):
+    gateway(failure_rate=1.0)
+    product = product_factory(price_cents=300, quantity=5)
+    Cart.objects.get_or_create(user=user)[0].add_item(product, quantity=2)
+    resp = authed_client.post(reverse('order-list'), {}, format='json')
+    assert resp.json()['status'] == 'CANCELLED'
+    assert Payment.objects.get(order_id=resp.json()['id']).status == 'DECLINED'
+    assert Product.all_objects.get(pk=product.pk).quantity == 5
+
+
+def test_async_checkout_settles_in_the_worker(authed_client, user, filled_cart, gateway, settings,
+                                              django_capture_on_commit_callbacks):
+    gateway()
+    settings.PAYMENT_SETTLEMENT = 'async'
+    settings.BACKGROUND_TASKS_EAGER = True
+    with django_capture_on_commit_callbacks() as callbacks:
+        resp = authed_client.post(reverse('order-list'), {}, format='json')
+    assert resp.json()['status'] == 'PENDING'
+
+    for callback in callbacks:
+        callback()
+    assert Order.objects.get(pk=resp.json()['id']).status == 'PAID'
+
+
+def test_payment_is_only_settled_once(user, gateway, mocker):
+    backend = gateway()
+    authorize = mocker.spy(backend, 'authorize')
+    order = Order.objects.create(user=user, total_price_cents=100)
+    payment = Payment.objects.create(order=order, amount_cents=100, payment_method='card')
+
+    assert settle_payment(payment.pk) == 'AUTHORIZED'
+    assert settle_payment(payment.pk) is None
+    assert authorize.call_count == 1
+
+
+def test_cancelled_orders_are_never_charged(user, gateway, mocker):
+    authorize = mocker.spy(gateway(), 'authorize')
+    order = Order.objects.create(user=user, status='CANCELLED')
+    payment = Payment.objects.create(order=order, amount_cents=100, payment_method='card')
+
+    assert settle_payment(payment.pk) == 'DECLINED'
+    assert authorize.call_count == 0
+    assert Order.objects.get(pk=order.pk).status == 'CANCELLED'
+
+
+def test_cancelling_during_authorization_voids_it(user, gateway, mocker):
+    backend = gateway()
+    order = Order.objects.create(user=user, total_price_cents=100)
+    payment = Payment.objects.create(order=order, amount_cents=100, payment_method='card')
+
+    def cancel_then_approve(payment):
+        Order.objects.filter(pk=order.pk).update(status='CANCELLED')
+        return AuthorizationResult(approved=True, transaction_id='txn-1')
+    mocker.patch.object(backend, 'authorize', side_effect=cancel_then_approve)
+    void = mocker.spy(backend, 'void')
+
+    assert settle_payment(payment.pk) == 'VOIDED'
+    void.assert_called_once_with(mocker.ANY, 'txn-1')
+    assert Order.objects.get(pk=order.pk).status == 'CANCELLED'
+
+
+def test_amount_must_match_the_order_total(user, gateway, mocker):
+    authorize = mocker.spy(gateway(), 'authorize')
+    order = Order.objects.create(user=user, total_price_cents=600)
+    payment = Payment.objects.create(order=order, amount_cents=1, payment_method='card')
+
+    assert settle_payment(payment.pk) == 'DECLINED'
+    assert authorize.call_count == 0
+    assert Order.objects.get(pk=order.pk).status == 'PENDING'
+
+
+def test_client_payments_charge_the_order_total_once(authed_client, user, gateway):
+    gateway(failure_rate=1.0)
+    order = Order.objects.create(user=user, total_price_cents=600)
+    pending = Payment.objects.create(order=order, amount_cents=600, payment_method='card')
+
+    # the checkout payment is still pending: no second one
+    resp = authed_client.post(reverse('payment-list'), {'order_id': order.id, 'amount_cents': 1,
+                                                         'payment_method': 'card'}, format='json')
+    assert resp.status_code == 400
+
+    Payment.objects.filter(pk=pending.pk).update(status='PROCESSING')
+    declined = Payment.objects.create(order=order, amount_cents=600, payment_method='card')
+    # a decline doesn't cancel the order while another payment is in flight
+    assert settle_payment(declined.pk) == 'DECLINED'
+    assert Order.objects.get(pk=order.pk).status == 'PENDING'
+
+
+def test_client_payment_amount_is_the_order_total(authed_client, user, gateway):
+    gateway()
+    order = Order.objects.create(user=user, total_price_cents=600)
+    resp = authed_client.post(reverse('payment-list'), {'order_id': order.id, 'amount_cents': 1,
+                                                         'payment_method': 'card'}, format='json')
+    assert resp.status_code == 201
+    assert Payment.objects.get(order=order).amount_cents == 600
+    assert Order.objects.get(pk=order.pk).status == 'PAID'
+
+
+def test_gateway_errors_requeue_the_payment(user, gateway, mocker):
+    backend = gateway()
+    mocker.patch.object(backend, 'authorize', side_effect=TimeoutError)
+    order = Order.objects.create(user=user, total_price_cents=100)
+    payment = Payment.objects.create(order=order, amount_cents=100, payment_method='card')
+    assert settle_payment(payment.pk) is None
+    assert Payment.objects.get(pk=payment.pk).status == 'PENDING'
+
+
+def test_settle_payments_command(user, gateway):
+    gateway()
+    order = Order.objects.create(user=user, total_price_cents=100)
+    Payment.objects.create(order=order, amount_cents=100, payment_method='card')
+    stuck = Order.objects.create(user=user, total_price_cents=100)
+    Payment.objects.create(order=stuck, amount_cents=100, payment_method='card', status='PROCESSING')
+
+    call_command('settle_payments', stale_seconds=0)
+    assert set(Payment.objects.values_list('status', flat=True)) == {'AUTHORIZED'}
+    assert Order.objects.get(pk=order.pk).status == 'PAID'
+
+
+def test_simulator_is_reproducible_with_a_seed():
+    runs = [
+        [backend.authorize(None).approved for _ in range(20)]
+        for backend in (SimulatorBackend(failure_rate=0.5, seed=7), SimulatorBackend(failure_rate=0.5, seed=7))
+    ]
+    assert runs[0] == runs[1]
+    assert True in runs[0] and False in runs[0]
+    assert isinstance(SimulatorBackend().authorize(None), AuthorizationResult)
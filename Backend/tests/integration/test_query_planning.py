@@ -0,0 +1,49 @@
+# tests/integration/test_query_planning.py
+from types import SimpleNamespace
+
+import pytest
+from django.urls import reverse
+
+from base.models import Address, Order, Payment
+from base.utils.query_planning import QueryCountGrowth
+from base.views.models import AddressViewSet, ItemViewSet
+
+pytestmark = [pytest.mark.integration, pytest.mark.django_db]
+
+
+@pytest.fixture
+def constant_queries(settings, user):
+    # The serializer path is what gets planned; the fast path batches on its own
+    settings.ASSERT_CONSTANT_LIST_QUERIES = True
+    settings.FAST_READ_SERIALIZERS = False
+    user.is_staff = True
+    user.save()
+
+
+def test_planned_lists_do_not_grow_with_page_size(constant_queries, authed_client, user, product_factory):
+    for i in range(4):
+        product_factory()
+        Address.objects.create(user=user, address_line_1=f"{i} Main St", city='Town', state_province='ST',
+                               postal_code='1', country='US')
+        order = Order.objects.create(user=user)
+        Payment.objects.create(order=order, amount_cents=100, payment_method='card', transaction_id=f"tx-{i}")
+
+    for route in ('item-list', 'product-list', 'address-list', 'payment-list', 'order-list'):
+        assert authed_client.get(reverse(route)).status_code == 200, route
+
+
+def test_unplanned_list_fails_in_assert_mode(constant_queries, authed_client, product_factory, monkeypatch):
+    product_factory.create_batch(3)
+    monkeypatch.setattr(ItemViewSet, 'plan_related', False)
+    with pytest.raises(QueryCountGrowth):
+        authed_client.get(reverse('item-list'))
+
+
+def test_retrieve_is_planned(user):
+    view = AddressViewSet(action='retrieve', request=SimpleNamespace(user=user), format_kwarg=None)
+    queryset = view.get_queryset()
+    assert queryset.query.select_related == {'user': {}}
+    assert 'user__groups' in queryset._prefetch_related_lookups
+
+    view.action = 'update'
+    assert not view.get_queryset()._prefetch_related_lookups
@@ -0,0 +1,83 @@
+# tests/integration/test_replica_routing.py
+import pytest
+from django.http import HttpResponse
+from django.test import RequestFactory
+from django.urls import reverse
+
+from base import db_router
+from base.db_router import PrimaryReplicaRouter, reset_read_database, select_read_database, set_read_database
+from base.models import Item
+from base.views.models import CartItemViewSet
+
+pytestmark = [pytest.mark.integration, pytest.mark.django_db]
+
+
+@pytest.fixture
+def replicas(settings):
+    # `default` stands in for the replica: the routing decisions are what's under test
+    settings.DATABASE_REPLICAS = ['default']
+    return settings.DATABASE_REPLICAS
+
+
+def test_router_follows_the_read_context():
+    router = PrimaryReplicaRouter()
+    assert router.db_for_read(Item) is None
+
+    token = set_read_database('replica_0')
+    try:
+        assert router.db_for_read(Item) == 'replica_0'
+        assert router.db_for_write(Item) == 'default'
+    finally:
+        reset_read_database(token)
+    assert router.db_for_read(Item) is None
+
+
+def test_replicas_are_never_migrated(settings):
+    settings.DATABASE_REPLICAS = ['replica_0']
+    router = PrimaryReplicaRouter()
+    assert router.allow_migrate('default', 'base')
+    assert not router.allow_migrate('replica_0', 'base')
+
+
+def test_no_replicas_means_primary(settings, user):
+    settings.DATABASE_REPLICAS = []
+    assert select_read_database(RequestFactory().get('/'), user) is None
+
+
+def test_safe_requests_read_from_replica_until_the_user_writes(replicas, authed_client, user, product_factory, mocker,
+                                                               settings):
+    spy = mocker.spy(db_router, 'select_read_database')
+    chosen = mocker.spy(db_router, 'set_read_database')
+    mocker.patch('base.views.baseviews.select_read_database', spy)
+    mocker.patch('base.views.baseviews.set_read_database', chosen)
+
+    assert authed_client.get(reverse('cart-item-list')).status_code == 200
+    assert chosen.call_count == 1
+
+    resp = authed_client.post(reverse('cart-item-list'), {"item_id": product_factory().id, "quantity": 1}, format="json")
+    assert resp.status_code == 201
+    # the pin travels with the client, so it holds in any worker
+    assert settings.REPLICA_PIN_COOKIE in resp.cookies
+
+    # read-your-writes: the next read stays on the primary
+    assert authed_client.get(reverse('cart-item-list')).status_code == 200
+    assert chosen.call_count == 1
+    assert spy.spy_return is None
+
+
+def test_pin_is_only_honoured_for_its_user(replicas, user, django_user_model):
+    request = RequestFactory().get('/')
+    response = HttpResponse()
+    db_router.pin_to_primary(response, user)
+    request.COOKIES.update({name: morsel.value for name, morsel in response.cookies.items()})
+
+    assert db_router.is_pinned(request, user)
+    other = django_user_model.objects.create_user(username='other', password='x')
+    assert not db_router.is_pinned(request, other)
+
+
+def test_read_alias_is_reset_when_the_view_raises(replicas, authed_client, mocker):
+    mocker.patch.object(CartItemViewSet, 'list', side_effect=RuntimeError)
+    with pytest.raises(RuntimeError):
+        authed_client.get(reverse('cart-item-list'))
+    assert db_router._read_database.get() is None
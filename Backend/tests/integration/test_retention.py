@@ -0,0 +1,80 @@
+# tests/integration/test_retention.py
+from datetime import timedelta
+
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.utils.timezone import now
+
+from base.models import ArchivedRecord, Cart, CartItem, Item, Order, OrderItem, Product
+
+pytestmark = [pytest.mark.integration, pytest.mark.django_db]
+
+RETENTION = {
+    'base.Item': {'days': 90, 'mode': 'archive', 'protect': ['base.OrderItem']},
+    'base.CartItem': {'days': 30, 'mode': 'purge'},
+}
+
+
+@pytest.fixture(autouse=True)
+def retention_settings(settings):
+    settings.SOFT_DELETE_RETENTION = RETENTION
+
+
+def _deleted_days_ago(obj, days):
+    type(obj).all_objects.filter(pk=obj.pk).update(is_deleted=True, deleted_at=now() - timedelta(days=days))
+
+
+def test_expired_items_are_archived_with_their_children(product_factory):
+    expired, recent, live = product_factory(), product_factory(), product_factory()
+    _deleted_days_ago(expired, 120)
+    _deleted_days_ago(recent, 10)
+
+    call_command('purge_deleted')
+
+    assert not Item.all_objects.filter(pk=expired.pk).exists()
+    assert not Product.all_objects.filter(pk=expired.pk).exists()
+    assert Item.all_objects.filter(pk__in=[recent.pk, live.pk]).count() == 2
+
+    archived = {r.model: r for r in ArchivedRecord.objects.filter(object_id=expired.pk)}
+    assert set(archived) == {'base.Item', 'base.Product'}
+    assert archived['base.Item'].payload['name'] == expired.name
+    assert archived['base.Item'].deleted_at is not None
+
+
+def test_items_on_live_orders_are_kept(product_factory, user):
+    product = product_factory()
+    order = Order.objects.create(user=user)
+    OrderItem.objects.create(order=order, item=product, quantity=1, price_cents=product.price_cents)
+    _deleted_days_ago(product, 120)
+
+    call_command('purge_deleted', model=['base.Item'])
+
+    assert Item.all_objects.filter(pk=product.pk).exists()
+    assert not ArchivedRecord.objects.exists()
+
+
+def test_purge_mode_deletes_without_archiving(product_factory, user):
+    cart = Cart.objects.create(user=user)
+    line = CartItem.objects.create(cart=cart, item=product_factory(), quantity=1)
+    _deleted_days_ago(line, 45)
+
+    call_command('purge_deleted', model=['base.CartItem'], batch_size=1)
+
+    assert not CartItem.all_objects.filter(pk=line.pk).exists()
+    assert not ArchivedRecord.objects.exists()
+
+
+def test_dry_run_changes_nothing(product_factory, capsys):
+    product = product_factory()
+    _deleted_days_ago(product, 120)
+
+    call_command('purge_deleted', dry_run=True)
+
+    assert Item.all_objects.filter(pk=product.pk).exists()
+    assert 'base.Item: 1 row(s)' in capsys.readouterr().out
+
+
+def test_model_without_policy_is_rejected():
+    with pytest.raises(CommandError):
+        call_command('purge_deleted', model=['base.Address'])
@@ -0,0 +1,43 @@
+# tests/integration/test_seed_command.py
+
+import io
+
+import pytest
+from django.core.management import call_command
+from django.db.models import F, Sum
+
+from base.models.cart import CartItem
+from base.models.item import Item, Product, Service
+from base.models.order import Order
+from base.models.payment import Payment
+from base.models.user import CustomUser
+
+pytestmark = [pytest.mark.integration, pytest.mark.django_db]
+
+
+def _seed(**options):
+    call_command('seed', seed=42, batch_size=7, stdout=io.StringIO(), **options)
+
+
+def test_seed_scales_with_options_and_keeps_tables_consistent():
+    _seed(users=25, items=40, orders=30, cart_items=15)
+
+    assert CustomUser.objects.filter(username__startswith='user').count() == 25
+    assert Item.objects.count() == 40
+    assert Product.objects.count() + Service.objects.count() == 40
+    assert Order.objects.count() == 30
+    assert Payment.objects.count() == 30
+    assert CartItem.objects.count() == 15
+
+    totals = Order.objects.annotate(lines=Sum(F('order_items__quantity') * F('order_items__price_cents')))
+    assert all(order.total_price_cents == order.lines for order in totals)
+
+
+def test_seed_is_deterministic_for_a_seed():
+    _seed(users=5, items=10, orders=5)
+    first = list(Item.objects.order_by('name').values_list('name', 'price_cents', 'currency'))
+
+    call_command('dbreset', stdout=io.StringIO())
+    _seed(users=5, items=10, orders=5)
+
+    assert list(Item.objects.order_by('name').values_list('name', 'price_cents', 'currency')) == first
@@ -0,0 +1,85 @@
+import pytest
+from django.contrib.auth.models import Group
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIRequestFactory
+
+from base.models import Address, Category, Item, Order, OrderItem, Payment, Product, Service, Cart, CartItem
+from base.serializers.fast import compile_read_plan, fast_serialize
+from base.serializers.models import (
+    AddressSerializer, CartItemSerializer, CategorySerializer, ItemSerializer, OrderItemSerializer,
+    OrderSerializer, PaymentSerializer, ProductSerializer, ServiceSerializer,
+)
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def catalog(user, product_factory, service_factory):
+    user.groups.add(Group.objects.get_or_create(name='Seller')[0])
+    category = Category.objects.create(name='Tools')
+    products = [product_factory(seller=user) for _ in range(3)]
+    service = service_factory()
+    for item in products + [service]:
+        item.categories.add(category)
+    Address.objects.create(user=user, address_line_1='1 Main St', city='Town', state_province='ST', postal_code='1', country='US')
+
+    order = Order.objects.create(user=user)
+    for product in products:
+        OrderItem.objects.create(order=order, item=product, quantity=2, price_cents=product.price_cents)
+    Payment.objects.create(order=order, amount_cents=6000, payment_method='card', transaction_id='tx-1')
+
+    cart, _ = Cart.objects.get_or_create(user=user)
+    CartItem.objects.create(cart=cart, item=products[0], quantity=1, price_snapshot_cents=1000)
+    return products
+
+
+@pytest.fixture
+def context():
+    return {'request': APIRequestFactory().get('/api/items/')}
+
+
+@pytest.mark.parametrize('serializer_class, model', [
+    (ItemSerializer, Item),
+    (ProductSerializer, Product),
+    (ServiceSerializer, Service),
+    (AddressSerializer, Address),
+    (OrderSerializer, Order),
+    (OrderItemSerializer, OrderItem),
+    (PaymentSerializer, Payment),
+    (CartItemSerializer, CartItem),
+])
+def test_fast_path_matches_serializer(catalog, context, serializer_class, model):
+    queryset = model.objects.order_by('pk')
+    expected = serializer_class(queryset, many=True, context=context).data
+    assert fast_serialize(serializer_class, queryset, context) == expected
+
+
+def test_nested_data_costs_one_query_per_relation(catalog, context, product_factory):
+    def count_queries():
+        with CaptureQueriesContext(connection) as ctx:
+            fast_serialize(ItemSerializer, Item.objects.all(), context)
+        return len(ctx.captured_queries)
+
+    before = count_queries()
+    product_factory.create_batch(5)
+    # items, sellers, seller groups, seller permissions, categories
+    assert count_queries() == before == 5
+
+
+def test_unsupported_serializers_have_no_plan():
+    # full_path walks the parent chain, which a row can't do
+    assert compile_read_plan(CategorySerializer) is None
+
+
+def test_list_endpoint_uses_the_fast_path(catalog, authed_client, settings, mocker):
+    render = mocker.spy(compile_read_plan(ItemSerializer), 'render')
+    fast = authed_client.get(reverse('item-list'))
+    assert fast.status_code == 200
+    assert render.call_count == 1
+
+    settings.FAST_READ_SERIALIZERS = False
+    slow = authed_client.get(reverse('item-list'))
+    assert render.call_count == 1
+    by_id = lambda rows: sorted(rows, key=lambda row: row['id'])
+    assert by_id(fast.json()) == by_id(slow.json())
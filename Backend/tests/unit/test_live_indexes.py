@@ -0,0 +1,52 @@
+# tests/unit/test_live_indexes.py
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import models
+
+from base.models import Address, CartItem, Item, Order
+from base.models.base_modle import LIVE_ROWS, LiveIndex
+from base.urls import router
+from base.utils.live_indexes import hot_filters, missing_live_indexes
+
+pytestmark = [pytest.mark.unit]
+
+
+def test_live_index_defaults_to_live_rows_condition():
+    index = LiveIndex(fields=['user'], name='live_test_user')
+    assert index.condition == LIVE_ROWS
+    assert LiveIndex.is_live(index)
+    assert not LiveIndex.is_live(models.Index(fields=['user'], name='plain_test_user'))
+
+
+def test_live_index_survives_migration_roundtrip():
+    index = LiveIndex(fields=['user'], name='live_test_user')
+    path, args, kwargs = index.deconstruct()
+    assert path == 'base.models.base_modle.LiveIndex'
+    assert LiveIndex(*args, **kwargs) == index
+
+
+@pytest.mark.parametrize('model, field', [
+    (Address, 'user'), (CartItem, 'cart'), (Order, 'user'), (Order, 'created_at'), (Item, 'seller'),
+])
+def test_hot_lookups_are_covered(model, field):
+    assert (model, field) in hot_filters(router.registry)
+    reported = {(row['model'], row['field']) for row in missing_live_indexes(router.registry)}
+    assert (model.__name__, field) not in reported
+
+
+def test_child_table_fields_are_reported_as_inherited():
+    report = {(row['model'], row['field']): row for row in missing_live_indexes(router.registry)}
+    assert report[('Product', 'quantity')]['status'] == 'inherited'
+
+
+def test_command_fails_only_when_asked(monkeypatch, capsys):
+    missing = [{'model': 'Order', 'field': 'status', 'sources': ['OrderViewSet'], 'status': 'missing'}]
+    monkeypatch.setattr(
+        'base.management.commands.check_live_indexes.missing_live_indexes', lambda registry: missing,
+    )
+
+    call_command('check_live_indexes')
+    assert '1 filter(s) without a live-row index' in capsys.readouterr().out
+    with pytest.raises(CommandError):
+        call_command('check_live_indexes', fail=True)
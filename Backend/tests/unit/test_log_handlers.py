@@ -0,0 +1,58 @@
+# tests/unit/test_log_handlers.py
+import json
+import logging
+
+import pytest
+
+from base.utils.log_handlers import JsonFormatter, QueueListenerHandler, queue_depth
+
+pytestmark = [pytest.mark.unit]
+
+
+class ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+def _record(msg, *args, **extra):
+    record = logging.LogRecord('freemarketbackend', logging.INFO, __file__, 1, msg, args, None)
+    record.__dict__.update(extra)
+    return record
+
+
+def test_json_formatter_emits_message_and_extra_fields():
+    line = JsonFormatter().format(_record("Listing %ss", 'Item', route='item-list', db_queries=3))
+    payload = json.loads(line)
+
+    assert payload['message'] == 'Listing Items'
+    assert payload['level'] == 'INFO'
+    assert payload['route'] == 'item-list'
+    assert payload['db_queries'] == 3
+    assert 'args' not in payload
+
+
+def test_queue_handler_delivers_on_listener_thread():
+    target = ListHandler()
+    handler = QueueListenerHandler([target])
+    try:
+        handler.handle(_record("Created %s", 'order'))
+    finally:
+        handler.close()
+
+    assert [r.getMessage() for r in target.records] == ['Created order']
+
+
+def test_full_queue_drops_instead_of_blocking():
+    handler = QueueListenerHandler([ListHandler()], queue_size=1)
+    handler.stop()
+    try:
+        handler.handle(_record("first"))
+        handler.handle(_record("second"))
+        assert handler.dropped == 1
+        assert queue_depth()['dropped'] >= 1
+    finally:
+        handler.close()
@@ -0,0 +1,50 @@
+# tests/unit/test_partitioning.py
+from datetime import date, datetime, timezone
+
+import pytest
+
+from base.utils.partitioning import (
+    add_months, bound_literal, expired_partitions, missing_months, month_start,
+    parse_partition_bounds, partition_name,
+)
+
+pytestmark = [pytest.mark.unit]
+
+
+def test_month_arithmetic_wraps_years():
+    assert month_start(datetime(2025, 3, 17, 8, tzinfo=timezone.utc)) == date(2025, 3, 1)
+    assert add_months(date(2025, 11, 1), 3) == date(2026, 2, 1)
+    assert add_months(date(2025, 1, 1), -1) == date(2024, 12, 1)
+
+
+def test_partition_names_and_bounds():
+    assert partition_name('base_cartactivitylog', date(2025, 2, 1)) == 'base_cartactivitylog_p2025_02'
+    assert bound_literal(date(2025, 2, 1)) == '2025-02-01T00:00:00+00:00'
+
+
+def test_parse_postgres_partition_bounds():
+    assert parse_partition_bounds(
+        "FOR VALUES FROM ('2025-01-01 00:00:00+00') TO ('2025-02-01 00:00:00+00')"
+    ) == (date(2025, 1, 1), date(2025, 2, 1))
+    assert parse_partition_bounds(
+        "FOR VALUES FROM (MINVALUE) TO ('2025-03-01 00:00:00+00')"
+    ) == (None, date(2025, 3, 1))
+
+
+def test_missing_months_skips_covered_ranges():
+    partitions = {
+        'log_p_initial': (None, date(2025, 3, 1)),
+        'log_p2025_04': (date(2025, 4, 1), date(2025, 5, 1)),
+    }
+    assert missing_months(partitions, date(2025, 2, 1), date(2025, 6, 1)) == [
+        date(2025, 3, 1), date(2025, 5, 1), date(2025, 6, 1),
+    ]
+
+
+def test_expired_partitions_end_before_cutoff():
+    partitions = {
+        'log_p_initial': (None, date(2024, 1, 1)),
+        'log_p2024_01': (date(2024, 1, 1), date(2024, 2, 1)),
+        'log_p2024_02': (date(2024, 2, 1), date(2024, 3, 1)),
+    }
+    assert expired_partitions(partitions, date(2024, 2, 1)) == ['log_p2024_01', 'log_p_initial']
@@ -0,0 +1,24 @@
+# tests/unit/test_query_planning.py
+import pytest
+
+from base.serializers.models import (
+    AddressSerializer, CartItemSerializer, CartSerializer, CategorySerializer, ItemSerializer, PaymentSerializer,
+    ProductSerializer,
+)
+from base.utils.query_planning import related_lookups
+
+pytestmark = [pytest.mark.unit]
+
+
+@pytest.mark.parametrize('serializer_class, select, prefetch', [
+    (ItemSerializer, ['seller'], ['categories', 'seller__groups', 'seller__user_permissions']),
+    (ProductSerializer, [], ['categories']),
+    (AddressSerializer, ['user'], ['user__groups', 'user__user_permissions']),
+    (PaymentSerializer, ['order'], ['order__order_items', 'order__order_items__item']),
+    (CartSerializer, ['user'], ['cart_items', 'cart_items__item']),
+    (CartItemSerializer, ['item'], []),
+    # parent is rendered from its FK column; full_path is a method field
+    (CategorySerializer, [], []),
+])
+def test_lookups_follow_the_serializer_fields(serializer_class, select, prefetch):
+    assert related_lookups(serializer_class) == (select, prefetch)
@@ -0,0 +1,56 @@
+# tests/unit/test_renderers.py
+import datetime
+import decimal
+import io
+import json
+import uuid
+
+import pytest
+from django.utils import timezone
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ParseError
+from rest_framework.renderers import JSONRenderer
+
+from base.renderers import FastJSONParser, FastJSONRenderer
+
+pytestmark = [pytest.mark.unit]
+
+
+def test_output_matches_drf_renderer():
+    data = [{
+        'now': timezone.now(),
+        'utc': datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc),
+        'day': datetime.date(2024, 1, 1),
+        'price': decimal.Decimal('10.50'),
+        'label': gettext_lazy('Seller'),
+        'id': uuid.uuid4(),
+        'duration': datetime.timedelta(minutes=5),
+        'keys': {1: 'int key'},
+        'text': 'ünïcode and a line separator',
+        'none': None,
+        'floats': [0.1, 2.5, -3.0],
+    }]
+    assert FastJSONRenderer().render(data) == JSONRenderer().render(data)
+
+
+def test_float_exponents_differ_in_form_only():
+    data = {'big': 1e16, 'small': 1.5e-7}
+    fast, stock = FastJSONRenderer().render(data), JSONRenderer().render(data)
+    assert fast == b'{"big":1e16,"small":1.5e-7}'
+    assert stock == b'{"big":1e+16,"small":1.5e-07}'
+    assert json.loads(fast) == json.loads(stock)
+
+
+def test_non_finite_floats_render_as_null():
+    assert FastJSONRenderer().render({'x': float('nan'), 'y': float('inf')}) == b'{"x":null,"y":null}'
+
+
+def test_indented_requests_use_drf_renderer():
+    rendered = FastJSONRenderer().render({'a': 1}, 'application/json; indent=2')
+    assert rendered == b'{\n  "a": 1\n}'
+
+
+def test_parser_round_trip_and_errors():
+    assert FastJSONParser().parse(io.BytesIO('{"name": "ü", "n": [1, 2.5]}'.encode())) == {'name': 'ü', 'n': [1, 2.5]}
+    with pytest.raises(ParseError):
+        FastJSONParser().parse(io.BytesIO(b'{"name": '))
@@ -0,0 +1,65 @@
+# tests/unit/test_uploads.py
+import hashlib
+import io
+
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from PIL import Image
+from rest_framework.exceptions import ValidationError
+
+from base.utils.uploads import HashingUploadHandler, check_image_upload
+
+pytestmark = [pytest.mark.unit]
+
+
+def _image_bytes(size=(64, 48), fmt='PNG'):
+    out = io.BytesIO()
+    Image.new('RGB', size).save(out, fmt)
+    return out.getvalue()
+
+
+def _stream(handler, data, content_type='image/png', chunk=1024):
+    handler.new_file('image', 'photo.png', content_type, len(data))
+    for start in range(0, len(data), chunk):
+        handler.receive_data_chunk(data[start:start + chunk], start)
+    return handler.file_complete(len(data))
+
+
+def test_handler_streams_to_disk_and_hashes(settings):
+    data = _image_bytes()
+    upload = _stream(HashingUploadHandler(), data)
+    assert upload.temporary_file_path()
+    assert upload.content_hash == hashlib.sha256(data).hexdigest()
+    assert upload.read() == data
+    assert not upload.too_large
+
+
+def test_handler_stops_storing_oversized_images(settings):
+    settings.MAX_IMAGE_UPLOAD_BYTES = 2048
+    upload = _stream(HashingUploadHandler(), b'x' * 10_000)
+    assert upload.too_large
+    assert len(upload.read()) <= 2048
+    with pytest.raises(ValidationError):
+        check_image_upload(upload)
+
+
+def test_size_limit_is_only_for_images(settings):
+    settings.MAX_IMAGE_UPLOAD_BYTES = 2048
+    upload = _stream(HashingUploadHandler(), b'x' * 10_000, content_type='text/csv')
+    assert not upload.too_large
+    assert upload.size == 10_000
+
+
+def test_pixel_limit_is_checked_from_the_header(settings):
+    settings.MAX_IMAGE_PIXELS = 1000
+    upload = SimpleUploadedFile('big.png', _image_bytes((100, 100)), content_type='image/png')
+    with pytest.raises(ValidationError, match='pixels'):
+        check_image_upload(upload)
+
+
+def test_rejects_non_images_and_unsupported_formats():
+    with pytest.raises(ValidationError):
+        check_image_upload(SimpleUploadedFile('x.png', b'not an image', content_type='image/png'))
+    with pytest.raises(ValidationError, match='Unsupported'):
+        check_image_upload(SimpleUploadedFile('x.bmp', _image_bytes(fmt='BMP'), content_type='image/bmp'))
+    assert check_image_upload(SimpleUploadedFile('x.png', _image_bytes(), content_type='image/png')) == 'PNG'